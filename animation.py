@@ -0,0 +1,184 @@
+import time
+
+
+def linear(t):
+    return t
+
+
+def ease_in_out(t):
+    return t * t * (3 - 2 * t)
+
+
+class Animation:
+    """One registered tween or keyframe track"""
+
+    __slots__ = ('duration', 'on_frame', 'keyframes', 'next_keyframe', 'on_done',
+                 'easing', 'repeat', 'group', 'started', 'cancelled', 'paused_at')
+
+    def __init__(self, duration, on_frame=None, keyframes=None, on_done=None,
+                 easing=linear, repeat=False, group=None):
+        self.duration = duration
+        self.on_frame = on_frame          # called with eased progress 0..1
+        self.keyframes = keyframes or []  # sorted (offset_seconds, callback)
+        self.next_keyframe = 0
+        self.on_done = on_done
+        self.easing = easing
+        self.repeat = repeat
+        self.group = group
+        self.started = None
+        self.cancelled = False
+        self.paused_at = None
+
+    def next_due(self, now, frame_interval):
+        """Earliest time this animation needs the scheduler again"""
+        if self.on_frame is not None:
+            return now + frame_interval
+        if self.next_keyframe < len(self.keyframes):
+            return self.started + self.keyframes[self.next_keyframe][0]
+        return self.started + self.duration
+
+    def step(self, now):
+        """Advance to now; returns True once finished"""
+        elapsed = now - self.started
+        while (self.next_keyframe < len(self.keyframes)
+               and self.keyframes[self.next_keyframe][0] <= elapsed):
+            self.keyframes[self.next_keyframe][1]()
+            self.next_keyframe += 1
+        if self.on_frame is not None:
+            progress = min(1.0, elapsed / self.duration) if self.duration else 1.0
+            self.on_frame(self.easing(progress))
+        if elapsed < self.duration:
+            return False
+        if self.repeat:
+            self.started += self.duration
+            self.next_keyframe = 0
+            return False
+        return True
+
+
+class FrameScheduler:
+    """Single after()-driven loop for every animation in the window
+
+    Nothing ever sleeps: each frame advances all registered animations to the
+    current time, then the loop re-arms itself for the earliest due time,
+    capped at fps. With nothing registered no timer is pending at all.
+
+    Groups can be paused (e.g. while their tab is hidden); paused animations
+    cost nothing and continue from the same point when resumed.
+
+    Given a TkTimers instance the frames are scheduled through its timer
+    wheel instead of a root.after() of their own.
+    """
+
+    def __init__(self, root, fps=30, clock=time.monotonic, timers=None):
+        self.root = root
+        self.frame_interval = 1.0 / fps
+        self.clock = clock
+        self.timers = timers
+        self.animations = []
+        self.pending = None
+        self.pending_due = None
+        self.paused_groups = set()
+
+    def add(self, animation):
+        animation.started = self.clock()
+        self.animations.append(animation)
+        if animation.group is not None and animation.group in self.paused_groups:
+            animation.paused_at = animation.started
+        else:
+            self._arm(animation.next_due(animation.started, self.frame_interval))
+        return animation
+
+    def tween(self, duration, on_frame, on_done=None, easing=linear, group=None):
+        """Call on_frame(progress) every frame for duration seconds"""
+        return self.add(Animation(duration, on_frame=on_frame, on_done=on_done,
+                                  easing=easing, group=group))
+
+    def keyframes(self, frames, duration=None, on_done=None, repeat=False, group=None):
+        """Run callbacks at (offset_seconds, callback) points"""
+        frames = sorted(frames, key=lambda frame: frame[0])
+        if duration is None:
+            duration = frames[-1][0] if frames else 0.0
+        return self.add(Animation(duration, keyframes=frames, on_done=on_done,
+                                  repeat=repeat, group=group))
+
+    def delay(self, seconds, callback, group=None):
+        """Run callback once after seconds"""
+        return self.keyframes([(seconds, callback)], group=group)
+
+    def cancel(self, animation):
+        if animation is not None:
+            animation.cancelled = True
+
+    def cancel_group(self, group):
+        for animation in self.animations:
+            if animation.group == group:
+                animation.cancelled = True
+
+    def pause_group(self, group):
+        """Freeze every animation of group until resume_group"""
+        if group in self.paused_groups:
+            return
+        self.paused_groups.add(group)
+        now = self.clock()
+        for animation in self.animations:
+            if animation.group == group and animation.paused_at is None:
+                animation.paused_at = now
+
+    def resume_group(self, group):
+        """Continue a paused group where it left off"""
+        if group not in self.paused_groups:
+            return
+        self.paused_groups.discard(group)
+        now = self.clock()
+        for animation in self.animations:
+            if animation.group == group and animation.paused_at is not None:
+                animation.started += now - animation.paused_at
+                animation.paused_at = None
+                self._arm(animation.next_due(now, self.frame_interval))
+
+    def is_paused(self, group):
+        return group in self.paused_groups
+
+    def _arm(self, due):
+        """Make sure a frame is scheduled no later than due"""
+        if self.pending is not None:
+            if due >= self.pending_due:
+                return
+            if self.timers is not None:
+                self.timers.cancel(self.pending)
+            else:
+                self.root.after_cancel(self.pending)
+        self.pending_due = due
+        if self.timers is not None:
+            self.pending = self.timers.call_at(due, self._frame)
+            return
+        delay_ms = max(1, int((due - self.clock()) * 1000 + 0.5))
+        self.pending = self.root.after(delay_ms, self._frame)
+
+    def _frame(self):
+        self.pending = None
+        now = self.clock()
+        finished = []
+        # Iterate over a copy: callbacks may register or cancel animations
+        for animation in list(self.animations):
+            if animation.cancelled or animation.paused_at is not None:
+                continue
+            try:
+                done = animation.step(now)
+            except Exception as e:
+                print(f"Animation error: {e}")
+                done = True
+            if done:
+                finished.append(animation)
+        ended = set(finished)
+        self.animations = [animation for animation in self.animations
+                           if not animation.cancelled and animation not in ended]
+        for animation in finished:
+            if animation.on_done is not None:
+                animation.on_done()
+        active = [animation.next_due(now, self.frame_interval)
+                  for animation in self.animations if animation.paused_at is None]
+        if active:
+            # Never wake more often than the frame cap
+            self._arm(max(min(active), now + self.frame_interval))
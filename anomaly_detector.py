@@ -0,0 +1,177 @@
+import time
+from array import array
+from collections import OrderedDict
+
+from lock_engine import INPUT, SUCCESS, FAILED, LOCKED
+
+# Alert kinds
+FAILURE_RATE = "FAILURE_RATE"
+REPEATED_LOCKOUTS = "REPEATED_LOCKOUTS"
+FAST_KEYPRESSES = "FAST_KEYPRESSES"
+FAILURE_BURST = "FAILURE_BURST"
+
+# Only wrong codes count: a short entry, a key pressed during a lockout or a
+# throttled attempt is not a guess, and counting it would let failures
+# outnumber the attempts they are compared with
+FAILURE_EVENTS = frozenset((FAILED, LOCKED))
+ATTEMPT_EVENTS = frozenset((SUCCESS, FAILED, LOCKED))
+
+
+class RollingCounter:
+    """Event count over the last window seconds, in fixed-size buckets
+
+    Buckets that fall out of the window are cleared lazily when time moves
+    on, so adding is O(1) amortised and memory never grows.
+    """
+
+    __slots__ = ('width', 'counts', 'head', 'total')
+
+    def __init__(self, window=60.0, buckets=60):
+        self.width = window / buckets
+        self.counts = array('I', bytes(4 * buckets))
+        self.head = 0      # absolute index of the newest bucket
+        self.total = 0
+
+    def advance(self, now):
+        bucket = int(now // self.width)
+        steps = bucket - self.head
+        if steps <= 0:
+            return
+        counts = self.counts
+        size = len(counts)
+        if steps >= size:
+            for i in range(size):
+                counts[i] = 0
+            self.total = 0
+        else:
+            for b in range(self.head + 1, bucket + 1):
+                i = b % size
+                self.total -= counts[i]
+                counts[i] = 0
+        self.head = bucket
+
+    def add(self, now, n=1):
+        self.advance(now)
+        self.counts[self.head % len(self.counts)] += n
+        self.total += n
+        return self.total
+
+    def value(self, now):
+        self.advance(now)
+        return self.total
+
+
+class DoorStats:
+    """Rolling statistics of one door"""
+
+    __slots__ = ('attempts', 'failures', 'lockouts', 'last_key', 'key_interval', 'keys')
+
+    def __init__(self, window, buckets):
+        self.attempts = RollingCounter(window, buckets)
+        self.failures = RollingCounter(window, buckets)
+        self.lockouts = RollingCounter(window, buckets)
+        self.last_key = None
+        self.key_interval = None  # exponentially weighted mean seconds between keys
+        self.keys = 0
+
+
+class AnomalyDetector:
+    """Event-driven security checks over rolling windows
+
+    Fed every lock event as it happens (observe has the DoorController
+    subscriber signature), it keeps per-door and system-wide rolling counts
+    and calls each alert callback(kind, door, message) the moment a
+    threshold is crossed. An alert of one kind for one door is repeated at
+    most once per cooldown seconds. At most max_doors are tracked; the door
+    idle the longest is dropped first.
+    """
+
+    def __init__(self, window=60.0, buckets=60, max_doors=10000, clock=time.monotonic,
+                 min_attempts=10, max_failure_ratio=0.8, max_lockouts=2,
+                 min_key_interval=0.03, min_keys=8, max_failures_total=50,
+                 cooldown=60.0):
+        self.window = window
+        self.buckets = buckets
+        self.max_doors = max_doors
+        self.clock = clock
+        self.min_attempts = min_attempts
+        self.max_failure_ratio = max_failure_ratio
+        self.max_lockouts = max_lockouts
+        self.min_key_interval = min_key_interval
+        self.min_keys = min_keys
+        self.max_failures_total = max_failures_total
+        self.cooldown = cooldown
+        self.doors = OrderedDict()
+        self.failures_total = RollingCounter(window, buckets)
+        self.last_alert = OrderedDict()  # (kind, door) -> time, oldest first
+        self.subscribers = []
+        self.events = 0
+
+    def subscribe(self, callback):
+        """Register callback(kind, door, message) for alerts"""
+        self.subscribers.append(callback)
+
+    def stats(self, door):
+        stats = self.doors.get(door)
+        if stats is None:
+            if len(self.doors) >= self.max_doors:
+                self.doors.popitem(last=False)
+            stats = self.doors[door] = DoorStats(self.window, self.buckets)
+        else:
+            self.doors.move_to_end(door)
+        return stats
+
+    def alert(self, kind, door, message, now):
+        key = (kind, door)
+        last = self.last_alert.get(key)
+        if last is not None and now - last < self.cooldown:
+            return
+        if last is not None:
+            del self.last_alert[key]
+        elif len(self.last_alert) >= self.max_doors:
+            self.last_alert.popitem(last=False)  # only the oldest cooldown ends early
+        self.last_alert[key] = now
+        for callback in self.subscribers:
+            callback(kind, door, message)
+
+    def observe(self, door, event, detail=None, now=None):
+        """Feed one lock event of door"""
+        if now is None:
+            now = self.clock()
+        self.events += 1
+        stats = self.stats(door)
+
+        if event == INPUT:
+            if stats.last_key is not None:
+                gap = now - stats.last_key
+                if stats.key_interval is None:
+                    stats.key_interval = gap
+                else:
+                    stats.key_interval += (gap - stats.key_interval) * 0.25
+                stats.keys += 1
+                if stats.keys >= self.min_keys and stats.key_interval < self.min_key_interval:
+                    self.alert(FAST_KEYPRESSES, door,
+                               f"Keys entered every {stats.key_interval * 1000:.0f} ms", now)
+            stats.last_key = now
+            return
+
+        if event in ATTEMPT_EVENTS:
+            attempts = stats.attempts.add(now)
+        else:
+            attempts = stats.attempts.value(now)
+        if event not in FAILURE_EVENTS:
+            return
+
+        failures = stats.failures.add(now)
+        if attempts >= self.min_attempts and failures >= attempts * self.max_failure_ratio:
+            self.alert(FAILURE_RATE, door,
+                       f"{failures} failures in {attempts} attempts within {self.window:.0f}s", now)
+        if event == LOCKED:
+            lockouts = stats.lockouts.add(now)
+            if lockouts >= self.max_lockouts:
+                self.alert(REPEATED_LOCKOUTS, door,
+                           f"{lockouts} lockouts within {self.window:.0f}s", now)
+        total = self.failures_total.add(now)
+        if total >= self.max_failures_total:
+            self.alert(FAILURE_BURST, None,
+                       f"{total} failures across all doors within {self.window:.0f}s", now)
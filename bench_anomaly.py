@@ -0,0 +1,52 @@
+import argparse
+import random
+import time
+
+from anomaly_detector import AnomalyDetector
+from lock_engine import INPUT, SUCCESS, FAILED, LOCKED
+
+
+def synthesize(count, doors, rate, seed=1):
+    """(door, event, now) tuples at rate events per simulated second"""
+    rng = random.Random(seed)
+    events = (INPUT,) * 8 + (SUCCESS, FAILED, FAILED, LOCKED)
+    step = 1.0 / rate
+    return [(rng.randrange(doors), rng.choice(events), i * step) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Anomaly detector throughput and alert latency")
+    parser.add_argument('--events', type=int, default=500_000)
+    parser.add_argument('--doors', type=int, default=1000)
+    parser.add_argument('--rate', type=float, default=50_000, help="simulated events per second")
+    args = parser.parse_args()
+
+    stream = synthesize(args.events, args.doors, args.rate)
+    detector = AnomalyDetector()
+    alerts = []
+    detector.subscribe(lambda kind, door, message: alerts.append(time.perf_counter_ns()))
+    observe = detector.observe
+    started = time.perf_counter()
+    for door, event, now in stream:
+        observe(door, event, None, now)
+    elapsed = time.perf_counter() - started
+    print(f"{args.events} events over {args.doors} doors in {elapsed:.2f}s "
+          f"({args.events / elapsed:,.0f} events/s), {len(alerts)} alerts")
+
+    # Latency from the event that crosses a threshold to its alert callback
+    samples = []
+    for i in range(2000):
+        detector = AnomalyDetector(max_lockouts=2)
+        fired = []
+        detector.subscribe(lambda kind, door, message: fired.append(time.perf_counter_ns()))
+        detector.observe("door", LOCKED, None, 1.0)
+        started = time.perf_counter_ns()
+        detector.observe("door", LOCKED, None, 2.0)
+        samples.append(fired[0] - started)
+    samples.sort()
+    print(f"alert latency p50 {samples[len(samples) // 2] / 1000:.1f} us, "
+          f"p99 {samples[int(len(samples) * 0.99)] / 1000:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+from door_controller import DoorController
+from lock_engine import ENTER_KEY
+
+
+def measure_memory(door_count):
+    """Bytes allocated by a controller holding door_count doors"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    controller = DoorController()
+    controller.add_doors(range(door_count))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return controller, after - before
+
+
+def measure_latency(controller, events, seed=1):
+    """Per-event latency in nanoseconds for random doors and keys"""
+    rng = random.Random(seed)
+    door_count = len(controller)
+    keys = '0123456789' + ENTER_KEY
+    traffic = [(rng.randrange(door_count), rng.choice(keys)) for _ in range(events)]
+    press = controller.press
+    clock = time.perf_counter_ns
+    samples = []
+    now = 0.0
+    for door, key in traffic:
+        now += 0.0001
+        started = clock()
+        press(door, key, now)
+        samples.append(clock() - started)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-door controller memory and latency benchmark")
+    parser.add_argument('--events', type=int, default=200_000)
+    parser.add_argument('--sizes', default="10,100,1000,10000,100000")
+    args = parser.parse_args()
+
+    print(f"{'doors':>8} {'bytes/door':>11} {'p50 ns':>8} {'p99 ns':>8}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        controller, used = measure_memory(size)
+        p50, p99 = measure_latency(controller, args.events)
+        print(f"{size:>8} {used / size:>11.1f} {p50:>8} {p99:>8}")
+
+
+if __name__ == "__main__":
+    main()
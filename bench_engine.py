@@ -0,0 +1,53 @@
+import argparse
+import random
+import time
+
+from lock_engine import LockEngine, ENTER_KEY, DELETE_KEY
+
+
+def make_traffic(count, password, seed=1):
+    """Build a synthetic key stream mixing correct, wrong and edited codes"""
+    rng = random.Random(seed)
+    keys = []
+    while len(keys) < count:
+        roll = rng.random()
+        if roll < 0.3:
+            keys.extend(password)
+        elif roll < 0.9:
+            keys.extend(str(rng.randint(0, 9)) for _ in range(4))
+        else:
+            keys.extend(str(rng.randint(0, 9)) for _ in range(2))
+            keys.append(DELETE_KEY)
+            keys.append(str(rng.randint(0, 9)))
+            keys.append(str(rng.randint(0, 9)))
+        keys.append(ENTER_KEY)
+    return keys[:count]
+
+
+def run(count, lockout_time):
+    """Drive the engine with a virtual clock and return events per second"""
+    engine = LockEngine(lockout_time=lockout_time)
+    keys = make_traffic(count, engine.password)
+    clock = 0.0
+    press = engine.press
+    started = time.perf_counter()
+    for key in keys:
+        clock += 0.001
+        press(key, clock)
+    elapsed = time.perf_counter() - started
+    return count / elapsed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless lock engine throughput benchmark")
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--lockout', type=float, default=0.05,
+                        help="lockout length in virtual seconds")
+    args = parser.parse_args()
+
+    rate, elapsed = run(args.events, args.lockout)
+    print(f"{args.events} key events in {elapsed:.3f}s -> {rate:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
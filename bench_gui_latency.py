@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import random
+import resource
+import time
+import tkinter as tk
+
+from bench_support import load_app_module, require_display, ScratchDirectory
+from lock_engine import ENTER_KEY
+
+
+class LatencyProbe:
+    """Injects key events into the running app and times them until redrawn
+
+    Each key is queued with event_generate(when='tail') on hidden_entry, so
+    it waits behind whatever the event loop is busy with, exactly like a
+    real keypress. The first lock event it causes schedules an idle callback
+    that forces pending redraws (update_idletasks) and stops the clock.
+    """
+
+    def __init__(self, app, root, interval_ms, wrong_ratio, report_every, seed):
+        self.app = app
+        self.root = root
+        self.interval_ms = interval_ms
+        self.wrong_ratio = wrong_ratio
+        self.report_every = report_every
+        self.rng = random.Random(seed)
+        self.keys = []
+        self.sent_at = None
+        self.samples = []
+        self.buckets = []
+        self.started = time.perf_counter()
+        self.bucket_started = self.started
+        self.keypresses = 0
+        self.missed = 0
+        app.engine.subscribe(self.on_lock_event)
+
+    def next_key(self):
+        if not self.keys:
+            pin = self.app.password
+            if self.rng.random() < self.wrong_ratio:
+                pin = str((int(pin) + 1 + self.rng.randrange(9998)) % 10000).zfill(4)
+            self.keys = list(pin) + [ENTER_KEY]
+        return self.keys.pop(0)
+
+    def inject(self):
+        if self.sent_at is not None:
+            self.missed += 1  # previous key produced no lock event
+        key = self.next_key()
+        keysym = 'Return' if key == ENTER_KEY else key
+        self.app.hidden_entry.focus_force()
+        self.sent_at = time.perf_counter()
+        self.app.hidden_entry.event_generate('<KeyPress>', keysym=keysym, when='tail')
+        self.keypresses += 1
+        self.root.after(self.interval_ms, self.inject)
+
+    def on_lock_event(self, event, detail):
+        if self.sent_at is not None:
+            sent_at, self.sent_at = self.sent_at, None
+            self.root.after_idle(lambda: self.rendered(sent_at))
+
+    def rendered(self, sent_at):
+        self.root.update_idletasks()
+        now = time.perf_counter()
+        self.samples.append(now - sent_at)
+        if now - self.bucket_started >= self.report_every:
+            self.close_bucket(now)
+
+    def close_bucket(self, now):
+        samples = sorted(self.samples)
+        self.samples = []
+        self.bucket_started = now
+        if not samples:
+            return
+        pending = len(self.root.tk.splitlist(self.root.tk.call('after', 'info')))
+        log_size = os.path.getsize(self.app.log_file) if os.path.exists(self.app.log_file) else 0
+        bucket = {
+            'elapsed_s': round(now - self.started, 1),
+            'keys': len(samples),
+            'p50_ms': round(samples[len(samples) // 2] * 1000, 3),
+            'p99_ms': round(samples[int(len(samples) * 0.99)] * 1000, 3),
+            'max_ms': round(samples[-1] * 1000, 3),
+            'log_bytes': log_size,
+            'pending_after': pending,
+            'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+        self.buckets.append(bucket)
+        print(f"{bucket['elapsed_s']:>8.0f}s {bucket['keys']:>7} {bucket['p50_ms']:>8.2f} "
+              f"{bucket['p99_ms']:>8.2f} {bucket['max_ms']:>8.2f} {log_size / 1024:>10.0f} "
+              f"{pending:>6} {bucket['max_rss_kb'] / 1024:>8.1f}", flush=True)
+
+
+def prefill_log(path, megabytes):
+    """Start from a long history, as a panel that has been up for weeks would"""
+    line = "[2024-01-01 00:00:00] SUCCESS: Correct password\n"
+    with open(path, 'w') as f:
+        f.write(line * (megabytes * 1024 * 1024 // len(line)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keypress-to-render latency of the real GUI over a long run")
+    parser.add_argument('--duration', type=float, default=600.0, help="seconds to run")
+    parser.add_argument('--interval', type=int, default=20,
+                        help="ms between injected keys (20 ms compresses hours of use into minutes)")
+    parser.add_argument('--wrong', type=float, default=0.1, help="share of sessions with a wrong PIN")
+    parser.add_argument('--report-every', type=float, default=30.0, help="seconds per report row")
+    parser.add_argument('--prefill-mb', type=int, default=0, help="start with a log of this size")
+    parser.add_argument('--tab', type=int, default=0, help="tab to keep selected (1 = Admin, with live log view)")
+    parser.add_argument('--no-rate-limit', action='store_true',
+                        help="let wrong PINs through the per-keypad rate limiter")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='FILE', help="write the per-interval results as JSON")
+    args = parser.parse_args()
+
+    require_display()
+    module = load_app_module()
+    with ScratchDirectory():
+        if args.prefill_mb:
+            prefill_log("access_log.txt", args.prefill_mb)
+        root = tk.Tk()
+        app = module.DigitalLockSystem(root)
+        root.protocol("WM_DELETE_WINDOW", app.on_close)
+        if args.no_rate_limit:
+            app.engine.limiter = None
+        app.notebook.select(args.tab)
+        root.update()
+
+        probe = LatencyProbe(app, root, args.interval, args.wrong, args.report_every, args.seed)
+        print(f"{'elapsed':>9} {'keys':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+              f"{'log KiB':>10} {'after':>6} {'rss MiB':>8}")
+        root.after(args.interval, probe.inject)
+        root.after(int(args.duration * 1000), root.quit)
+        root.mainloop()
+        probe.close_bucket(time.perf_counter())
+        app.on_close()
+
+    print(f"{probe.keypresses} keys injected, {probe.missed} without a lock event")
+    if len(probe.buckets) >= 2:
+        first, last = probe.buckets[0], probe.buckets[-1]
+        print(f"p50 {first['p50_ms']:.2f} -> {last['p50_ms']:.2f} ms, "
+              f"p99 {first['p99_ms']:.2f} -> {last['p99_ms']:.2f} ms over {last['elapsed_s']:.0f}s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'interval_ms': args.interval, 'wrong': args.wrong, 'tab': args.tab,
+                       'prefill_mb': args.prefill_mb, 'buckets': probe.buckets}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
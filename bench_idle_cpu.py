@@ -0,0 +1,64 @@
+import argparse
+import time
+import tkinter as tk
+
+from bench_support import load_app_module, require_display, ScratchDirectory
+
+SCENARIOS = [
+    ("Lock tab", 0, False),
+    ("Admin tab", 1, False),
+    ("Architecture tab", 2, False),
+    ("Settings tab", 3, False),
+    ("Help tab", 4, False),
+    ("minimized", 0, True),
+]
+
+
+def idle_cpu(app, root, seconds):
+    """Fraction of one core used while the event loop idles for seconds"""
+    started_cpu = time.process_time()
+    started = time.perf_counter()
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+    return (time.process_time() - started_cpu) / (time.perf_counter() - started)
+
+
+def run(module, throttle, seconds):
+    results = {}
+    with ScratchDirectory():
+        root = tk.Tk()
+        app = module.DigitalLockSystem(root)
+        app.throttle_hidden_animations = throttle
+        app.update_animation_visibility()
+        # Tabs are built on first view; build the Architecture tab so its
+        # data_flow animation exists in every scenario, not just its own
+        app.notebook.select(2)
+        root.update()
+        for name, tab, minimized in SCENARIOS:
+            app.notebook.select(tab)
+            if minimized:
+                root.iconify()
+            root.update()
+            results[name] = idle_cpu(app, root, seconds)
+            if minimized:
+                root.deiconify()
+        app.on_close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle CPU usage per tab with and without animation throttling")
+    parser.add_argument('--seconds', type=float, default=10.0, help="measurement window per scenario")
+    args = parser.parse_args()
+
+    require_display()
+    module = load_app_module()
+    before = run(module, False, args.seconds)
+    after = run(module, True, args.seconds)
+    print(f"{'scenario':<16} {'always on':>10} {'throttled':>10}")
+    for name, _, _ in SCENARIOS:
+        print(f"{name:<16} {before[name]:>9.1%} {after[name]:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import time
+
+from bench_support import ScratchDirectory
+from lock_engine import LockEngine, ENTER_KEY
+from lock_journal import LockJournal, RECORD
+
+
+class VirtualClock:
+    def __init__(self, start):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def fill(count, snapshot_every, compact_bytes, sync):
+    """Journal count state changes of a lock under attack; returns engine, wall clock, ENTER latencies"""
+    clock = VirtualClock(1000.0)
+    wall = VirtualClock(1.7e9)
+    engine = LockEngine(clock=clock, lockout_time=30)
+    journal = LockJournal("lock_journal.bin", snapshot_every=snapshot_every,
+                          compact_bytes=compact_bytes, sync=sync, clock=wall)
+    journal.attach(engine)
+    wrong = "9999" + ENTER_KEY
+    right = engine.password + ENTER_KEY
+    latencies = []
+    timer = time.perf_counter_ns
+    written = 0
+    while written < count:
+        keys = right if written % 7 == 6 else wrong
+        for key in keys[:-1]:
+            engine.press(key)
+        begin = timer()
+        engine.press(keys[-1])
+        latencies.append(timer() - begin)
+        written += 1
+        if engine.is_locked:
+            clock.now += 31
+            wall.now += 31
+            engine.tick()
+            written += 1
+        clock.now += 1
+        wall.now += 1
+    journal.close()
+    latencies.sort()
+    return engine, wall, latencies
+
+
+def remove_journal():
+    for name in ("lock_journal.bin", "lock_journal.bin.snapshot"):
+        if os.path.exists(name):
+            os.remove(name)
+
+
+def recover(engine, wall):
+    """Fresh engine restored from disk, as after a restart"""
+    restored = LockEngine(clock=VirtualClock(5.0), lockout_time=30)
+    journal = LockJournal("lock_journal.bin", clock=wall)
+    journal.attach(restored)
+    journal.close()
+    assert (restored.attempts, restored.is_locked) == (engine.attempts, engine.is_locked)
+    return journal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lock journal append cost and recovery time")
+    parser.add_argument('--events', type=int, default=1_000_000, help="state changes to journal")
+    parser.add_argument('--snapshot-every', type=int, default=10000)
+    parser.add_argument('--sync-events', type=int, default=1000,
+                        help="events journaled with fsync to time durable appends")
+    parser.add_argument('--json', metavar='FILE', help="write the results as JSON")
+    args = parser.parse_args()
+
+    report = {'events': args.events, 'snapshot_every': args.snapshot_every}
+    with ScratchDirectory():
+        started = time.perf_counter()
+        engine, wall, latencies = fill(args.events, args.snapshot_every, 1 << 20, sync=False)
+        report['append_events_per_s'] = round(args.events / (time.perf_counter() - started))
+        report['journal_bytes'] = os.path.getsize("lock_journal.bin")
+        journal = recover(engine, wall)
+        report['recover_ms'] = round(journal.recovery_ms, 3)
+        report['recover_replayed'] = journal.replayed
+
+        # Worst case: no snapshot or compaction, the whole history is replayed
+        remove_journal()
+        engine, wall, _ = fill(args.events, args.events * 2, 1 << 62, sync=False)
+        os.remove("lock_journal.bin.snapshot")
+        report['full_journal_bytes'] = os.path.getsize("lock_journal.bin")
+        journal = recover(engine, wall)
+        report['full_replay_ms'] = round(journal.recovery_ms, 3)
+        report['full_replayed'] = journal.replayed
+
+        remove_journal()
+        _, _, latencies = fill(args.sync_events, args.snapshot_every, 1 << 20, sync=True)
+        report['fsync_enter_p50_us'] = round(latencies[len(latencies) // 2] / 1000, 1)
+        report['fsync_enter_p99_us'] = round(latencies[int(len(latencies) * 0.99)] / 1000, 1)
+
+    print(f"{report['events']:,} events journaled at {report['append_events_per_s']:,} events/s "
+          f"({RECORD.size} bytes each, journal now {report['journal_bytes'] / 1024:,.0f} KiB)")
+    print(f"recovery from snapshot + tail: {report['recover_ms']:.2f} ms "
+          f"({report['recover_replayed']} records replayed)")
+    print(f"recovery without snapshot: {report['full_replay_ms']:.2f} ms "
+          f"({report['full_replayed']:,} records, {report['full_journal_bytes'] / 1048576:.1f} MiB)")
+    print(f"ENTER with fsynced journal: p50 {report['fsync_enter_p50_us']} us, "
+          f"p99 {report['fsync_enter_p99_us']} us")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+
+from bench_support import ScratchDirectory
+from lock_engine import LockEngine, ENTER_KEY
+from rate_limiter import RateLimiter
+
+# Share of sessions per kind; the rest type the correct PIN
+WRONG_PIN = 0.25
+SHORT_PIN = 0.05
+ADMIN_RESET = 0.01
+KEY_GAP = 0.3  # simulated seconds between keypresses
+
+
+class VirtualClock:
+    """Simulated monotonic time, advanced by the traffic generator"""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+class StubWidget:
+    """Accepts the widget calls the lock screen makes and does nothing"""
+
+    configs = 0  # config() calls across all stubs, i.e. Tk round trips saved or spent
+
+    def __init__(self, **options):
+        self.options = dict(options)
+
+    def config(self, **options):
+        StubWidget.configs += 1
+        self.options.update(options)
+
+    configure = config
+
+    def cget(self, key):
+        return self.options.get(key, '')
+
+    def focus_set(self):
+        pass
+
+    def delete(self, first, last=None):
+        pass
+
+
+class StubRoot:
+    """after() bookkeeping only - the benchmark advances the timer wheel itself"""
+
+    def __init__(self):
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class KeyEvent:
+    def __init__(self, char, keysym):
+        self.char = char
+        self.keysym = keysym
+
+
+def sessions(count, password, seed):
+    """Keypad sessions as (keys, admin_reset) with a realistic mix of PINs"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        roll = rng.random()
+        if roll < WRONG_PIN:
+            pin = password
+            while pin == password:
+                pin = ''.join(rng.choice('0123456789') for _ in range(4))
+        elif roll < WRONG_PIN + SHORT_PIN:
+            pin = ''.join(rng.choice('0123456789') for _ in range(rng.randint(1, 3)))
+        else:
+            pin = password
+        yield pin, rng.random() < ADMIN_RESET
+
+
+class Recorder:
+    """Latency samples per operation name"""
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, name, nanoseconds):
+        self.samples.setdefault(name, []).append(nanoseconds)
+
+    def summary(self):
+        result = {}
+        for name, samples in sorted(self.samples.items()):
+            samples.sort()
+            total = sum(samples)
+            result[name] = {
+                'count': len(samples),
+                'ops_per_s': round(len(samples) / (total / 1e9), 1) if total else None,
+                'p50_us': round(samples[len(samples) // 2] / 1000, 2),
+                'p99_us': round(samples[int(len(samples) * 0.99)] / 1000, 2),
+            }
+        return result
+
+
+def build_engine(clock):
+    engine = LockEngine(clock=clock, limiter=RateLimiter(clock=clock), source="keypad:bench")
+    return engine
+
+
+def run_engine(count, seed):
+    """Drive LockEngine alone: the pure state machine cost"""
+    clock = VirtualClock()
+    engine = build_engine(clock)
+    recorder = Recorder()
+    events = {}
+    timer = time.perf_counter_ns
+    started = time.perf_counter()
+    for pin, admin_reset in sessions(count, engine.password, seed):
+        for key in pin + ENTER_KEY:
+            clock.now += KEY_GAP
+            begin = timer()
+            event = engine.press(key)
+            recorder.add('engine.press' if key != ENTER_KEY else 'engine.check_password',
+                         timer() - begin)
+            events[event] = events.get(event, 0) + 1
+        engine.tick()
+        if admin_reset:
+            begin = timer()
+            engine.reset()
+            recorder.add('engine.reset', timer() - begin)
+    elapsed = time.perf_counter() - started
+    total = sum(events.values())
+    return {'events': total, 'events_per_s': round(total / elapsed, 1),
+            'event_mix': {str(k): v for k, v in sorted(events.items(), key=lambda kv: str(kv[0]))},
+            'operations': recorder.summary()}
+
+
+def build_headless_app(module, clock):
+    """A DigitalLockSystem built by init_core, with stub widgets instead of Tk"""
+    app = module.DigitalLockSystem.__new__(module.DigitalLockSystem)
+    app.init_core(StubRoot(), clock=clock)
+    app.door_id = "bench"
+    app.engine.source = "keypad:bench"
+    app.sound_enabled = False
+    app.audio_feedback = False
+    app.status_label = StubWidget()
+    app.security_label = StubWidget()
+    app.attempts_label = StubWidget()
+    app.password_display = StubWidget(text="• • • •", bg='#0a0f18')
+    app.hidden_entry = StubWidget()
+    app.keypad_buttons = {key: StubWidget(bg='#2196f3') for key in "0123456789" + ENTER_KEY}
+    app.create_lock_views()
+    return app
+
+
+def run_app(module, count, seed):
+    """Drive the GUI handlers (button_click, handle_keypress, ...) against stub widgets"""
+    clock = VirtualClock()
+    app = build_headless_app(module, clock)
+    recorder = Recorder()
+    timer = time.perf_counter_ns
+    keypress = app.handle_keypress
+    keys = 0
+    configs = 0
+    started = time.perf_counter()
+    try:
+        for index, (pin, admin_reset) in enumerate(sessions(count, app.engine.password, seed)):
+            # Alternate between the on-screen keypad and the physical keyboard
+            use_keyboard = index % 2
+            configs_before = StubWidget.configs
+            for key in pin:
+                clock.now += KEY_GAP
+                if use_keyboard:
+                    event = KeyEvent(key, key)
+                    begin = timer()
+                    keypress(event)
+                    recorder.add('handle_keypress', timer() - begin)
+                else:
+                    begin = timer()
+                    app.button_click(key)
+                    recorder.add('button_click', timer() - begin)
+                app.timers.wheel.advance(clock.now)
+            clock.now += KEY_GAP
+            begin = timer()
+            app.check_password()
+            recorder.add('check_password', timer() - begin)
+            keys += len(pin) + 1
+            configs += StubWidget.configs - configs_before
+            begin = timer()
+            app.update_display()
+            recorder.add('update_display', timer() - begin)
+            begin = timer()
+            app.log_access("BENCH", f"session {index}")
+            recorder.add('log_access', timer() - begin)
+            app.timers.wheel.advance(clock.now)
+            if admin_reset:
+                app.engine.reset()
+        handlers_done = time.perf_counter()
+        app.log_writer.flush(timeout=60)
+        finished = time.perf_counter()
+    finally:
+        app.close_core()
+    log_bytes = os.path.getsize(app.log_file)
+    operations = recorder.summary()
+    return {'events': sum(op['count'] for op in operations.values()),
+            'events_per_s': round(sum(op['count'] for op in operations.values())
+                                  / (handlers_done - started), 1),
+            'log_bytes': log_bytes,
+            'log_bytes_per_s': round(log_bytes / (finished - started), 1),
+            'widget_configs_per_key': round(configs / keys, 3),
+            'operations': operations}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(report):
+    for suite in ('engine', 'app'):
+        result = report.get(suite)
+        if result is None:
+            continue
+        line = f"\n[{suite}] {result['events']} events, {result['events_per_s']:,.0f} events/s"
+        if 'log_bytes_per_s' in result:
+            line += f", log {result['log_bytes_per_s'] / 1024:,.0f} KiB/s"
+        if 'widget_configs_per_key' in result:
+            line += f", {result['widget_configs_per_key']:.2f} widget configs/key"
+        print(line)
+        print(f"  {'operation':<24} {'count':>8} {'ops/s':>12} {'p50 us':>8} {'p99 us':>8}")
+        for name, op in result['operations'].items():
+            print(f"  {name:<24} {op['count']:>8} {op['ops_per_s']:>12,.0f} "
+                  f"{op['p50_us']:>8.2f} {op['p99_us']:>8.2f}")
+
+
+def print_comparison(old, new):
+    """p50 change per operation between two reports"""
+    print(f"\nvs {old.get('revision') or 'baseline'}:")
+    before, after = old.get('app', {}), new.get('app', {})
+    if 'widget_configs_per_key' in before and 'widget_configs_per_key' in after:
+        print(f"  widget configs per key {before['widget_configs_per_key']:.2f} -> "
+              f"{after['widget_configs_per_key']:.2f}")
+    for suite in ('engine', 'app'):
+        before, after = old.get(suite), new.get(suite)
+        if not before or not after:
+            continue
+        for name, op in after['operations'].items():
+            previous = before['operations'].get(name)
+            if previous and previous['p50_us']:
+                change = (op['p50_us'] - previous['p50_us']) / previous['p50_us'] * 100
+                print(f"  {suite}/{name:<24} p50 {previous['p50_us']:>8.2f} -> "
+                      f"{op['p50_us']:>8.2f} us ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless throughput/latency benchmark of the lock logic")
+    parser.add_argument('--sessions', type=int, default=50_000, help="keypad sessions per suite")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='FILE', help="write the results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="JSON results of an earlier run")
+    parser.add_argument('--engine-only', action='store_true', help="skip the GUI handler suite")
+    args = parser.parse_args()
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'sessions': args.sessions,
+        'seed': args.seed,
+        'engine': run_engine(args.sessions, args.seed),
+    }
+    if not args.engine_only:
+        try:
+            from bench_support import load_app_module
+            module = load_app_module()
+        except ImportError as e:
+            print(f"GUI handler suite skipped: {e}")
+        else:
+            with ScratchDirectory():
+                report['app'] = run_app(module, args.sessions, args.seed)
+
+    print_report(report)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from log_writer import BufferedLogWriter
+
+
+def make_entry(i):
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return f"[{timestamp}] FAILED: Wrong password: {i % 10000:04d}\n"
+
+
+def bench_open_append_close(path, count):
+    """The original log_access path: one open/append/close per entry"""
+    started = time.perf_counter()
+    for i in range(count):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(make_entry(i))
+    return time.perf_counter() - started
+
+
+def bench_buffered(path, count):
+    """Queue entries to the background writer; returns (caller time, total time)"""
+    writer = BufferedLogWriter(path)
+    started = time.perf_counter()
+    for i in range(count):
+        writer.write(make_entry(i))
+    queued = time.perf_counter() - started
+    writer.close()
+    return queued, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Access log writer benchmark")
+    parser.add_argument('--entries', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct = bench_open_append_close(os.path.join(tmp, "direct.txt"), args.entries)
+        queued, total = bench_buffered(os.path.join(tmp, "buffered.txt"), args.entries)
+
+        for name in ("direct.txt", "buffered.txt"):
+            with open(os.path.join(tmp, name), encoding='utf-8') as f:
+                assert sum(1 for _ in f) == args.entries, name
+
+    n = args.entries
+    print(f"open-append-close : {n / direct:>12,.0f} entries/s")
+    print(f"buffered (caller) : {n / queued:>12,.0f} entries/s")
+    print(f"buffered (on disk): {n / total:>12,.0f} entries/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+from bench_lock import VirtualClock, Recorder, KeyEvent, sessions, build_headless_app, KEY_GAP
+from bench_support import load_app_module, ScratchDirectory
+from metrics import MetricsServer
+
+
+class Scraper:
+    """Fetches /metrics every interval seconds from a background thread, like Prometheus"""
+
+    def __init__(self, url, interval):
+        self.url = url
+        self.interval = interval
+        self.scrapes = 0
+        self.bytes = 0
+        self.durations = []
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="scraper", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopping.wait(self.interval):
+            started = time.perf_counter()
+            with urllib.request.urlopen(self.url, timeout=5) as response:
+                self.bytes += len(response.read())
+            self.durations.append(time.perf_counter() - started)
+            self.scrapes += 1
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+
+
+def run(module, count, seed, scrape_interval):
+    """Keypad sessions through the GUI handlers, optionally while being scraped"""
+    clock = VirtualClock()
+    app = build_headless_app(module, clock)
+    server = MetricsServer(app.metrics.registry, port=0)
+    server.start()
+    scraper = None
+    if scrape_interval:
+        scraper = Scraper(f"http://127.0.0.1:{server.port}/metrics", scrape_interval)
+        scraper.start()
+    recorder = Recorder()
+    timer = time.perf_counter_ns
+    started = time.perf_counter()
+    try:
+        for index, (pin, admin_reset) in enumerate(sessions(count, app.engine.password, seed)):
+            for key in pin:
+                clock.now += KEY_GAP
+                begin = timer()
+                app.handle_keypress(KeyEvent(key, key))
+                recorder.add('handle_keypress', timer() - begin)
+                app.timers.wheel.advance(clock.now)
+            clock.now += KEY_GAP
+            begin = timer()
+            app.check_password()
+            recorder.add('check_password', timer() - begin)
+            app.timers.wheel.advance(clock.now)
+            if admin_reset:
+                app.engine.reset()
+        elapsed = time.perf_counter() - started
+    finally:
+        if scraper is not None:
+            scraper.stop()
+        server.stop()
+        app.close_core()
+    result = {'scrape_interval_s': scrape_interval, 'elapsed_s': round(elapsed, 2),
+              'operations': recorder.summary()}
+    if scraper is not None:
+        durations = sorted(scraper.durations) or [0.0]
+        result.update(scrapes=scraper.scrapes, scrape_bytes=scraper.bytes // max(scraper.scrapes, 1),
+                      scrape_p50_ms=round(durations[len(durations) // 2] * 1000, 3))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keypad handler latency with and without metrics scrapes")
+    parser.add_argument('--sessions', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--interval', type=float, action='append',
+                        help="seconds between scrapes (repeatable); default 1 and 0.01 (stress)")
+    parser.add_argument('--json', metavar='FILE', help="write the results as JSON")
+    args = parser.parse_args()
+
+    module = load_app_module()
+    results = []
+    with ScratchDirectory():
+        for interval in [None] + (args.interval or [1.0, 0.01]):
+            results.append(run(module, args.sessions, args.seed, interval))
+
+    baseline = results[0]['operations']
+    print(f"{'scrapes every':>14} {'operation':<18} {'p50 us':>8} {'p99 us':>8} {'p99 change':>11}")
+    for result in results:
+        label = f"{result['scrape_interval_s']}s" if result['scrape_interval_s'] else "never"
+        for name, op in result['operations'].items():
+            change = (op['p99_us'] - baseline[name]['p99_us']) / baseline[name]['p99_us'] * 100
+            print(f"{label:>14} {name:<18} {op['p50_us']:>8.2f} {op['p99_us']:>8.2f} {change:>+10.1f}%")
+        if 'scrapes' in result:
+            print(f"{'':>14} {result['scrapes']} scrapes of {result['scrape_bytes']} bytes, "
+                  f"p50 {result['scrape_p50_ms']:.2f} ms")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+from rate_limiter import RateLimiter
+
+
+def fill(source_count):
+    """Limiter tracking source_count distinct sources, and the bytes it uses"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    limiter = RateLimiter(max_sources=source_count)
+    hit = limiter.hit
+    for i in range(source_count):
+        hit(f"remote:{i}", i * 0.001)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return limiter, after - before
+
+
+def measure_latency(limiter, checks, seed=1):
+    """Per check-and-hit latency in nanoseconds for random known sources"""
+    rng = random.Random(seed)
+    sources = [f"remote:{rng.randrange(len(limiter))}" for _ in range(checks)]
+    retry_after = limiter.retry_after
+    hit = limiter.hit
+    clock = time.perf_counter_ns
+    samples = []
+    now = 10_000.0
+    for source in sources:
+        now += 0.001
+        started = clock()
+        if not retry_after(source, now):
+            hit(source, now)
+        samples.append(clock() - started)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate limiter memory and per-check cost by source count")
+    parser.add_argument('--checks', type=int, default=200_000)
+    parser.add_argument('--sizes', default="1000,10000,100000,1000000")
+    args = parser.parse_args()
+
+    print(f"{'sources':>8} {'bytes/src':>10} {'p50 ns':>8} {'p99 ns':>8}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        limiter, used = fill(size)
+        p50, p99 = measure_latency(limiter, args.checks)
+        print(f"{size:>8} {used / size:>10.1f} {p50:>8} {p99:>8}")
+
+
+if __name__ == "__main__":
+    main()
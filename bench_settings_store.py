@@ -0,0 +1,54 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from settings_store import SettingsStore
+
+
+def scrub(save, clicks, interval):
+    """Simulate an operator holding a spinbox arrow; returns seconds spent in save()"""
+    settings = {'password': "1234", 'max_attempts': 3, 'lockout_time': 30}
+    blocked = 0.0
+    for i in range(clicks):
+        settings['lockout_time'] = 30 + i
+        started = time.perf_counter()
+        save(settings)
+        blocked += time.perf_counter() - started
+        time.sleep(interval)
+    return blocked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Settings writes while scrubbing a spinbox")
+    parser.add_argument('--clicks', type=int, default=100)
+    parser.add_argument('--interval', type=float, default=0.05,
+                        help="seconds between clicks (Tk auto-repeat is ~50 ms)")
+    parser.add_argument('--delay', type=float, default=0.5, help="quiet period before writing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lock_settings.json")
+        writes = 0
+
+        def save_sync(settings):
+            nonlocal writes
+            with open(path, 'w') as f:
+                json.dump(settings, f)
+            writes += 1
+
+        blocked = scrub(save_sync, args.clicks, args.interval)
+        print(f"{'synchronous':<12} {writes:>4} writes, {blocked * 1000:7.2f} ms on the UI thread")
+
+        store = SettingsStore(path, delay=args.delay)
+        blocked = scrub(store.save, args.clicks, args.interval)
+        store.close()
+        with open(path) as f:
+            final = json.load(f)['lockout_time']
+        print(f"{'debounced':<12} {store.writes:>4} writes, {blocked * 1000:7.2f} ms on the UI thread "
+              f"(final lockout_time {final})")
+
+
+if __name__ == "__main__":
+    main()
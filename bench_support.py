@@ -0,0 +1,35 @@
+import importlib.util
+import os
+import tempfile
+
+APP_FILE = "digital lock system by fsm.py"
+
+
+def load_app_module():
+    """Import the GUI script, whose file name is not a valid module name"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), APP_FILE)
+    spec = importlib.util.spec_from_file_location("digital_lock_system", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def require_display():
+    """Exit with a hint when no X display is available"""
+    if os.name != 'nt' and not os.environ.get('DISPLAY'):
+        raise SystemExit("No display found - run under Xvfb, e.g. xvfb-run -a python "
+                         + os.path.basename(__import__('sys').argv[0]))
+
+
+class ScratchDirectory:
+    """Run the app inside a temporary directory so settings and logs stay isolated"""
+
+    def __enter__(self):
+        self.previous = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        return self.tmp.name
+
+    def __exit__(self, *exc):
+        os.chdir(self.previous)
+        self.tmp.cleanup()
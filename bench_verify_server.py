@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def raise_fd_limit():
+    """Allow thousands of sockets in this process"""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def client(reader, writer, requests, door_count, password, interval, latencies):
+    """One panel connection sending attempts, paced by interval seconds"""
+    rng = random.Random()
+    clock = time.perf_counter
+    if interval:
+        # Spread the panels out so they do not all fire in the same instant
+        await asyncio.sleep(rng.random() * interval)
+    for _ in range(requests):
+        door = rng.randint(1, door_count)
+        pin = password if rng.random() < 0.3 else f"{rng.randint(0, 9999):04d}"
+        started = clock()
+        writer.write(f"{door} {pin}\n".encode('ascii'))
+        await reader.readline()
+        latencies.append(clock() - started)
+        if interval:
+            await asyncio.sleep(interval)
+    writer.close()
+
+
+async def run_load(host, port, connections, requests, door_count, password, interval):
+    """Open every connection first, then send from all of them at once"""
+    streams = await asyncio.gather(*(asyncio.open_connection(host, port)
+                                     for _ in range(connections)))
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(reader, writer, requests, door_count, password,
+                                  interval, latencies)
+                           for reader, writer in streams))
+    return latencies, time.perf_counter() - started
+
+
+def load_worker(host, port, connections, requests, door_count, password, interval, results):
+    """Run one share of the connections in a separate client process"""
+    raise_fd_limit()
+    latencies, elapsed = asyncio.run(run_load(host, port, connections, requests,
+                                              door_count, password, interval))
+    results.put((latencies, elapsed))
+
+
+def wait_for_server(process):
+    """Block until the spawned service prints its banner"""
+    line = process.stdout.readline()
+    if "listening" not in line:
+        raise RuntimeError(f"Service failed to start: {line!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for verify_server.py")
+    parser.add_argument('--connect', help="host:port of a running service (default: spawn one)")
+    parser.add_argument('--connections', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=20, help="requests per connection")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="seconds between attempts on one connection (0 = closed loop)")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="client processes sharing the connections")
+    parser.add_argument('--doors', type=int, default=1000)
+    parser.add_argument('--password', default="1234")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        run_configuration("given service", args, host, int(port))
+        return
+    # Every simulated panel connects from 127.0.0.1, so with the default
+    # per-client rate limit most replies are THROTTLED; both setups are measured
+    for label, extra in (("default (rate limited)", []), ("--no-rate-limit", ['--no-rate-limit'])):
+        host, port = "127.0.0.1", 8765
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "verify_server.py")
+        process = subprocess.Popen([sys.executable, script, '--port', str(port),
+                                    '--doors', str(args.doors), '--password', args.password] + extra,
+                                   stdout=subprocess.PIPE, text=True)
+        try:
+            wait_for_server(process)
+            run_configuration(label, args, host, port)
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def run_configuration(label, args, host, port):
+    """Drive one running service and print its throughput and latency"""
+    # Spread the panels over several client processes so the generator
+    # itself does not become the bottleneck being measured
+    worker_count = max(1, min(args.workers, args.connections))
+    shares = [args.connections // worker_count + (1 if i < args.connections % worker_count else 0)
+              for i in range(worker_count)]
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=load_worker,
+                                       args=(host, port, share, args.requests, args.doors,
+                                             args.password, args.interval, results))
+               for share in shares]
+    for worker in workers:
+        worker.start()
+    latencies, elapsed = [], 0.0
+    for _ in workers:
+        worker_latencies, worker_elapsed = results.get()
+        latencies.extend(worker_latencies)
+        elapsed = max(elapsed, worker_elapsed)
+    for worker in workers:
+        worker.join()
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"[{label}] {sum(shares)} connections, {count} requests in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:,.0f} req/s)")
+    if not count:
+        return
+    for name, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+        print(f"{name}: {latencies[min(count - 1, int(count * q))] * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import fnmatch
+import json
+import os
+
+from settings_store import validate_settings
+
+
+def file_signature(st):
+    """What changes when a file is edited in place or replaced by rename"""
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class ConfigWatcher:
+    """Polls settings files and config directories for changes
+
+    Every subscriber of a path shares one entry, so a process running
+    hundreds of doors off the same file still does a single os.stat() of it
+    per poll. A directory costs one listing plus one stat per matching file.
+    Changed files are parsed and validated once, then every callback gets
+    callback(path, settings). Files that fail to parse or validate are
+    reported and skipped; the running configuration stays as it was.
+
+    poll() does no waiting of its own - call it from a Tk timer, an asyncio
+    task or a loop at whatever interval suits.
+    """
+
+    def __init__(self):
+        self.files = {}        # path -> [signature, callbacks]
+        self.directories = {}  # path -> [pattern, {file: signature}, callbacks]
+        self.errors = {}       # path -> last error message
+        self.polls = 0
+
+    def watch(self, path, callback, initial=False):
+        """Call callback(path, settings) whenever path changes"""
+        entry = self.files.get(path)
+        if entry is None:
+            entry = self.files[path] = [self._signature(path), []]
+        entry[1].append(callback)
+        if initial and entry[0] is not None:
+            settings = self._load(path)
+            if settings is not None:
+                callback(path, settings)
+
+    def watch_directory(self, path, callback, pattern="*.json", initial=False):
+        """Call callback(file, settings) for every new or changed matching file
+
+        With initial, callback first gets every matching file already there.
+        """
+        entry = self.directories.get(path)
+        if entry is None:
+            entry = self.directories[path] = [pattern, self._scan(path, pattern), []]
+        entry[2].append(callback)
+        if initial:
+            for file in sorted(entry[1]):
+                self._notify(file, [callback])
+
+    def unwatch(self, path, callback):
+        for watched in (self.files, self.directories):
+            entry = watched.get(path)
+            if entry is not None and callback in entry[-1]:
+                entry[-1].remove(callback)
+                if not entry[-1]:
+                    del watched[path]
+
+    def _signature(self, path):
+        try:
+            return file_signature(os.stat(path))
+        except OSError:
+            return None
+
+    def _scan(self, path, pattern):
+        signatures = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                        signatures[entry.path] = file_signature(entry.stat())
+        except OSError:
+            pass
+        return signatures
+
+    def _load(self, path):
+        """Parse and validate one file; None (and an error report) if it is bad"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                settings = validate_settings(json.load(f))
+        except (OSError, ValueError) as e:
+            message = f"{path}: {e}"
+            if self.errors.get(path) != message:
+                print(f"Config reload error: {message}")
+            self.errors[path] = message
+            return None
+        self.errors.pop(path, None)
+        return settings
+
+    def _notify(self, path, callbacks):
+        settings = self._load(path)
+        if settings is None:
+            return 0
+        for callback in list(callbacks):
+            try:
+                callback(path, settings)
+            except Exception as e:
+                print(f"Config apply error: {e}")
+        return 1
+
+    def poll(self):
+        """Check every watched path once; returns the number of files reloaded"""
+        self.polls += 1
+        reloaded = 0
+        for path, entry in list(self.files.items()):
+            signature = self._signature(path)
+            if signature != entry[0]:
+                entry[0] = signature
+                if signature is not None:
+                    reloaded += self._notify(path, entry[1])
+        for path, entry in list(self.directories.items()):
+            pattern, known, callbacks = entry
+            current = self._scan(path, pattern)
+            for file, signature in current.items():
+                if known.get(file) != signature:
+                    reloaded += self._notify(file, callbacks)
+            entry[1] = current
+        return reloaded
+
+
+def apply_to_engine(engine, settings):
+    """Update a LockEngine in place; attempts, input and any lockout are kept"""
+    if 'password' in settings:
+        engine.password = settings['password']
+    if 'max_attempts' in settings:
+        engine.max_attempts = settings['max_attempts']
+    if 'lockout_time' in settings:
+        # A lockout already running keeps its deadline; the new length applies next time
+        engine.lockout_time = settings['lockout_time']
+
+
+def apply_to_controller(controller, settings):
+    """Update a DoorController in place, including per-door passwords
+
+    {"max_attempts": 5, "lockout_time": 60, "doors": {"12": {"password": "4821"}}}
+    """
+    if 'max_attempts' in settings:
+        controller.max_attempts = settings['max_attempts']
+    if 'lockout_time' in settings:
+        controller.lockout_time = settings['lockout_time']
+    if 'password' in settings:
+        for door_id in controller.door_ids:
+            controller.set_password(door_id, settings['password'])
+    for door_id, door_settings in settings.get('doors', {}).items():
+        if door_id in controller and 'password' in door_settings:
+            controller.set_password(door_id, door_settings['password'])
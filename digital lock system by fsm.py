@@ -1,21 +1,86 @@
+import time
+STARTUP_STARTED = time.perf_counter()  # reference point for --startup-timing
 import tkinter as tk
 from tkinter import messagebox, ttk
 import threading
-import time
 import random
 import string
 from datetime import datetime
 import json
 import os
+import sys
+
+from animation import FrameScheduler
+from timer_wheel import TkTimers
+from log_writer import BufferedLogWriter
+from settings_store import SettingsStore, validate_settings
+from config_watcher import ConfigWatcher, apply_to_engine
+import log_archive
+import log_export
+from log_viewer import VirtualLogView
+from log_store import LogStore, to_epoch, from_epoch
+from lock_engine import (LockEngine, INPUT, DELETE, CLEAR, SUCCESS, FAILED,
+                         INVALID, LOCKED, UNLOCKED, EMERGENCY, REJECTED, RESET,
+                         THROTTLED)
+from rate_limiter import RateLimiter, DEFAULT_TIERS
+from anomaly_detector import AnomalyDetector
+from profiling import HandlerProfiler, CProfileCapture, StackSampler
+from metrics import Gauge, LockMetrics, MetricsServer
+from view_model import ViewModel
+from lock_journal import LockJournal
+from startup_timing import StartupTimer
+IMPORTS_DONE = time.perf_counter()
+
+# Handlers and I/O methods whose latency can be recorded from Settings
+PROFILED_HANDLERS = (
+    'button_click', 'handle_keypress', 'on_lock_event', 'check_password',
+    'update_display', 'show_message', 'play_sound', 'animate_button_press',
+    'animate_success', 'animate_cursor', 'log_access', 'refresh_access_logs',
+    'load_access_logs', 'search_logs', 'export_logs', 'save_settings',
+    'on_settings_changed', 'on_tab_change', 'update_lockout_countdown',
+    'lockout_timer', 'on_security_alert',
+)
 
 class DigitalLockSystem:
-    def __init__(self, root):
+    def __init__(self, root, metrics_port=None):
         self.root = root
         self.root.title("🔒 THE VAULT - Advanced Digital Lock System")
         self.root.geometry("800x850")
         self.root.configure(bg='#0f1b2e')
         self.root.resizable(True, True)
         
+        # Center the window
+        self.center_window()
+        
+        # Lock logic, logging and timers; none of it needs a display
+        self.init_core(root)
+        # --metrics-port wins over the settings file for this run and is never saved
+        self.metrics_port_arg = metrics_port
+        
+        # Create modern interface
+        self.create_main_interface()
+        
+        # Serve the counters to a local Prometheus; scrapes run on their own thread
+        self.start_metrics_server()
+        
+        # Pick up edits to the settings file (and fleet directory) while running
+        self.config_watcher = ConfigWatcher()
+        self.config_watcher.watch(self.settings_file, self.on_settings_changed)
+        if self.config_dir:
+            self.config_watcher.watch_directory(self.config_dir, self.on_settings_changed, initial=True)
+        self.timers.call_every(1.0, self.config_watcher.poll)
+        
+        if self.lockout_restored:
+            self.resume_lockout()
+    
+    def init_core(self, root, clock=time.monotonic):
+        """Set up the lock, its logging and timers: everything but the widgets
+
+        root only needs after() and after_cancel(), so benchmarks build a
+        working app on a stub root and a simulated clock with this alone.
+        """
+        self.root = root
+        
         # Initialize entry fields first
         self.old_pass_entry = None
         self.new_pass_entry = None
@@ -25,10 +90,22 @@ class DigitalLockSystem:
         self.audio_var = None
         self.haptic_var = None
         
-        # Center the window
-        self.center_window()
+        # Wrap handlers before any of them is given to Tk or the engine;
+        # nothing is recorded until enabled from the Settings tab
+        self.profiler = HandlerProfiler(self, PROFILED_HANDLERS)
+        self.profiler.install()
+        self.profile_var = None
+        self.profile_capture = None
+        
+        # Initialize system - the lock FSM runs headless in LockEngine
+        self.engine = LockEngine(clock=clock)
+        self.engine.subscribe(self.on_lock_event)
+        
+        # Counters are only ever updated on the Tk thread, so they need no lock
+        self.metrics = LockMetrics(clock=clock)
+        self.engine.subscribe(self.metrics.observe_event)
+        self.register_metric_gauges()
         
-        # Initialize system
         self.password = "1234"
         self.attempts = 0
         self.max_attempts = 3
@@ -37,20 +114,128 @@ class DigitalLockSystem:
         self.lockout_time = 30  # seconds
         self.audio_feedback = True
         self.haptic_feedback = True
+        self.door_id = "main"
+        self.log_store_enabled = False  # optional SQLite index of the log
+        self.log_store = None
+        self.log_store_var = None
+        self.log_max_bytes = 10 * 1024 * 1024  # rotate the live log past 10 MB
+        self.log_rotate_daily = True
+        self.log_backup_count = 30  # compressed archives to keep
+        self.rate_limit_tiers = [list(tier) for tier in DEFAULT_TIERS]  # [attempts, seconds]
+        self.config_dir = None  # optional fleet directory: fleet.json and <door_id>.json
+        self.fleet_files = {}  # 'fleet' / 'door' -> settings last read from config_dir
+        self.fleet_applied = {}  # the two merged, as last applied
+        self.metrics_port = None  # Prometheus endpoint on localhost, e.g. 9108; off by default
         
         # Load settings and logs
         self.settings_file = "lock_settings.json"
         self.log_file = "access_log.txt"
+        # Settings are written atomically, off the Tk thread, after changes settle
+        self.settings_store = SettingsStore(self.settings_file)
         self.load_settings()
         
+        # Failed codes also count per source, independent of the lockout cycle
+        self.rate_limiter = RateLimiter(self.rate_limit_tiers, max_sources=1024, clock=clock)
+        self.engine.limiter = self.rate_limiter
+        self.engine.source = f"keypad:{self.door_id}"
+        
+        # Attempts and lockouts are journaled, so a restart cannot end a lockout
+        self.journal_file = "lock_journal.bin"
+        self.journal = LockJournal(self.journal_file)
+        self.lockout_restored = False
+        try:
+            self.lockout_restored = self.journal.attach(self.engine)
+        except OSError as e:
+            print(f"Lock journal error: {e}")
+        
+        # Log lines are written in batches by a background thread
+        self.log_writer = BufferedLogWriter(self.log_file,
+                                            max_bytes=self.log_max_bytes,
+                                            rotate_daily=self.log_rotate_daily,
+                                            backup_count=self.log_backup_count)
+        self.log_refresh_pending = False
+        self.log_store_file = "access_log.db"
+        self.export_thread = None
+        self.export_result = None
+        self.export_cancel = threading.Event()
+        if self.log_store_enabled:
+            self.enable_log_store()
+        
+        # Every deadline (lockouts, monitors, animations) lives in one timer wheel
+        self.timers = TkTimers(root, clock=clock)
+        self.lockout_expiry = None
+        self.lockout_countdown = None
+        
+        # Every animation runs on one non-blocking frame loop
+        self.animator = FrameScheduler(root, fps=30, clock=clock, timers=self.timers)
+        
+        # Animations only run while their tab is on screen
+        self.throttle_hidden_animations = True
+        self.tab_animation_groups = {0: ('cursor', 'success'), 2: ('data_flow',)}
+        self.current_tab = 0
+        self.window_visible = True
+        
         # Create sound effects
         self.create_sounds()
         
-        # Create modern interface
-        self.create_main_interface()
+        # Security checks run on every lock event as it happens
+        self.detector = AnomalyDetector(clock=clock)
+        self.detector.subscribe(self.on_security_alert)
+        self.engine.subscribe(lambda event, detail: self.detector.observe(self.door_id, event, detail))
         
-        # Start security monitoring
-        self.security_monitor()
+        self.metrics_server = None  # started by __init__ once the window exists
+        self.metrics_port_arg = None
+    
+    # Lock state lives in the engine; these keep the old attribute names working
+    @property
+    def password(self):
+        return self.engine.password
+
+    @password.setter
+    def password(self, value):
+        self.engine.password = value
+
+    @property
+    def attempts(self):
+        return self.engine.attempts
+
+    @attempts.setter
+    def attempts(self, value):
+        self.engine.attempts = value
+
+    @property
+    def max_attempts(self):
+        return self.engine.max_attempts
+
+    @max_attempts.setter
+    def max_attempts(self, value):
+        self.engine.max_attempts = value
+
+    @property
+    def lockout_time(self):
+        return self.engine.lockout_time
+
+    @lockout_time.setter
+    def lockout_time(self, value):
+        self.engine.lockout_time = value
+
+    @property
+    def is_locked(self):
+        return self.engine.is_locked
+
+    @is_locked.setter
+    def is_locked(self, value):
+        self.engine.is_locked = value
+        if not value:
+            self.engine.lockout_deadline = None
+
+    @property
+    def current_input(self):
+        return self.engine.current_input
+
+    @current_input.setter
+    def current_input(self, value):
+        self.engine.current_input = value
     
     def center_window(self):
         """Center the window on screen"""
@@ -145,14 +330,28 @@ class DigitalLockSystem:
         self.notebook.add(self.settings_frame, text='🎛️ Settings')
         self.notebook.add(self.help_frame, text='❓ Help & FAQ')
         
+        # Only the lock screen is built at startup; other tabs on first visit
+        self.tab_builders = {
+            1: self.create_admin_interface,
+            2: self.create_architecture_interface,
+            3: self.create_settings_interface,
+            4: self.create_help_interface,
+        }
         self.create_lock_interface()
-        self.create_admin_interface()
-        self.create_architecture_interface()
-        self.create_settings_interface()
-        self.create_help_interface()
         
         # Bind tab change event
         self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_change)
+        
+        # Pause animations while minimized
+        self.root.bind('<Unmap>', self.on_window_visibility, add='+')
+        self.root.bind('<Map>', self.on_window_visibility, add='+')
+        self.update_animation_visibility()
+    
+    def ensure_tab(self, index):
+        """Build a tab's widgets the first time they are needed"""
+        builder = self.tab_builders.pop(index, None)
+        if builder is not None:
+            builder()
     
     def create_glass_frame(self):
         """Create a glass morphism effect frame"""
@@ -210,8 +409,19 @@ class DigitalLockSystem:
         # Hidden input for keyboard - FIXED: Better keyboard input handling
         self.setup_keyboard_input()
         
-        # Start cursor animation
-        self.animate_cursor()
+        # Lock screen labels are only reconfigured when their text or colour changes
+        self.create_lock_views()
+        
+        # Start cursor animation (blinks every 500 ms)
+        self.animator.keyframes([(0.5, self.animate_cursor)], repeat=True, group='cursor')
+    
+    def create_lock_views(self):
+        """Views of the lock screen labels that remember what they last showed"""
+        self.lock_view = ViewModel()
+        self.status_view = self.lock_view.add(self.status_label)
+        self.password_view = self.lock_view.add(self.password_display)
+        self.attempts_view = self.lock_view.add(self.attempts_label)
+        self.security_view = self.lock_view.add(self.security_label)
     
     def create_security_indicators(self):
         """Create security status indicators"""
@@ -340,7 +550,7 @@ class DigitalLockSystem:
     
     def animate_cursor(self):
         """Animate cursor in password display"""
-        current_text = self.password_display.cget('text')
+        current_text = self.password_view.cget('text')
         if "|" in current_text:
             new_text = current_text.replace("|", "•")
         else:
@@ -350,8 +560,7 @@ class DigitalLockSystem:
                 display_chars[len(self.current_input)] = "|"
             new_text = " ".join(display_chars)
         
-        self.password_display.config(text=new_text)
-        self.root.after(500, self.animate_cursor)
+        self.password_view.config(text=new_text)
     
     def create_admin_interface(self):
         # Admin panel with modern design
@@ -460,22 +669,12 @@ class DigitalLockSystem:
                                 labelanchor='n')
         log_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
-        # Log display
-        log_text_frame = tk.Frame(log_frame, bg='black')
-        log_text_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        self.log_text = tk.Text(log_text_frame, 
-                              font=('Courier', 9),
-                              fg='#00ff00', bg='black',
-                              width=60, height=8,
-                              wrap='word')
-        
-        scrollbar = tk.Scrollbar(log_text_frame, orient='vertical', 
-                               command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=scrollbar.set)
-        
-        self.log_text.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        # Log display - only the visible lines are ever loaded
+        self.log_view = VirtualLogView(log_frame, self.log_file,
+                                       font=('Courier', 9),
+                                       fg='#00ff00', bg='black',
+                                       width=60, height=8)
+        self.log_view.pack(fill='both', expand=True, padx=10, pady=10)
         
         # Load initial logs
         self.load_access_logs()
@@ -501,6 +700,58 @@ class DigitalLockSystem:
                  bg='#4caf50', fg='white',
                  command=self.export_logs,
                  width=12).pack(side='left', padx=5)
+        
+        self.export_format_var = tk.StringVar(value="TXT")
+        ttk.Combobox(log_controls, textvariable=self.export_format_var,
+                     values=["TXT", "CSV", "JSONL"],
+                     width=6, state='readonly').pack(side='left', padx=5)
+        
+        # Jump to time
+        self.jump_time_var = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))
+        tk.Button(log_controls, text="Go", 
+                 font=('Arial', 10),
+                 bg='#9c27b0', fg='white',
+                 command=self.jump_to_log_time,
+                 width=4).pack(side='right', padx=5)
+        tk.Entry(log_controls, textvariable=self.jump_time_var,
+                font=('Arial', 10), width=19).pack(side='right', padx=5)
+        tk.Label(log_controls, text="Jump to:", 
+                font=('Arial', 10), fg='white', 
+                bg='#1e2a3e').pack(side='right')
+        
+        # Indexed search (needs the SQLite log store)
+        log_filters = tk.Frame(log_frame, bg='#1e2a3e')
+        log_filters.pack(fill='x', padx=10, pady=5)
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        self.filter_from_var = tk.StringVar(value=today)
+        self.filter_to_var = tk.StringVar(value="")
+        self.filter_type_var = tk.StringVar(value="ALL")
+        
+        for label_text, var, width in (("From:", self.filter_from_var, 19),
+                                       ("To:", self.filter_to_var, 19)):
+            tk.Label(log_filters, text=label_text, 
+                    font=('Arial', 10), fg='white', 
+                    bg='#1e2a3e').pack(side='left')
+            tk.Entry(log_filters, textvariable=var,
+                    font=('Arial', 10), width=width).pack(side='left', padx=5)
+        
+        ttk.Combobox(log_filters, textvariable=self.filter_type_var,
+                     values=["ALL", "SUCCESS", "FAILED", "LOCKED", "EMERGENCY",
+                             "SECURITY", "SYSTEM", "PASSWORD_CHANGE", "NAVIGATION"],
+                     width=12, state='readonly').pack(side='left', padx=5)
+        
+        tk.Button(log_filters, text="Search", 
+                 font=('Arial', 10),
+                 bg='#2196f3', fg='white',
+                 command=self.search_logs,
+                 width=8).pack(side='left', padx=5)
+        
+        tk.Button(log_filters, text="Import", 
+                 font=('Arial', 10),
+                 bg='#607d8b', fg='white',
+                 command=self.import_logs_to_store,
+                 width=8).pack(side='left', padx=5)
     
     def create_system_info_section(self):
         """System information section"""
@@ -634,17 +885,18 @@ Sound Feedback: {'ENABLED' if self.audio_feedback else 'DISABLED'}
         self.current_point += 1
     
     def animate_packet_move(self, canvas, packet, x1, y1, x2, y2, points):
-        """Move packet along path"""
-        steps = 20
-        for i in range(steps + 1):
-            x = x1 + (x2 - x1) * i / steps
-            y = y1 + (y2 - y1) * i / steps
+        """Move packet along path without blocking the event loop"""
+        def move(progress):
+            x = x1 + (x2 - x1) * progress
+            y = y1 + (y2 - y1) * progress
             canvas.coords(packet, x-5, y-5, x+5, y+5)
-            self.root.update()
-            time.sleep(0.05)
         
-        canvas.delete(packet)
-        self.root.after(100, lambda: self.animate_packet(canvas, points))
+        def finish():
+            canvas.delete(packet)
+            self.animator.delay(0.1, lambda: self.animate_packet(canvas, points),
+                                group='data_flow')
+        
+        self.animator.tween(1.0, move, on_done=finish, group='data_flow')
     
     def create_settings_interface(self):
         """Create system settings interface"""
@@ -729,6 +981,72 @@ Sound Feedback: {'ENABLED' if self.audio_feedback else 'DISABLED'}
                                  command=self.toggle_haptic_feedback)
         haptic_cb.pack(anchor='w', padx=10, pady=5)
         
+        # Logging settings
+        logging_frame = tk.LabelFrame(self.settings_frame, 
+                                    text=" Logging ",
+                                    font=('Arial', 12, 'bold'),
+                                    fg='white', 
+                                    bg='#1e2a3e',
+                                    labelanchor='n')
+        logging_frame.pack(fill='x', padx=20, pady=10)
+        
+        self.log_store_var = tk.BooleanVar(value=self.log_store_enabled)
+        store_cb = tk.Checkbutton(logging_frame, 
+                                text="Index access log in SQLite (enables log search)",
+                                variable=self.log_store_var,
+                                font=('Arial', 11),
+                                fg='white', 
+                                bg='#1e2a3e',
+                                selectcolor='#1e2a3e',
+                                command=self.toggle_log_store)
+        store_cb.pack(anchor='w', padx=10, pady=5)
+        
+        # Diagnostics
+        diagnostics_frame = tk.LabelFrame(self.settings_frame, 
+                                        text=" Diagnostics ",
+                                        font=('Arial', 12, 'bold'),
+                                        fg='white', 
+                                        bg='#1e2a3e',
+                                        labelanchor='n')
+        diagnostics_frame.pack(fill='x', padx=20, pady=10)
+        
+        self.profile_var = tk.BooleanVar(value=self.profiler.enabled)
+        profile_cb = tk.Checkbutton(diagnostics_frame, 
+                                  text="Record handler latency",
+                                  variable=self.profile_var,
+                                  font=('Arial', 11),
+                                  fg='white', 
+                                  bg='#1e2a3e',
+                                  selectcolor='#1e2a3e',
+                                  command=self.toggle_profiling)
+        profile_cb.pack(anchor='w', padx=10, pady=5)
+        
+        diag_buttons = tk.Frame(diagnostics_frame, bg='#1e2a3e')
+        diag_buttons.pack(fill='x', padx=10, pady=5)
+        for text, command in (("Latency Report", self.show_latency_report),
+                              ("cProfile 10s", self.capture_cprofile),
+                              ("Sample Stacks 10s", self.capture_stack_samples)):
+            tk.Button(diag_buttons, text=text, 
+                     font=('Arial', 9, 'bold'),
+                     bg='#607d8b', fg='white',
+                     command=command,
+                     relief='flat').pack(side='left', padx=5)
+        
+        self.profile_status = tk.Label(diagnostics_frame, 
+                                     text="", 
+                                     font=('Arial', 9),
+                                     fg='#64b5f6', 
+                                     bg='#1e2a3e')
+        self.profile_status.pack(anchor='w', padx=10)
+        
+        metrics_text = (f"Metrics: http://127.0.0.1:{self.metrics_server.port}/metrics"
+                        if self.metrics_server else "Metrics endpoint off")
+        tk.Label(diagnostics_frame, 
+                text=metrics_text, 
+                font=('Arial', 9),
+                fg='#b0bec5', 
+                bg='#1e2a3e').pack(anchor='w', padx=10, pady=(0, 5))
+        
         # System actions
         action_frame = tk.LabelFrame(self.settings_frame, 
                                    text=" System Actions ",
@@ -912,47 +1230,86 @@ COMMON ISSUES & SOLUTIONS:
     
     def button_click(self, value):
         """Handle button clicks with enhanced feedback - FIXED: Better keyboard integration"""
-        if self.is_locked:
-            self.play_sound('error')
+        if self.engine.press(value) == REJECTED:
             return
-            
-        self.play_sound('click')
-        
-        if value == '⌫':
-            self.current_input = self.current_input[:-1]
-        elif value == '↩':
-            self.check_password()
-        elif value.isdigit() and len(self.current_input) < 4:
-            self.current_input += value
-            # Visual feedback for button press
-            if value in self.keypad_buttons:
-                self.animate_button_press(self.keypad_buttons[value])
         
         self.update_display()
         
         # Ensure hidden entry maintains focus for keyboard input
         self.hidden_entry.focus_set()
     
+    def on_lock_event(self, event, detail):
+        """React to state transitions reported by the lock engine"""
+        if event == REJECTED:
+            self.play_sound('error')
+        elif event == INPUT:
+            self.play_sound('click')
+            # Visual feedback for button press
+            if detail in self.keypad_buttons:
+                self.animate_button_press(self.keypad_buttons[detail])
+        elif event in (DELETE, CLEAR):
+            self.play_sound('click')
+        elif event == INVALID:
+            self.show_message("❌ Password must be exactly 4 digits!", "error")
+            self.log_access("FAILED", "Invalid length")
+        elif event == SUCCESS:
+            self.show_message("✅ ACCESS GRANTED! Door Unlocked!", "success")
+            self.log_access("SUCCESS", "Correct password")
+            self.security_view.config(text="🛡️ Security: ACTIVE", fg='#4caf50')
+            self.play_sound('success')
+            
+            # Enhanced success animation
+            self.animate_success()
+            
+            # Reset after delay
+            self.timers.call_later(3.0, self.reset_after_success)
+        elif event == FAILED:
+            self.log_access("FAILED", f"Wrong password: {detail}")
+            self.show_message(f"❌ Access Denied! {self.engine.remaining_attempts()} attempts remaining.", "error")
+            self.play_sound('error')
+            self.update_display()
+        elif event == LOCKED:
+            self.log_access("FAILED", f"Wrong password: {detail}")
+            self.show_message("🚨 SYSTEM LOCKED! Too many failed attempts!", "error")
+            self.log_access("LOCKED", f"Too many attempts: {self.attempts}")
+            self.security_view.config(text="🚨 Security: LOCKED", fg='#f44336')
+            self.play_sound('lock')
+            self.update_display()
+            
+            # Start lockout timer
+            self.start_lockout_timer()
+        elif event == UNLOCKED:
+            self.cancel_lockout_timer()
+            self.show_message("🔓 System Ready - Enter 4-digit Password", "ready")
+            self.security_view.config(text="🛡️ Security: ACTIVE", fg='#4caf50')
+        elif event == EMERGENCY:
+            self.show_message("🚨 EMERGENCY LOCK ACTIVATED!", "error")
+            self.security_view.config(text="🚨 Security: EMERGENCY LOCK", fg='#f44336')
+            self.log_access("EMERGENCY", "Emergency lock activated by user")
+            self.play_sound('lock')
+        elif event == RESET:
+            self.cancel_lockout_timer()
+        elif event == THROTTLED:
+            self.show_message(f"⏳ Too many attempts - try again in {int(detail + 0.999)}s", "warning")
+            self.log_access("THROTTLED", f"Rate limit reached, retry in {int(detail + 0.999)}s")
+            self.play_sound('error')
+            self.update_display()
+    
     def animate_button_press(self, button):
         """Animate button press for better feedback"""
         original_bg = button.cget('bg')
         button.config(bg='white', fg=original_bg)
-        self.root.after(150, lambda: button.config(bg=original_bg, fg='white'))
+        self.animator.delay(0.15, lambda: button.config(bg=original_bg, fg='white'))
     
     def handle_keypress(self, event):
         """Handle keyboard input with enhanced features - FIXED: Better key handling"""
-        if self.is_locked:
-            self.play_sound('error')
-            return
-            
         key = event.char
         keysym = event.keysym
         
         # Handle number keys
-        if key.isdigit() and len(self.current_input) < 4:
-            self.current_input += key
-            self.play_sound('click')
-            self.update_display()
+        if key.isdigit():
+            if self.engine.press(key) != REJECTED:
+                self.update_display()
         
         # Handle special keys
         elif keysym in ['Return', 'KP_Enter']:
@@ -977,98 +1334,90 @@ COMMON ISSUES & SOLUTIONS:
                 display_chars.append("•")
         
         display_text = " ".join(display_chars)
-        self.password_display.config(text=display_text)
+        self.password_view.config(text=display_text)
         
         # Update attempts counter
-        self.attempts_label.config(
+        self.attempts_view.config(
             text=f"🔐 Attempts: {self.attempts % self.max_attempts}/{self.max_attempts}"
         )
     
     def clear_input(self):
         """Clear current input"""
-        self.current_input = ""
+        self.engine.clear()
         self.update_display()
         self.hidden_entry.focus_set()
-        self.play_sound('click')
     
     def check_password(self):
         """Enhanced password checking with comprehensive logging"""
-        if len(self.current_input) != 4:
-            self.show_message("❌ Password must be exactly 4 digits!", "error")
-            self.log_access("FAILED", "Invalid length")
-            return
-        
-        if self.current_input == self.password:
-            self.show_message("✅ ACCESS GRANTED! Door Unlocked!", "success")
-            self.log_access("SUCCESS", "Correct password")
-            self.attempts = 0
-            self.is_locked = False
-            self.security_label.config(text="🛡️ Security: ACTIVE", fg='#4caf50')
-            self.play_sound('success')
-            
-            # Enhanced success animation
-            self.animate_success()
-            
-            # Reset after delay
-            self.root.after(3000, self.reset_after_success)
-        else:
-            self.attempts += 1
-            remaining = self.max_attempts - (self.attempts % self.max_attempts)
-            
-            self.log_access("FAILED", f"Wrong password: {self.current_input}")
-            
-            if self.attempts % self.max_attempts == 0:
-                self.show_message("🚨 SYSTEM LOCKED! Too many failed attempts!", "error")
-                self.log_access("LOCKED", f"Too many attempts: {self.attempts}")
-                self.is_locked = True
-                self.security_label.config(text="🚨 Security: LOCKED", fg='#f44336')
-                self.play_sound('lock')
-                
-                # Start lockout timer
-                self.start_lockout_timer()
-            else:
-                self.show_message(f"❌ Access Denied! {remaining} attempts remaining.", "error")
-                self.play_sound('error')
-            
-            self.current_input = ""
-            self.update_display()
-        
+        self.engine.check_password()
         self.hidden_entry.focus_set()
     
     def animate_success(self):
         """Animate success feedback"""
-        original_bg = self.password_display.cget('bg')
-        original_fg = self.password_display.cget('fg')
+        self.animator.cancel_group('success')
+        original_bg = '#0a0f18'
+        original_fg = 'white'
+        
+        flash_on = lambda: self.password_view.config(bg='#4caf50', fg='white')
+        flash_off = lambda: self.password_view.config(bg=original_bg, fg=original_fg)
         
-        # Flash green
+        # Flash green three times without freezing keypad input
+        frames = []
         for i in range(3):
-            self.password_display.config(bg='#4caf50', fg='white')
-            self.root.update()
-            time.sleep(0.2)
-            self.password_display.config(bg=original_bg, fg=original_fg)
-            self.root.update()
-            time.sleep(0.2)
+            frames.append((i * 0.4, flash_on))
+            frames.append((i * 0.4 + 0.2, flash_off))
+        self.animator.keyframes(frames, duration=1.2, group='success')
     
     def start_lockout_timer(self):
-        """Start countdown timer for lockout"""
+        """Schedule the lockout expiry at its deadline and a 1 s countdown display"""
         if not self.is_locked:
             return
-            
-        remaining = self.lockout_time
-        self.lockout_timer(remaining)
+        
+        self.cancel_lockout_timer()
+        if self.engine.lockout_deadline is not None:
+            self.lockout_expiry = self.timers.call_at(self.engine.lockout_deadline,
+                                                      self.lockout_timer)
+        self.lockout_countdown = self.timers.call_every(1.0, self.update_lockout_countdown)
+        self.update_lockout_countdown()
+    
+    def resume_lockout(self):
+        """Show and time a lockout that was still running when the app stopped"""
+        self.log_access("LOCKED", f"Lockout restored after restart: {self.attempts} attempts "
+                                  f"({self.journal.replayed} journal events replayed in "
+                                  f"{self.journal.recovery_ms:.1f} ms)")
+        self.update_display()
+        if self.engine.lockout_deadline is None:
+            self.metrics.lock_restored()
+            self.show_message("🚨 EMERGENCY LOCK ACTIVATED!", "error")
+            self.security_view.config(text="🚨 Security: EMERGENCY LOCK", fg='#f44336')
+            return
+        self.metrics.lock_restored(self.lockout_time - self.engine.lockout_remaining())
+        self.show_message("🚨 SYSTEM LOCKED! Lockout resumed after restart", "error")
+        self.security_view.config(text="🚨 Security: LOCKED", fg='#f44336')
+        self.start_lockout_timer()
+    
+    def cancel_lockout_timer(self):
+        self.timers.cancel(self.lockout_expiry)
+        self.timers.cancel(self.lockout_countdown)
+        self.lockout_expiry = self.lockout_countdown = None
+    
+    def lockout_timer(self):
+        """Lockout deadline reached - let the engine unlock"""
+        self.lockout_expiry = None
+        if self.engine.tick() is None and not self.is_locked:
+            # Unlocked behind the engine's back (e.g. factory reset)
+            self.cancel_lockout_timer()
     
-    def lockout_timer(self, seconds):
+    def update_lockout_countdown(self):
         """Update lockout timer display"""
-        if seconds > 0 and self.is_locked:
-            mins, secs = divmod(seconds, 60)
-            timer_text = f"⏰ Lockout: {mins:02d}:{secs:02d}"
-            self.status_label.config(text=timer_text, fg='#ff9800')
-            self.root.after(1000, lambda: self.lockout_timer(seconds - 1))
-        elif self.is_locked:
-            self.is_locked = False
-            self.attempts = 0
-            self.show_message("🔓 System Ready - Enter 4-digit Password", "ready")
-            self.security_label.config(text="🛡️ Security: ACTIVE", fg='#4caf50')
+        remaining = self.engine.lockout_remaining()
+        if not self.is_locked or not remaining:
+            self.timers.cancel(self.lockout_countdown)
+            self.lockout_countdown = None
+            return
+        mins, secs = divmod(int(remaining + 0.999), 60)
+        timer_text = f"⏰ Lockout: {mins:02d}:{secs:02d}"
+        self.status_view.config(text=timer_text, fg='#ff9800')
     
     def reset_after_success(self):
         """Reset system after successful access"""
@@ -1085,7 +1434,7 @@ COMMON ISSUES & SOLUTIONS:
             "warning": "#ff9800"
         }
         
-        self.status_label.config(
+        self.status_view.config(
             text=message, 
             fg=colors.get(msg_type, "#64b5f6")
         )
@@ -1100,58 +1449,206 @@ COMMON ISSUES & SOLUTIONS:
         log_entry = f"[{timestamp}] {event_type}: {details}\n"
         
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
+            self.log_writer.write(log_entry)
         except Exception as e:
             print(f"Logging error: {e}")
+        self.metrics.log_entries.inc(event_type)
         
-        # Update admin log display if on admin tab
-        if hasattr(self, 'log_text'):
-            self.load_access_logs()
+        # Update admin log display once the writer has had a chance to flush
+        if (hasattr(self, 'log_view') and not self.log_refresh_pending
+                and self.current_tab == 1 and self.window_visible):
+            self.log_refresh_pending = True
+            self.timers.call_later(self.log_writer.flush_interval, self.refresh_access_logs)
+    
+    def refresh_access_logs(self):
+        """Index and show only the log lines written since the last refresh"""
+        self.log_refresh_pending = False
+        try:
+            self.log_writer.flush()
+            self.log_view.refresh()
+        except Exception as e:
+            self.log_view.show_message(f"Error loading logs: {e}")
     
     def load_access_logs(self):
-        """Load and display access logs"""
+        """Re-index the access log and show its most recent entries"""
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    logs = f.read()
-                
-                self.log_text.config(state='normal')
-                self.log_text.delete('1.0', tk.END)
-                self.log_text.insert('1.0', logs)
-                self.log_text.config(state='disabled')
-                self.log_text.see(tk.END)
+            self.log_writer.flush()
+            self.log_view.reload()
+        except Exception as e:
+            self.log_view.show_message(f"Error loading logs: {e}")
+    
+    def jump_to_log_time(self):
+        """Scroll the log view to the first entry at or after the given time"""
+        timestamp = self.jump_time_var.get().strip()
+        try:
+            datetime.strptime(timestamp[:10], '%Y-%m-%d')
+        except ValueError:
+            self.admin_message.config(text="❌ Use YYYY-MM-DD [HH:MM:SS]", fg="#f44336")
+            return
+        self.log_view.jump_to_time(timestamp)
+    
+    def enable_log_store(self):
+        """Mirror new log entries into the indexed SQLite store"""
+        if self.log_store is None:
+            try:
+                self.log_store = LogStore(self.log_store_file, self.door_id)
+            except Exception as e:
+                print(f"Log store error: {e}")
+                return False
+            self.log_writer.sinks.append(self.log_store.append_lines)
+        return True
+    
+    def disable_log_store(self):
+        """Stop mirroring log entries into the SQLite store"""
+        if self.log_store is not None:
+            self.log_writer.sinks.remove(self.log_store.append_lines)
+            self.log_store = None
+    
+    def toggle_log_store(self):
+        """Toggle the SQLite log store from settings"""
+        if hasattr(self, 'log_store_var') and self.log_store_var is not None:
+            self.log_store_enabled = self.log_store_var.get()
+            if self.log_store_enabled:
+                self.enable_log_store()
             else:
-                self.log_text.config(state='normal')
-                self.log_text.delete('1.0', tk.END)
-                self.log_text.insert('1.0', "No access logs found.")
-                self.log_text.config(state='disabled')
+                self.disable_log_store()
+            self.save_settings()
+    
+    def parse_filter_time(self, text):
+        """Filter entry text as naive epoch seconds (None when empty)"""
+        text = text.strip()
+        if not text:
+            return None
+        datetime.strptime(text, '%Y-%m-%d %H:%M:%S' if len(text) > 10 else '%Y-%m-%d')
+        return to_epoch(text)
+    
+    def search_logs(self):
+        """Query the log store with the admin filter controls"""
+        if self.log_store is None:
+            self.admin_message.config(text="❌ Enable the SQLite log store in Settings first", fg="#f44336")
+            return
+        try:
+            start = self.parse_filter_time(self.filter_from_var.get())
+            end = self.parse_filter_time(self.filter_to_var.get())
+        except ValueError:
+            self.admin_message.config(text="❌ Use YYYY-MM-DD [HH:MM:SS]", fg="#f44336")
+            return
+        event_type = self.filter_type_var.get()
+        event_types = None if event_type == "ALL" else [event_type]
+        
+        self.log_writer.flush()
+        started = time.perf_counter()
+        rows = self.log_store.query(start, end, event_types, limit=500)
+        elapsed = (time.perf_counter() - started) * 1000
+        
+        lines = [f"[{from_epoch(ts)}] {event}: {details}" for ts, event, door, details in rows]
+        self.show_search_results("\n".join(lines) or "No matching events.")
+        self.admin_message.config(text=f"🔎 {len(rows)} events shown ({elapsed:.1f} ms)", fg="#2196f3")
+    
+    def show_search_results(self, text):
+        """Display log search results in a separate window"""
+        self.show_text_window("Access Log Search", text)
+    
+    def show_text_window(self, title, text):
+        """Read-only text in a separate window"""
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.configure(bg='#1e2a3e')
+        results = tk.Text(window, font=('Courier', 9),
+                          fg='#00ff00', bg='black',
+                          width=90, height=25, wrap='none')
+        scrollbar = tk.Scrollbar(window, orient='vertical', command=results.yview)
+        results.configure(yscrollcommand=scrollbar.set)
+        results.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        results.insert('1.0', text)
+        results.config(state='disabled')
+    
+    def import_logs_to_store(self):
+        """Import the existing text log into the SQLite store"""
+        if self.log_store is None:
+            self.admin_message.config(text="❌ Enable the SQLite log store in Settings first", fg="#f44336")
+            return
+        if not messagebox.askyesno("Import Logs", 
+                                   "Import all entries of the text log into the log store?\n"
+                                   "Entries already imported will be added again."):
+            return
+        try:
+            self.log_writer.flush()
+            added = self.log_store.import_text_log(self.log_file)
+            self.admin_message.config(text=f"✅ Imported {added} log entries", fg="#4caf50")
         except Exception as e:
-            self.log_text.config(state='normal')
-            self.log_text.delete('1.0', tk.END)
-            self.log_text.insert('1.0', f"Error loading logs: {e}")
-            self.log_text.config(state='disabled')
+            self.admin_message.config(text=f"❌ Import failed: {e}", fg="#f44336")
     
     def clear_logs(self):
         """Clear access logs with confirmation"""
         if messagebox.askyesno("Confirm", "Clear all access logs?"):
             try:
+                self.log_writer.flush()
                 open(self.log_file, 'w').close()
+                log_archive.remove_archives(self.log_file)
                 self.load_access_logs()
                 self.admin_message.config(text="✅ Logs cleared successfully!", fg="#4caf50")
             except Exception as e:
                 self.admin_message.config(text=f"❌ Error clearing logs: {e}", fg="#f44336")
     
     def export_logs(self):
-        """Export logs to file"""
+        """Export logs in the background; CSV/JSONL honour the search filters"""
+        if self.export_thread is not None and self.export_thread.is_alive():
+            self.admin_message.config(text="⏳ An export is already running", fg="#ff9800")
+            return
+        
+        fmt = self.export_format_var.get().lower()
+        start = end = event_types = None
+        if fmt != 'txt':
+            try:
+                start = self.filter_from_var.get().strip() or None
+                end = self.filter_to_var.get().strip() or None
+                for value in (start, end):
+                    if value is not None:
+                        log_export.normalize_time(value)
+            except ValueError:
+                self.admin_message.config(text="❌ Use YYYY-MM-DD [HH:MM:SS]", fg="#f44336")
+                return
+            event_type = self.filter_type_var.get()
+            event_types = None if event_type == "ALL" else [event_type]
+        
+        self.log_writer.flush()
+        export_file = f"access_log_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+        self.export_result = None
+        self.export_thread = threading.Thread(target=self.run_export,
+                                              args=(export_file, fmt, start, end, event_types),
+                                              daemon=True)
+        self.export_thread.start()
+        self.admin_message.config(text=f"⏳ Exporting to {export_file}...", fg="#2196f3")
+        self.timers.call_later(0.2, self.check_export)
+    
+    def run_export(self, export_file, fmt, start, end, event_types):
+        """Export worker thread - never touches Tk widgets"""
         try:
-            export_file = f"access_log_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-            with open(self.log_file, 'r', encoding='utf-8') as source:
-                with open(export_file, 'w', encoding='utf-8') as target:
-                    target.write(source.read())
-            self.admin_message.config(text=f"✅ Logs exported to {export_file}", fg="#4caf50")
+            if fmt == 'txt':
+                # Streams fixed-size chunks, so memory stays flat for any history size
+                started = time.perf_counter()
+                written = log_archive.export(self.log_file, export_file)
+                elapsed = max(time.perf_counter() - started, 1e-9)
+                summary = f"{written / (1024 * 1024) / elapsed:.1f} MB/s"
+            else:
+                stats = log_export.export_structured(self.log_file, export_file, fmt,
+                                                     start, end, event_types,
+                                                     cancel=self.export_cancel)
+                summary = f"{stats.records} records, {stats.mb_per_second:.1f} MB/s"
+            self.export_result = (True, f"✅ Logs exported to {export_file} ({summary})")
         except Exception as e:
-            self.admin_message.config(text=f"❌ Export failed: {e}", fg="#f44336")
+            self.export_result = (False, f"❌ Export failed: {e}")
+    
+    def check_export(self):
+        """Poll the export thread and report when it finishes"""
+        if self.export_thread is not None and self.export_thread.is_alive():
+            self.timers.call_later(0.2, self.check_export)
+            return
+        if self.export_result is not None:
+            ok, message = self.export_result
+            self.admin_message.config(text=message, fg="#4caf50" if ok else "#f44336")
     
     def change_password(self):
         """Enhanced password change with validation"""
@@ -1241,16 +1738,12 @@ COMMON ISSUES & SOLUTIONS:
     def toggle_visibility(self):
         """Toggle password visibility in lock interface"""
         # This would toggle between showing • and actual digits
+        self.ensure_tab(1)
         self.admin_message.config(text="👁️ Visibility toggle - Feature in development", fg="#9c27b0")
     
     def emergency_lock(self):
         """Immediately lock the system"""
-        self.is_locked = True
-        self.attempts = self.max_attempts
-        self.show_message("🚨 EMERGENCY LOCK ACTIVATED!", "error")
-        self.security_label.config(text="🚨 Security: EMERGENCY LOCK", fg='#f44336')
-        self.log_access("EMERGENCY", "Emergency lock activated by user")
-        self.play_sound('lock')
+        self.engine.emergency_lock()
     
     def toggle_sound(self):
         """Toggle sound feedback"""
@@ -1292,16 +1785,15 @@ COMMON ISSUES & SOLUTIONS:
     def reset_system(self):
         """Reset system to default state"""
         if messagebox.askyesno("Confirm Reset", "Reset system to default state?"):
-            self.attempts = 0
-            self.is_locked = False
-            self.current_input = ""
+            self.engine.reset()
             self.update_display()
             self.show_message("🔓 System Ready - Enter 4-digit Password", "ready")
-            self.security_label.config(text="🛡️ Security: ACTIVE", fg='#4caf50')
+            self.security_view.config(text="🛡️ Security: ACTIVE", fg='#4caf50')
             self.log_access("SYSTEM", "System reset to default state")
     
     def backup_settings(self):
         """Backup system settings"""
+        self.ensure_tab(1)
         try:
             backup_data = {
                 'password': self.password,
@@ -1320,6 +1812,7 @@ COMMON ISSUES & SOLUTIONS:
     
     def restore_settings(self):
         """Restore system settings from backup"""
+        self.ensure_tab(1)
         try:
             if os.path.exists('system_backup.json'):
                 with open('system_backup.json', 'r') as f:
@@ -1355,6 +1848,7 @@ COMMON ISSUES & SOLUTIONS:
                              icon='warning'):
             if messagebox.askyesno("Confirm Again", 
                                  "This cannot be undone! Continue?"):
+                self.ensure_tab(1)
                 try:
                     # Reset to defaults
                     self.password = "1234"
@@ -1362,9 +1856,7 @@ COMMON ISSUES & SOLUTIONS:
                     self.lockout_time = 30
                     self.audio_feedback = True
                     self.haptic_feedback = True
-                    self.attempts = 0
-                    self.is_locked = False
-                    self.current_input = ""
+                    self.engine.reset()  # journaled, unlike setting the attributes
                     
                     # Update UI
                     self.current_pass_label.config(text='•' * len(self.password))
@@ -1380,7 +1872,9 @@ COMMON ISSUES & SOLUTIONS:
                     self.show_message("🔓 System Ready - Enter 4-digit Password", "ready")
                     
                     # Clear logs
+                    self.log_writer.flush()
                     open(self.log_file, 'w').close()
+                    log_archive.remove_archives(self.log_file)
                     self.load_access_logs()
                     
                     self.admin_message.config(text="✅ Factory reset complete!", fg="#4caf50")
@@ -1392,58 +1886,308 @@ COMMON ISSUES & SOLUTIONS:
     def load_settings(self):
         """Load system settings from file"""
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
-                
+            settings = self.settings_store.load()
+            if settings is not None:
                 self.password = settings.get('password', self.password)
                 self.max_attempts = settings.get('max_attempts', self.max_attempts)
                 self.lockout_time = settings.get('lockout_time', self.lockout_time)
                 self.audio_feedback = settings.get('audio_feedback', self.audio_feedback)
                 self.haptic_feedback = settings.get('haptic_feedback', self.haptic_feedback)
+                self.door_id = settings.get('door_id', self.door_id)
+                self.log_store_enabled = settings.get('log_store', self.log_store_enabled)
+                self.log_max_bytes = settings.get('log_max_bytes', self.log_max_bytes)
+                self.log_rotate_daily = settings.get('log_rotate_daily', self.log_rotate_daily)
+                self.log_backup_count = settings.get('log_backup_count', self.log_backup_count)
+                tiers = settings.get('rate_limit_tiers', self.rate_limit_tiers)
+                try:
+                    # A bad tier list must not keep the lock from starting
+                    validate_settings({'rate_limit_tiers': tiers})
+                    self.rate_limit_tiers = tiers
+                except ValueError as e:
+                    print(f"Settings load error: {e} - using the default rate limits")
+                self.config_dir = settings.get('config_dir', self.config_dir)
+                self.metrics_port = settings.get('metrics_port', self.metrics_port)
         except Exception as e:
             print(f"Settings load error: {e}")
     
+    def current_settings(self):
+        """Settings as they are saved to file"""
+        return {
+            'password': self.password,
+            'max_attempts': self.max_attempts,
+            'lockout_time': self.lockout_time,
+            'audio_feedback': self.audio_feedback,
+            'haptic_feedback': self.haptic_feedback,
+            'door_id': self.door_id,
+            'log_store': self.log_store_enabled,
+            'log_max_bytes': self.log_max_bytes,
+            'log_rotate_daily': self.log_rotate_daily,
+            'log_backup_count': self.log_backup_count,
+            'rate_limit_tiers': self.rate_limit_tiers,
+            'config_dir': self.config_dir,
+            'metrics_port': self.metrics_port
+        }
+    
     def save_settings(self):
         """Save system settings to file"""
         try:
-            settings = {
-                'password': self.password,
-                'max_attempts': self.max_attempts,
-                'lockout_time': self.lockout_time,
-                'audio_feedback': self.audio_feedback,
-                'haptic_feedback': self.haptic_feedback
-            }
-            
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f)
+            self.settings_store.save(self.current_settings())
         except Exception as e:
             print(f"Settings save error: {e}")
     
-    def security_monitor(self):
-        """Continuous security monitoring"""
-        # Check for security issues
-        if self.attempts >= self.max_attempts * 2:  # Multiple lockouts
-            self.log_access("SECURITY", f"Multiple lockouts detected: {self.attempts}")
+    def on_settings_changed(self, path, settings):
+        """Apply an edited settings or fleet file live, keeping the lock state
+
+        Only keys that differ from what the file held before count as edits,
+        so our own saves coming back (possibly older than the live values)
+        change nothing.
+        """
+        settings = dict(settings)
+        settings.update(settings.pop('doors', {}).get(self.door_id, {}))
+        if os.path.dirname(path) and os.path.abspath(path) != os.path.abspath(self.settings_file):
+            # Fleet directory: fleet.json, overridden by this door's own file
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name not in ('fleet', self.door_id):
+                return
+            self.fleet_files['fleet' if name == 'fleet' else 'door'] = settings
+            settings = dict(self.fleet_files.get('fleet', {}))
+            settings.update(self.fleet_files.get('door', {}))
+            previous, self.fleet_applied = self.fleet_applied, settings
+        else:
+            previous = self.settings_store.on_disk or {}
+            # The file now holds these; the next edit is compared with them
+            self.settings_store.on_disk = settings
+        current = self.current_settings()
+        changed = {key: value for key, value in settings.items()
+                   if key in current and current[key] != value and previous.get(key) != value}
+        if not changed:
+            return
         
-        # Schedule next check
-        self.root.after(10000, self.security_monitor)  # Check every 10 seconds
+        apply_to_engine(self.engine, changed)
+        self.audio_feedback = changed.get('audio_feedback', self.audio_feedback)
+        self.haptic_feedback = changed.get('haptic_feedback', self.haptic_feedback)
+        if 'door_id' in changed:
+            self.door_id = changed['door_id']
+            self.engine.source = f"keypad:{self.door_id}"
+        if 'log_store' in changed:
+            self.log_store_enabled = changed['log_store']
+            if self.log_store_enabled:
+                self.enable_log_store()
+            else:
+                self.disable_log_store()
+        self.log_max_bytes = self.log_writer.max_bytes = changed.get('log_max_bytes', self.log_max_bytes)
+        self.log_rotate_daily = self.log_writer.rotate_daily = changed.get('log_rotate_daily',
+                                                                           self.log_rotate_daily)
+        self.log_backup_count = self.log_writer.backup_count = changed.get('log_backup_count',
+                                                                           self.log_backup_count)
+        if 'rate_limit_tiers' in changed:
+            self.rate_limit_tiers = changed['rate_limit_tiers']
+            self.rate_limiter.set_tiers(self.rate_limit_tiers)  # unchanged windows keep their counts
+        if 'metrics_port' in changed:
+            self.metrics_port = changed['metrics_port']
+            self.start_metrics_server()
+        
+        # Reflect the new values in widgets that exist (tabs are built lazily)
+        for var, value in ((self.attempts_var, self.max_attempts), (self.lockout_var, self.lockout_time),
+                           (self.audio_var, self.audio_feedback), (self.haptic_var, self.haptic_feedback),
+                           (self.log_store_var, self.log_store_enabled)):
+            if var is not None:
+                var.set(value)
+        if hasattr(self, 'current_pass_label'):
+            self.current_pass_label.config(text='•' * len(self.password))
+        self.update_display()
+        self.log_access("CONFIG", f"Reloaded {', '.join(sorted(changed))} from {os.path.basename(path)}")
+        if 'config_dir' in changed:
+            self.watch_config_dir(changed['config_dir'])
+    
+    def watch_config_dir(self, config_dir):
+        """Follow a different fleet directory, applying the files already there"""
+        if self.config_dir:
+            self.config_watcher.unwatch(self.config_dir, self.on_settings_changed)
+        self.config_dir = config_dir
+        self.fleet_files = {}
+        self.fleet_applied = {}
+        if config_dir:
+            self.config_watcher.watch_directory(config_dir, self.on_settings_changed, initial=True)
+    
+    def toggle_profiling(self):
+        """Start or stop recording handler latency from settings"""
+        if self.profile_var is not None:
+            self.profiler.enabled = self.profile_var.get()
+            if self.profiler.enabled:
+                self.profiler.reset()
+            self.profile_status.config(text="Recording handler latency" if self.profiler.enabled else "")
+    
+    def show_latency_report(self):
+        """Show the per-handler latency histograms"""
+        self.show_text_window("Handler Latency", self.profiler.report())
+    
+    def capture_cprofile(self, seconds=10):
+        """Profile the Tk thread for a while and save the result"""
+        if self.profile_capture is not None:
+            return
+        path = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof"
+        self.profile_capture = CProfileCapture()
+        self.profile_capture.start()
+        self.profile_status.config(text=f"⏳ cProfile running for {seconds}s...")
+        self.timers.call_later(seconds, lambda: self.finish_capture(path))
+    
+    def capture_stack_samples(self, seconds=10):
+        """Sample the Tk thread's stack for a while and save folded stacks"""
+        if self.profile_capture is not None:
+            return
+        path = f"stacks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.folded"
+        self.profile_capture = StackSampler()
+        self.profile_capture.start()
+        self.profile_status.config(text=f"⏳ Sampling stacks for {seconds}s...")
+        self.timers.call_later(seconds, lambda: self.finish_capture(path))
+    
+    def finish_capture(self, path):
+        capture, self.profile_capture = self.profile_capture, None
+        try:
+            summary = capture.stop(path)
+        except Exception as e:
+            self.profile_status.config(text=f"❌ Capture failed: {e}")
+            return
+        self.profile_status.config(text=f"✅ Saved {path}")
+        self.show_text_window(path, summary)
+    
+    def on_security_alert(self, kind, door, message):
+        """Record an anomaly reported by the detector"""
+        self.metrics.alerts.inc(kind)
+        self.log_access("SECURITY", f"{kind} ({door or 'all doors'}): {message}")
+        if not self.is_locked:
+            self.security_view.config(text="⚠️ Security: ALERT", fg='#ff9800')
     
     def on_tab_change(self, event):
         """Handle tab change events"""
         current_tab = self.notebook.index(self.notebook.select())
+        self.current_tab = current_tab
+        self.ensure_tab(current_tab)
+        self.update_animation_visibility()
         tab_names = ['Lock', 'Admin', 'Architecture', 'Settings', 'Help']
         self.log_access("NAVIGATION", f"Switched to {tab_names[current_tab]} tab")
         
         # Refresh data when switching to admin tab
         if current_tab == 1:  # Admin tab
-            self.load_access_logs()
+            self.refresh_access_logs()
+    
+    def on_window_visibility(self, event):
+        """Track minimize/restore of the main window"""
+        if event.widget is not self.root:
+            return
+        self.window_visible = event.type == tk.EventType.Map
+        self.update_animation_visibility()
+        if self.window_visible and self.current_tab == 1:
+            self.refresh_access_logs()
+    
+    def update_animation_visibility(self):
+        """Pause the animations of hidden tabs and resume the visible one"""
+        for tab, groups in self.tab_animation_groups.items():
+            visible = (not self.throttle_hidden_animations
+                       or (self.window_visible and tab == self.current_tab))
+            for group in groups:
+                if visible:
+                    self.animator.resume_group(group)
+                else:
+                    self.animator.pause_group(group)
+    
+    def enable_startup_timing(self, timer, auto=False):
+        """Report time to first frame and to the first accepted keypress
+
+        With auto set, a digit is pressed as soon as the first frame is drawn
+        and the app exits after reporting, so startup can be timed unattended.
+        """
+        self.startup_timer = timer
+        self.startup_auto = auto
+        self.first_frame_binding = self.root.bind('<Expose>', self.on_first_frame, add='+')
+        self.engine.subscribe(self.on_first_keypress)
+    
+    def on_first_frame(self, event):
+        """First Expose after startup - the window is on screen"""
+        self.startup_timer.mark("first frame")
+        self.root.unbind('<Expose>', self.first_frame_binding)
+        if self.startup_auto:
+            self.root.after_idle(lambda: self.button_click('1'))
+    
+    def on_first_keypress(self, event, detail):
+        """First key the lock engine handled
+
+        A lockout restored at startup refuses every key, so a rejected key
+        counts too - otherwise an unattended run would never finish.
+        """
+        if event not in (INPUT, REJECTED):
+            return
+        self.startup_timer.mark("first keypress" if event == INPUT else "first keypress (rejected, locked)")
+        self.root.after_idle(lambda: self.engine.unsubscribe(self.on_first_keypress))
+        print(self.startup_timer.report())
+        if self.startup_auto:
+            self.root.after_idle(self.on_close)
+    
+    def register_metric_gauges(self):
+        """Gauges read from the lock state when scraped rather than kept up to date"""
+        register = self.metrics.registry.register
+        # Read from the engine, so lockouts restored from the journal show too
+        self.metrics.locked.fn = lambda: int(self.engine.is_locked)
+        register(Gauge("lock_failed_attempts", "Failed attempts since the last unlock",
+                       fn=lambda: self.engine.attempts))
+        register(Gauge("lock_lockout_remaining_seconds", "Seconds until a timed lockout ends",
+                       fn=lambda: self.engine.lockout_remaining() or 0))
+        register(Gauge("lock_rate_limited_sources", "Sources tracked by the rate limiter",
+                       fn=lambda: len(self.rate_limiter)))
+        register(Gauge("lock_log_queue_entries", "Log entries waiting for the writer thread",
+                       fn=lambda: self.log_writer.queue.qsize()))
+    
+    def start_metrics_server(self):
+        """(Re)bind the metrics endpoint to --metrics-port or metrics_port, or stop it when unset"""
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        port = self.metrics_port_arg or self.metrics_port
+        if not port:
+            return
+        server = MetricsServer(self.metrics.registry, port=port)
+        try:
+            server.start()
+        except OSError as e:
+            print(f"Metrics server error: {e}")
+            return
+        self.metrics_server = server
+    
+    def on_close(self):
+        """Drain pending log entries before the window goes away"""
+        self.close_core()
+        self.root.destroy()
+    
+    def close_core(self):
+        """Stop what init_core (and the metrics server) started, writing out pending data"""
+        self.export_cancel.set()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        self.settings_store.close()
+        self.journal.close()
+        self.log_writer.close()
 
 def main():
     """Main application entry point"""
+    timer = None
+    if '--startup-timing' in sys.argv or '--startup-timing-auto' in sys.argv:
+        timer = StartupTimer(STARTUP_STARTED)
+        timer.mark("imports", IMPORTS_DONE)
+    metrics_port = None
+    if '--metrics-port' in sys.argv:
+        # Serve Prometheus metrics on localhost:PORT for this run
+        value = sys.argv[sys.argv.index('--metrics-port') + 1:][:1]
+        if not value or not value[0].isdigit() or not 1 <= int(value[0]) <= 65535:
+            print("usage: --metrics-port PORT (a TCP port number, 1-65535)", file=sys.stderr)
+            sys.exit(2)
+        metrics_port = int(value[0])
     try:
         root = tk.Tk()
-        app = DigitalLockSystem(root)
+        app = DigitalLockSystem(root, metrics_port=metrics_port)
+        if timer is not None:
+            timer.mark("interface built")
+            app.enable_startup_timing(timer, auto='--startup-timing-auto' in sys.argv)
         
         # Set application icon (if available)
         try:
@@ -1454,6 +2198,7 @@ def main():
         # Bind global shortcuts
         root.bind('<F1>', lambda e: app.notebook.select(4))  # F1 for help
         root.bind('<Escape>', lambda e: app.clear_input())   # ESC to clear
+        root.protocol("WM_DELETE_WINDOW", app.on_close)
         
         root.mainloop()
     except Exception as e:
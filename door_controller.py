@@ -0,0 +1,225 @@
+import heapq
+import time
+from array import array
+
+from lock_engine import (INPUT, DELETE, CLEAR, SUCCESS, FAILED, INVALID, LOCKED,
+                         UNLOCKED, EMERGENCY, REJECTED, RESET, PIN_LENGTH,
+                         ENTER_KEY, DELETE_KEY)
+
+# Lock flags per door
+OPEN = 0
+TIMED_LOCK = 1
+EMERGENCY_LOCK = 2
+
+
+class DoorController:
+    """Many lock state machines packed into flat arrays
+
+    Each door costs a handful of array slots plus its entry in the id index,
+    instead of a Tk root with widgets and after() loops. The rules are the
+    same as LockEngine; events are routed by door id and reported to
+    subscribers as callback(door_id, event, detail).
+    """
+
+    __slots__ = ('max_attempts', 'lockout_time', 'clock', 'subscribers',
+                 'index', 'door_ids', 'passwords', 'attempts', 'flags',
+                 'deadlines', 'inputs', 'input_lengths', 'expiry_heap')
+
+    def __init__(self, max_attempts=3, lockout_time=30, clock=time.monotonic):
+        self.max_attempts = max_attempts
+        self.lockout_time = lockout_time
+        self.clock = clock
+        self.subscribers = []
+        self.index = {}                  # door id -> slot
+        self.door_ids = []               # slot -> door id
+        self.passwords = array('H')      # 4-digit codes stored as integers
+        self.attempts = array('H')
+        self.flags = bytearray()
+        self.deadlines = array('d')
+        self.inputs = array('H')         # digits entered so far, as an integer
+        self.input_lengths = bytearray()
+        self.expiry_heap = []            # (deadline, slot) for timed lockouts
+
+    def __len__(self):
+        return len(self.door_ids)
+
+    def __contains__(self, door_id):
+        return door_id in self.index
+
+    def subscribe(self, callback):
+        """Register callback(door_id, event, detail)"""
+        self.subscribers.append(callback)
+
+    def emit(self, slot, event, detail=None):
+        """Notify subscribers and return the event"""
+        if self.subscribers:
+            door_id = self.door_ids[slot]
+            for callback in self.subscribers:
+                callback(door_id, event, detail)
+        return event
+
+    def add_door(self, door_id, password="1234"):
+        """Register a door and return its slot"""
+        if door_id in self.index:
+            raise ValueError(f"Door {door_id!r} already exists")
+        if len(password) != PIN_LENGTH or not password.isdigit():
+            raise ValueError("Password must be exactly 4 digits")
+        slot = len(self.door_ids)
+        self.index[door_id] = slot
+        self.door_ids.append(door_id)
+        self.passwords.append(int(password))
+        self.attempts.append(0)
+        self.flags.append(OPEN)
+        self.deadlines.append(0.0)
+        self.inputs.append(0)
+        self.input_lengths.append(0)
+        return slot
+
+    def add_doors(self, door_ids, password="1234"):
+        """Register many doors sharing one password"""
+        for door_id in door_ids:
+            self.add_door(door_id, password)
+
+    def set_password(self, door_id, password):
+        """Change the code of one door"""
+        if len(password) != PIN_LENGTH or not password.isdigit():
+            raise ValueError("Password must be exactly 4 digits")
+        self.passwords[self.index[door_id]] = int(password)
+
+    def _unlock_if_expired(self, slot, now):
+        """Finish a timed lockout whose deadline has passed"""
+        if self.flags[slot] != TIMED_LOCK:
+            return False
+        if now is None:
+            now = self.clock()
+        if now < self.deadlines[slot]:
+            return False
+        self.flags[slot] = OPEN
+        self.attempts[slot] = 0
+        self.emit(slot, UNLOCKED)
+        return True
+
+    def press(self, door_id, key, now=None):
+        """Feed one key to a door"""
+        slot = self.index[door_id]
+        if self.flags[slot] and not self._unlock_if_expired(slot, now):
+            return self.emit(slot, REJECTED, key)
+
+        if key == DELETE_KEY:
+            if self.input_lengths[slot]:
+                self.inputs[slot] //= 10
+                self.input_lengths[slot] -= 1
+            return self.emit(slot, DELETE)
+        if key == ENTER_KEY:
+            return self._check(slot, now)
+        if key.isdigit() and self.input_lengths[slot] < PIN_LENGTH:
+            self.inputs[slot] = self.inputs[slot] * 10 + int(key)
+            self.input_lengths[slot] += 1
+            return self.emit(slot, INPUT, key)
+        return None
+
+    def submit(self, door_id, code, now=None):
+        """Check a complete code in one call, as a remote panel would"""
+        slot = self.index[door_id]
+        if self.flags[slot] and not self._unlock_if_expired(slot, now):
+            return self.emit(slot, REJECTED, code)
+        if len(code) != PIN_LENGTH or not code.isdigit():
+            self.inputs[slot] = 0
+            self.input_lengths[slot] = 0
+            return self.emit(slot, INVALID, code)
+        self.inputs[slot] = int(code)
+        self.input_lengths[slot] = PIN_LENGTH
+        return self._check(slot, now)
+
+    def _check(self, slot, now):
+        """Compare the buffered input of a door with its password"""
+        length = self.input_lengths[slot]
+        entered = self.inputs[slot]
+        if length != PIN_LENGTH:
+            return self.emit(slot, INVALID, self._format_input(entered, length))
+
+        self.inputs[slot] = 0
+        self.input_lengths[slot] = 0
+        if entered == self.passwords[slot]:
+            self.attempts[slot] = 0
+            return self.emit(slot, SUCCESS)
+
+        attempts = self.attempts[slot] + 1
+        self.attempts[slot] = attempts
+        if attempts % self.max_attempts == 0:
+            if now is None:
+                now = self.clock()
+            deadline = now + self.lockout_time
+            self.flags[slot] = TIMED_LOCK
+            self.deadlines[slot] = deadline
+            heapq.heappush(self.expiry_heap, (deadline, slot))
+            return self.emit(slot, LOCKED, self._format_input(entered, length))
+        return self.emit(slot, FAILED, self._format_input(entered, length))
+
+    @staticmethod
+    def _format_input(value, length):
+        """Turn a buffered integer back into the digits typed"""
+        return str(value).zfill(length) if length else ""
+
+    def clear(self, door_id):
+        """Drop the partially entered code of a door"""
+        slot = self.index[door_id]
+        self.inputs[slot] = 0
+        self.input_lengths[slot] = 0
+        return self.emit(slot, CLEAR)
+
+    def emergency_lock(self, door_id):
+        """Lock one door until it is reset"""
+        slot = self.index[door_id]
+        self.flags[slot] = EMERGENCY_LOCK
+        self.attempts[slot] = self.max_attempts
+        return self.emit(slot, EMERGENCY)
+
+    def reset(self, door_id):
+        """Return a door to the initial unlocked state"""
+        slot = self.index[door_id]
+        self.flags[slot] = OPEN
+        self.attempts[slot] = 0
+        self.inputs[slot] = 0
+        self.input_lengths[slot] = 0
+        return self.emit(slot, RESET)
+
+    def tick(self, now=None):
+        """Expire due lockouts across all doors, returning how many ended"""
+        if now is None:
+            now = self.clock()
+        heap = self.expiry_heap
+        expired = 0
+        while heap and heap[0][0] <= now:
+            deadline, slot = heapq.heappop(heap)
+            # Skip stale entries left behind by resets or newer lockouts
+            if self.flags[slot] == TIMED_LOCK and self.deadlines[slot] == deadline:
+                expired += self._unlock_if_expired(slot, now)
+        return expired
+
+    def is_locked(self, door_id):
+        """True while a door rejects input"""
+        return self.flags[self.index[door_id]] != OPEN
+
+    def lockout_remaining(self, door_id, now=None):
+        """Seconds left in the lockout of a door (None if indefinite)"""
+        slot = self.index[door_id]
+        flag = self.flags[slot]
+        if flag == OPEN:
+            return 0
+        if flag == EMERGENCY_LOCK:
+            return None
+        if now is None:
+            now = self.clock()
+        return max(0.0, self.deadlines[slot] - now)
+
+    def state(self, door_id, now=None):
+        """Snapshot of one door as a plain dict"""
+        slot = self.index[door_id]
+        return {
+            'door_id': door_id,
+            'attempts': self.attempts[slot],
+            'is_locked': self.flags[slot] != OPEN,
+            'lockout_remaining': self.lockout_remaining(door_id, now),
+            'input_length': self.input_lengths[slot],
+        }
@@ -0,0 +1,167 @@
+import time
+
+# Events emitted by the engine
+INPUT = "INPUT"
+DELETE = "DELETE"
+CLEAR = "CLEAR"
+SUCCESS = "SUCCESS"
+FAILED = "FAILED"
+INVALID = "INVALID"
+LOCKED = "LOCKED"
+UNLOCKED = "UNLOCKED"
+EMERGENCY = "EMERGENCY"
+REJECTED = "REJECTED"
+RESET = "RESET"
+THROTTLED = "THROTTLED"
+
+PIN_LENGTH = 4
+ENTER_KEY = '↩'
+DELETE_KEY = '⌫'
+
+
+class LockEngine:
+    """Headless finite state machine behind the digital lock
+
+    The engine only knows about key events and clock ticks. Every call that
+    changes state returns the event name (or None) and forwards it to the
+    subscribers as callback(event, detail), so a GUI can stay a thin view.
+
+    With a RateLimiter attached, failed attempts are also counted against
+    source; while it is over a limit, codes are refused (THROTTLED, with the
+    seconds to wait as detail) before they are compared.
+    """
+
+    __slots__ = ('password', 'max_attempts', 'lockout_time', 'attempts',
+                 'is_locked', 'current_input', 'lockout_deadline', 'clock',
+                 'subscribers', 'limiter', 'source')
+
+    def __init__(self, password="1234", max_attempts=3, lockout_time=30,
+                 clock=time.monotonic, limiter=None, source="keypad"):
+        self.password = password
+        self.max_attempts = max_attempts
+        self.lockout_time = lockout_time  # seconds
+        self.attempts = 0
+        self.is_locked = False
+        self.current_input = ""
+        self.lockout_deadline = None  # None while locked means "until reset"
+        self.clock = clock
+        self.subscribers = []
+        self.limiter = limiter
+        self.source = source
+
+    def subscribe(self, callback):
+        """Register callback(event, detail) for every transition"""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Remove a previously registered callback"""
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def emit(self, event, detail=None):
+        """Notify subscribers and return the event"""
+        for callback in self.subscribers:
+            callback(event, detail)
+        return event
+
+    def press(self, key, now=None):
+        """Feed one key: a digit, ENTER_KEY or DELETE_KEY"""
+        if self.is_locked:
+            if self.lockout_deadline is None or self.tick(now) is None:
+                return self.emit(REJECTED, key)
+
+        if key == DELETE_KEY:
+            self.current_input = self.current_input[:-1]
+            return self.emit(DELETE)
+        if key == ENTER_KEY:
+            return self.check_password(now)
+        if key.isdigit() and len(self.current_input) < PIN_LENGTH:
+            self.current_input += key
+            return self.emit(INPUT, key)
+        return None
+
+    def press_sequence(self, keys, now=None):
+        """Feed several keys in order and return the last event"""
+        event = None
+        for key in keys:
+            event = self.press(key, now)
+        return event
+
+    def clear(self):
+        """Drop the partially entered code"""
+        self.current_input = ""
+        return self.emit(CLEAR)
+
+    def check_password(self, now=None):
+        """Compare the entered code against the password"""
+        entered = self.current_input
+        if len(entered) != PIN_LENGTH:
+            return self.emit(INVALID, entered)
+
+        if self.limiter is not None:
+            if now is None:
+                now = self.clock()
+            wait = self.limiter.retry_after(self.source, now)
+            if wait:
+                self.current_input = ""
+                return self.emit(THROTTLED, wait)
+
+        if entered == self.password:
+            self.attempts = 0
+            self.is_locked = False
+            self.lockout_deadline = None
+            return self.emit(SUCCESS)
+
+        self.attempts += 1
+        self.current_input = ""
+        if self.limiter is not None:
+            self.limiter.hit(self.source, now)
+        if self.attempts % self.max_attempts == 0:
+            self.is_locked = True
+            if now is None:
+                now = self.clock()
+            self.lockout_deadline = now + self.lockout_time
+            return self.emit(LOCKED, entered)
+        return self.emit(FAILED, entered)
+
+    def remaining_attempts(self):
+        """Attempts left before the next lockout"""
+        return self.max_attempts - (self.attempts % self.max_attempts)
+
+    def lockout_remaining(self, now=None):
+        """Seconds left in the current lockout (None if indefinite)"""
+        if not self.is_locked:
+            return 0
+        if self.lockout_deadline is None:
+            return None
+        if now is None:
+            now = self.clock()
+        return max(0.0, self.lockout_deadline - now)
+
+    def tick(self, now=None):
+        """Advance the clock, ending an expired lockout"""
+        if not self.is_locked or self.lockout_deadline is None:
+            return None
+        if now is None:
+            now = self.clock()
+        if now < self.lockout_deadline:
+            return None
+        self.is_locked = False
+        self.attempts = 0
+        self.lockout_deadline = None
+        return self.emit(UNLOCKED)
+
+    def emergency_lock(self):
+        """Lock immediately until reset"""
+        self.is_locked = True
+        self.attempts = self.max_attempts
+        self.lockout_deadline = None
+        return self.emit(EMERGENCY)
+
+    def reset(self):
+        """Return to the initial unlocked state"""
+        self.attempts = 0
+        self.is_locked = False
+        self.current_input = ""
+        self.lockout_deadline = None
+        return self.emit(RESET)
@@ -0,0 +1,290 @@
+import json
+import os
+import struct
+import time
+import zlib
+
+from lock_engine import FAILED, LOCKED, SUCCESS, UNLOCKED, EMERGENCY, RESET
+from settings_store import write_atomic
+
+MAGIC = b'LKJ1'
+HEADER = struct.Struct('<4sQ')     # magic, generation
+BODY = struct.Struct('<Bdd')       # event code, wall-clock time, argument
+RECORD = struct.Struct('<BddI')    # BODY followed by its crc32
+
+# Only transitions that change persistent state are journaled; keys and
+# partially entered codes never reach the disk
+CODES = {FAILED: 1, LOCKED: 2, SUCCESS: 3, UNLOCKED: 4, EMERGENCY: 5, RESET: 6}
+FAILED_CODE = CODES[FAILED]
+LOCKED_CODE = CODES[LOCKED]
+EMERGENCY_CODE = CODES[EMERGENCY]
+# Lockout assumed when the history was compacted away and its snapshot lost;
+# restore() caps it at the engine's lockout_time
+LOST_STATE_LOCKOUT = 86400.0
+
+
+class LockState:
+    """Persistent part of a LockEngine, rebuilt by applying journal events
+
+    deadline is wall-clock (time.time) seconds, unlike the engine's
+    monotonic deadline, so it still means something after a restart.
+    """
+
+    __slots__ = ('attempts', 'is_locked', 'deadline', 'events')
+
+    def __init__(self, attempts=0, is_locked=False, deadline=None, events=0):
+        self.attempts = attempts
+        self.is_locked = is_locked
+        self.deadline = deadline
+        self.events = events
+
+    def apply(self, code, wall, arg):
+        self.events += 1
+        if code == FAILED_CODE:
+            self.attempts += 1
+        elif code == LOCKED_CODE:
+            self.attempts += 1
+            self.is_locked = True
+            self.deadline = wall + arg  # arg: lockout seconds
+        elif code == EMERGENCY_CODE:
+            self.attempts = int(arg)
+            self.is_locked = True
+            self.deadline = None
+        else:  # SUCCESS, UNLOCKED, RESET
+            self.attempts = 0
+            self.is_locked = False
+            self.deadline = None
+
+    def as_dict(self):
+        return {'attempts': self.attempts, 'is_locked': self.is_locked,
+                'deadline': self.deadline, 'events': self.events}
+
+    @classmethod
+    def from_dict(cls, data):
+        deadline = data['deadline']
+        return cls(int(data['attempts']), bool(data['is_locked']),
+                   None if deadline is None else float(deadline), int(data['events']))
+
+
+class LockJournal:
+    """Append-only journal of lock state changes, with periodic snapshots
+
+    Every state-changing engine event is appended as a 21-byte record (and
+    fsynced when sync is set), so a lockout survives a crash or power cycle.
+    Every snapshot_every events the state is written atomically to the
+    snapshot file together with the journal offset it covers; recovery loads
+    the snapshot and replays only the records after it. Once the journal
+    passes compact_bytes, a snapshot starts a new, empty journal generation.
+
+    The snapshot also holds the engine's rate limiter counters; wrong codes
+    journaled after it are added back on restore, so a restart does not
+    reset rate limiting either.
+    """
+
+    def __init__(self, path, snapshot_path=None, snapshot_every=10000,
+                 compact_bytes=1 << 20, sync=True, clock=time.time):
+        self.path = path
+        self.snapshot_path = snapshot_path or f"{path}.snapshot"
+        self.snapshot_every = snapshot_every
+        self.compact_bytes = compact_bytes
+        self.sync = sync
+        self.clock = clock  # wall clock: deadlines must outlive the process
+        self.state = LockState()
+        self.generation = 0
+        self.offset = HEADER.size  # end of the valid journal
+        self.journal_valid = False
+        self.since_snapshot = 0
+        self.limiter_state = None  # rate limiter counters from the snapshot
+        self.snapshot_written = None
+        self.tail_hits = []  # wall-clock times of wrong codes after the snapshot
+        self.replayed = 0
+        self.recovery_ms = 0.0
+        self.engine = None
+        self.file = None
+        self._sync_file = getattr(os, 'fdatasync', os.fsync)
+
+    def recover(self):
+        """Rebuild the state from the latest snapshot plus the journal tail"""
+        started = time.perf_counter()
+        snapshot = None
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            state = LockState.from_dict(saved['state'])
+            generation, offset = int(saved['generation']), int(saved['offset'])
+            limiter_state = saved.get('limiter')
+            if limiter_state is not None and not isinstance(limiter_state, dict):
+                raise ValueError("limiter state must be an object")
+            written = float(saved['written'])
+            snapshot = saved
+            self.state, self.generation, self.offset = state, generation, offset
+            self.limiter_state, self.snapshot_written = limiter_state, written
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Lock snapshot error: {e}")
+
+        self.journal_valid = False
+        self.replayed = 0
+        self.tail_hits = []
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(HEADER.size)
+                if len(header) == HEADER.size:
+                    magic, generation = HEADER.unpack(header)
+                    if (magic == MAGIC and (snapshot is None or generation == self.generation)
+                            and os.fstat(f.fileno()).st_size >= self.offset):
+                        # Without a snapshot the whole journal is the history
+                        self.generation = generation
+                        lost = snapshot is None and generation > 0
+                        if lost:
+                            # ...unless it was compacted: the state before it
+                            # is gone, so fail closed instead of unlocking
+                            print(f"Lock snapshot lost for journal generation {generation}, "
+                                  f"starting locked")
+                            self.state = LockState(is_locked=True,
+                                                   deadline=self.clock() + LOST_STATE_LOCKOUT)
+                        f.seek(self.offset)
+                        data = f.read()
+                        used = self._replay(data)
+                        self.offset += used
+                        self.replayed = used // RECORD.size
+                        self.journal_valid = not lost  # open() compacts, writing a snapshot
+        except FileNotFoundError:
+            pass
+        self.recovery_ms = (time.perf_counter() - started) * 1000
+        return self.state
+
+    def _replay(self, data):
+        """Apply the intact records at the start of data; returns the bytes used"""
+        size = RECORD.size
+        view = memoryview(data)
+        end = len(data) - len(data) % size
+        crc32 = zlib.crc32
+        apply = self.state.apply
+        hit = self.tail_hits.append
+        used = 0
+        for code, wall, arg, crc in RECORD.iter_unpack(view[:end]):
+            if crc32(view[used:used + BODY.size]) != crc:
+                break  # torn or damaged write: everything after it is discarded
+            apply(code, wall, arg)
+            if code == FAILED_CODE or code == LOCKED_CODE:
+                hit(wall)
+            used += size
+        return used
+
+    def open(self):
+        """Open the journal for appending, dropping any torn tail"""
+        if not self.journal_valid:
+            self.compact()
+            return
+        os.truncate(self.path, self.offset)
+        self.file = open(self.path, 'ab', buffering=0)
+
+    def restore(self, engine):
+        """Put the recovered state into engine
+
+        A lockout keeps its wall-clock deadline, capped at the engine's
+        lockout_time so a clock set backwards cannot extend it.
+        """
+        state = self.state
+        engine.attempts = state.attempts
+        engine.is_locked = state.is_locked
+        engine.lockout_deadline = None
+        if state.is_locked and state.deadline is not None:
+            remaining = min(max(0.0, state.deadline - self.clock()), engine.lockout_time)
+            engine.lockout_deadline = engine.clock() + remaining
+        limiter = engine.limiter
+        if limiter is not None:
+            wall = self.clock()
+            try:
+                if self.limiter_state:
+                    limiter.load_state(self.limiter_state, wall - self.snapshot_written)
+            except (ValueError, TypeError) as e:
+                print(f"Lock snapshot error: rate limiter state: {e}")
+            if self.tail_hits:
+                limiter.add_recent(engine.source, [wall - hit for hit in self.tail_hits])
+        self.tail_hits = []
+        return state.is_locked
+
+    def attach(self, engine):
+        """Recover, restore engine and journal its transitions from now on
+
+        Returns True when a lockout was restored.
+        """
+        self.recover()
+        locked = self.restore(engine)
+        self.engine = engine  # before open(): a compaction snapshots the limiter too
+        self.open()
+        engine.subscribe(self.record)
+        return locked
+
+    def record(self, event, detail=None):
+        """Engine subscriber: journal event if it changes persistent state"""
+        code = CODES.get(event)
+        if code is None:
+            return
+        if code == LOCKED_CODE:
+            arg = self.engine.lockout_time
+        elif code == EMERGENCY_CODE:
+            arg = self.engine.attempts
+        else:
+            arg = 0.0
+        try:
+            self.append(code, self.clock(), arg)
+        except OSError as e:
+            print(f"Lock journal error: {e}")
+
+    def append(self, code, wall, arg):
+        body = BODY.pack(code, wall, arg)
+        self.file.write(RECORD.pack(code, wall, arg, zlib.crc32(body)))
+        if self.sync:
+            self._sync_file(self.file.fileno())
+        self.offset += RECORD.size
+        self.state.apply(code, wall, arg)
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Write the state and the journal offset it covers"""
+        if self.offset >= self.compact_bytes:
+            self.compact()
+            return
+        if not self.sync:
+            self._sync_file(self.file.fileno())  # the snapshot must not point past the disk
+        self._write_snapshot()
+
+    def compact(self):
+        """Snapshot the state and start an empty journal of the next generation
+
+        The snapshot names the new generation before the journal is
+        replaced, so a crash in between leaves an old-generation journal
+        that recovery ignores rather than replays twice.
+        """
+        if self.file is not None:
+            self.file.close()
+        self.generation += 1
+        self.offset = HEADER.size
+        self._write_snapshot()
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.generation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.journal_valid = True
+        self.file = open(self.path, 'ab', buffering=0)
+
+    def _write_snapshot(self):
+        snapshot = {'generation': self.generation, 'offset': self.offset,
+                    'written': self.clock(), 'state': self.state.as_dict()}
+        if self.engine is not None and self.engine.limiter is not None:
+            snapshot['limiter'] = self.engine.limiter.dump_state()
+        write_atomic(self.snapshot_path, snapshot)
+        self.since_snapshot = 0
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,89 @@
+import glob
+import gzip
+import os
+import shutil
+from datetime import datetime
+
+CHUNK_SIZE = 1 << 20
+
+
+def archive_pattern(path):
+    return f"{path}.*.gz"
+
+
+def list_archives(path):
+    """Compressed archives of a log, oldest first"""
+    # Names embed YYYYmmdd-HHMMSS-micro, so lexical order is chronological
+    return sorted(glob.glob(archive_pattern(glob.escape(path))))
+
+
+def archive_name(path, when=None):
+    """Archive file name for a log rotated at when"""
+    when = when or datetime.now()
+    return f"{path}.{when.strftime('%Y%m%d-%H%M%S-%f')}.gz"
+
+
+def compress(source, target, chunk_size=CHUNK_SIZE):
+    """gzip source into target in fixed-size chunks, then remove source"""
+    with open(source, 'rb') as src, gzip.open(target + ".tmp", 'wb') as dst:
+        shutil.copyfileobj(src, dst, chunk_size)
+    os.replace(target + ".tmp", target)
+    os.remove(source)
+
+
+def rotate(path, backup_count=None, when=None):
+    """Move the live log aside, compress it and apply retention"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    target = archive_name(path, when)
+    pending = target[:-3]  # same name without .gz while compressing
+    os.replace(path, pending)
+    compress(pending, target)
+    if backup_count is not None:
+        prune(path, backup_count)
+    return target
+
+
+def prune(path, keep):
+    """Delete all but the newest keep archives"""
+    archives = list_archives(path)
+    for old in archives[:max(0, len(archives) - keep)]:
+        try:
+            os.remove(old)
+        except OSError as e:
+            print(f"Log retention error: {e}")
+
+
+def remove_archives(path):
+    """Delete every archive of a log"""
+    for archive in list_archives(path):
+        os.remove(archive)
+
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE, include_archives=True):
+    """Yield the whole log history as bytes chunks, oldest first"""
+    sources = list_archives(path) if include_archives else []
+    for archive in sources:
+        with gzip.open(archive, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+
+def export(path, target, chunk_size=CHUNK_SIZE):
+    """Copy archives plus the live log into target using constant memory"""
+    written = 0
+    with open(target, 'wb') as out:
+        for chunk in iter_chunks(path, chunk_size):
+            out.write(chunk)
+            written += len(chunk)
+    return written
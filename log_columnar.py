@@ -0,0 +1,337 @@
+import argparse
+import gzip
+import json
+import os
+import time
+from array import array
+
+from log_store import to_epoch, from_epoch
+
+try:
+    import numpy as np  # optional dependency, see README.md
+except ImportError:
+    np = None
+
+# Column files inside an archive directory: name -> (array typecode, numpy dtype)
+COLUMNS = {
+    'ts': ('q', 'int64'),      # naive epoch seconds, see log_store.to_epoch
+    'type': ('B', 'uint8'),    # index into meta['types']
+    'door': ('I', 'uint32'),   # index into meta['doors']
+}
+META_FILE = "meta.json"
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Columnar log analytics need NumPy: pip install numpy")
+
+
+class ColumnarWriter:
+    """Append parsed log events to flat binary column files
+
+    Columns are written with the standard array module, so building an
+    archive needs no NumPy and only holds one batch in memory.
+    """
+
+    def __init__(self, directory, batch_size=1 << 20):
+        self.directory = directory
+        self.batch_size = batch_size
+        os.makedirs(directory, exist_ok=True)
+        self.meta = self._load_meta()
+        self._trim_columns()
+        self.type_codes = {name: i for i, name in enumerate(self.meta['types'])}
+        self.door_codes = {name: i for i, name in enumerate(self.meta['doors'])}
+        self.batch = {name: array(code) for name, (code, _) in COLUMNS.items()}
+        self.day_cache = {}
+
+    def _load_meta(self):
+        path = os.path.join(self.directory, META_FILE)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+        return {'count': 0, 'types': [], 'doors': [], 'sorted': True, 'last_ts': None}
+
+    def _trim_columns(self):
+        """Cut each column back to meta['count'] rows
+
+        flush() appends the columns before it replaces meta.json, so a crash
+        in between leaves rows the metadata does not count; appending after
+        them would misalign the columns.
+        """
+        count = self.meta['count']
+        for name, (code, _) in COLUMNS.items():
+            path = os.path.join(self.directory, f"{name}.bin")
+            size = count * array(code).itemsize
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def _code(self, codes, names, value, limit):
+        code = codes.get(value)
+        if code is None:
+            if len(names) >= limit:
+                raise ValueError(f"Too many distinct values for column: {value!r}")
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def add(self, epoch, event_type, door):
+        """Queue one event"""
+        meta = self.meta
+        last = meta['last_ts']
+        if last is not None and epoch < last:
+            meta['sorted'] = False
+        meta['last_ts'] = epoch
+        batch = self.batch
+        batch['ts'].append(epoch)
+        batch['type'].append(self._code(self.type_codes, meta['types'], event_type, 256))
+        batch['door'].append(self._code(self.door_codes, meta['doors'], door, 1 << 32))
+        if len(batch['ts']) >= self.batch_size:
+            self.flush()
+
+    def add_log_file(self, path, door="main"):
+        """Parse a text log (or a .gz archive of one); returns events added"""
+        opener = gzip.open if path.endswith('.gz') else open
+        day_cache = self.day_cache
+        added = 0
+        with opener(path, 'rb') as f:
+            for raw in f:
+                if raw[:1] != b'[' or raw[20:22] != b'] ':
+                    continue
+                event_type, sep, _ = raw[22:].partition(b': ')
+                if not sep:
+                    continue
+                day = raw[1:11]
+                base = day_cache.get(day)
+                try:
+                    if base is None:
+                        base = day_cache[day] = to_epoch(day.decode('ascii'))
+                    epoch = (base + int(raw[12:14]) * 3600 + int(raw[15:17]) * 60
+                             + int(raw[18:20]))
+                except ValueError:
+                    continue
+                self.add(epoch, event_type.decode('utf-8', 'replace'), door)
+                added += 1
+        return added
+
+    def flush(self):
+        """Append the queued batch to the column files and update the metadata"""
+        count = len(self.batch['ts'])
+        if count:
+            for name, column in self.batch.items():
+                with open(os.path.join(self.directory, f"{name}.bin"), 'ab') as f:
+                    column.tofile(f)
+                del column[:]
+            self.meta['count'] += count
+        tmp = os.path.join(self.directory, META_FILE + ".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, os.path.join(self.directory, META_FILE))
+
+
+class ColumnarLog:
+    """Memory-mapped event columns with vectorized aggregations"""
+
+    def __init__(self, directory):
+        require_numpy()
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), 'r') as f:
+            self.meta = json.load(f)
+        self.types = self.meta['types']
+        self.doors = self.meta['doors']
+        count = self.meta['count']
+        self.columns = {}
+        for name, (_, dtype) in COLUMNS.items():
+            if count:
+                self.columns[name] = np.memmap(os.path.join(directory, f"{name}.bin"),
+                                               dtype=dtype, mode='r', shape=(count,))
+            else:
+                self.columns[name] = np.zeros(0, dtype=dtype)
+        self.ts = self.columns['ts']
+        self.type = self.columns['type']
+        self.door = self.columns['door']
+
+    def __len__(self):
+        return len(self.ts)
+
+    def type_code(self, event_type):
+        return self.types.index(event_type) if event_type in self.types else -1
+
+    def _range(self, start, end):
+        """Slice bounds for [start, end) - binary search when timestamps are sorted"""
+        if self.meta['sorted']:
+            lo = 0 if start is None else int(np.searchsorted(self.ts, start, 'left'))
+            hi = len(self.ts) if end is None else int(np.searchsorted(self.ts, end, 'left'))
+            return slice(lo, hi), None
+        mask = np.ones(len(self.ts), dtype=bool)
+        if start is not None:
+            mask &= self.ts >= start
+        if end is not None:
+            mask &= self.ts < end
+        return slice(None), mask
+
+    def select(self, start=None, end=None, event_type=None, door=None):
+        """(ts, type, door) arrays for the events matching the filters"""
+        window, mask = self._range(start, end)
+        ts, types, doors = self.ts[window], self.type[window], self.door[window]
+        if event_type is not None:
+            type_mask = types == self.type_code(event_type)
+            mask = type_mask if mask is None else mask & type_mask
+        if door is not None:
+            door_code = self.doors.index(door) if door in self.doors else -1
+            door_mask = doors == door_code
+            mask = door_mask if mask is None else mask & door_mask
+        if mask is not None:
+            ts, types, doors = ts[mask], types[mask], doors[mask]
+        return ts, types, doors
+
+    def hourly_histogram(self, event_type=None, start=None, end=None, door=None):
+        """(hour_start_epochs, counts) for every hour between the first and last match"""
+        ts, _, _ = self.select(start, end, event_type, door)
+        if not len(ts):
+            return np.zeros(0, dtype='int64'), np.zeros(0, dtype='int64')
+        hours = ts // 3600
+        first = int(hours.min())
+        counts = np.bincount(hours - first)
+        return (np.arange(len(counts), dtype='int64') + first) * 3600, counts
+
+    def counts_by_type(self, start=None, end=None, door=None):
+        """{event_type: count}"""
+        _, types, _ = self.select(start, end, None, door)
+        counts = np.bincount(types, minlength=len(self.types))
+        return {name: int(counts[i]) for i, name in enumerate(self.types)}
+
+    def counts_by_door(self, event_type=None, start=None, end=None):
+        """Array of event counts indexed by door code"""
+        _, _, doors = self.select(start, end, event_type)
+        return np.bincount(doors, minlength=len(self.doors))
+
+    def door_hour_matrix(self, event_type=None, start=None, end=None):
+        """(hour_start_epochs, counts[hour, door]) in a single bincount"""
+        ts, _, doors = self.select(start, end, event_type)
+        if not len(ts):
+            return np.zeros(0, dtype='int64'), np.zeros((0, len(self.doors)), dtype='int64')
+        hours = ts // 3600
+        first = int(hours.min())
+        span = int(hours.max()) - first + 1
+        flat = np.bincount((hours - first) * len(self.doors) + doors,
+                           minlength=span * len(self.doors))
+        return ((np.arange(span, dtype='int64') + first) * 3600,
+                flat.reshape(span, len(self.doors)))
+
+    def type_door_matrix(self, start=None, end=None):
+        """counts[type, door] for every event type and door in one pass"""
+        _, types, doors = self.select(start, end)
+        n_doors = max(1, len(self.doors))
+        flat = np.bincount(types.astype('int64') * n_doors + doors,
+                           minlength=len(self.types) * n_doors)
+        return flat.reshape(len(self.types), n_doors)
+
+    def top_offenders(self, count=10, event_type='FAILED', start=None, end=None):
+        """[(door, events)] for the doors with the most events of event_type"""
+        code = self.type_code(event_type)
+        if code < 0:
+            return []
+        counts = self.type_door_matrix(start, end)[code]
+        order = np.argsort(counts)[::-1][:count]
+        return [(self.doors[i], int(counts[i])) for i in order if counts[i]]
+
+    def lockout_rate(self, start=None, end=None):
+        """{door: LOCKED events per FAILED attempt}"""
+        matrix = self.type_door_matrix(start, end)
+        empty = np.zeros(matrix.shape[1], dtype=matrix.dtype)
+        locked = matrix[self.type_code('LOCKED')] if 'LOCKED' in self.types else empty
+        failed = matrix[self.type_code('FAILED')] if 'FAILED' in self.types else empty
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = np.where(failed > 0, locked / np.maximum(failed, 1), 0.0)
+        return {door: float(rates[i]) for i, door in enumerate(self.doors)}
+
+
+def synthesize(directory, count, doors=100, seed=1):
+    """Write a synthetic archive of count events for benchmarking"""
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    types = ['SUCCESS', 'FAILED', 'LOCKED', 'EMERGENCY', 'SYSTEM']
+    start = to_epoch('2026-01-01 00:00:00')
+    chunk = 10_000_000
+    written = 0
+    with open(os.path.join(directory, "ts.bin"), 'wb') as ts_file, \
+            open(os.path.join(directory, "type.bin"), 'wb') as type_file, \
+            open(os.path.join(directory, "door.bin"), 'wb') as door_file:
+        while written < count:
+            n = min(chunk, count - written)
+            # About 2 events per second, in order
+            (start + (np.arange(written, written + n, dtype='int64') // 2)).tofile(ts_file)
+            rng.choice(len(types), n, p=[0.5, 0.35, 0.1, 0.01, 0.04]).astype('uint8').tofile(type_file)
+            rng.integers(0, doors, n, dtype='uint32').tofile(door_file)
+            written += n
+    meta = {'count': count, 'types': types, 'doors': [f"door-{i}" for i in range(doors)],
+            'sorted': True, 'last_ts': int(start + (count - 1) // 2)}
+    with open(os.path.join(directory, META_FILE), 'w') as f:
+        json.dump(meta, f)
+
+
+def timed(label, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"{label:<28} {time.perf_counter() - started:8.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar access log archive and analytics")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="append text logs to a columnar archive")
+    build.add_argument('logs', nargs='+', help="access_log.txt files or .gz archives")
+    build.add_argument('--out', default="access_log.columns")
+    build.add_argument('--door', default="main")
+
+    stats = sub.add_parser('stats', help="summary of an archive")
+    stats.add_argument('archive', nargs='?', default="access_log.columns")
+    stats.add_argument('--start', help="YYYY-MM-DD[ HH:MM:SS]")
+    stats.add_argument('--end', help="YYYY-MM-DD[ HH:MM:SS] (exclusive)")
+
+    bench = sub.add_parser('bench', help="time the aggregations on synthetic data")
+    bench.add_argument('--events', type=int, default=100_000_000)
+    bench.add_argument('--doors', type=int, default=100)
+    bench.add_argument('--dir', default="bench.columns")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        writer = ColumnarWriter(args.out)
+        for path in args.logs:
+            added = timed(f"import {os.path.basename(path)}", writer.add_log_file, path, args.door)
+            print(f"  {added} events")
+        writer.flush()
+        return
+
+    if args.command == 'bench':
+        if not os.path.exists(os.path.join(args.dir, META_FILE)):
+            timed(f"synthesize {args.events:,}", synthesize, args.dir, args.events, args.doors)
+        log = ColumnarLog(args.dir)
+    else:
+        log = ColumnarLog(args.archive)
+
+    start = to_epoch(args.start) if getattr(args, 'start', None) else None
+    end = to_epoch(args.end) if getattr(args, 'end', None) else None
+    print(f"{len(log):,} events, {len(log.doors)} doors")
+    by_type = timed("counts by type", log.counts_by_type, start, end)
+    hours, failed = timed("FAILED per hour", log.hourly_histogram, 'FAILED', start, end)
+    _, matrix = timed("events per hour per door", log.door_hour_matrix, None, start, end)
+    top = timed("top offenders", log.top_offenders, 5, 'FAILED', start, end)
+    rates = timed("lockout rate per door", log.lockout_rate, start, end)
+
+    print(by_type)
+    if len(failed):
+        peak = int(np.argmax(failed))
+        print(f"peak FAILED hour: {from_epoch(int(hours[peak]))} ({int(failed[peak])} events)")
+    print(f"hour x door matrix: {matrix.shape}")
+    print("top offenders:", top)
+    worst = max(rates.items(), key=lambda item: item[1], default=None)
+    if worst:
+        print(f"highest lockout rate: {worst[0]} ({worst[1]:.2%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import csv
+import gzip
+import json
+import os
+import time
+
+import log_archive
+from log_store import to_epoch
+
+FORMATS = ('csv', 'jsonl')
+FIELDS = ('timestamp', 'event_type', 'details')
+
+
+class ExportStats:
+    """Counters filled in while an export streams through"""
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.lines = 0
+        self.records = 0
+        self.seconds = 0.0
+
+    @property
+    def mb_per_second(self):
+        return self.bytes_read / (1024 * 1024) / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.records} of {self.lines} lines exported, "
+                f"{self.bytes_read / (1024 * 1024):.1f} MB in {self.seconds:.2f}s "
+                f"({self.mb_per_second:.1f} MB/s)")
+
+
+def iter_raw_lines(path, stats, include_archives=True):
+    """Yield bytes lines from the archives (oldest first) and the live log"""
+    sources = log_archive.list_archives(path) if include_archives else []
+    if os.path.exists(path):
+        sources.append(path)
+    for source in sources:
+        opener = gzip.open if source.endswith('.gz') else open
+        with opener(source, 'rb') as f:
+            for raw in f:
+                stats.bytes_read += len(raw)
+                yield raw
+
+
+def normalize_time(text):
+    """'YYYY-MM-DD[ HH:MM:SS]' padded to the full log timestamp as bytes"""
+    text = text.strip()
+    if len(text) == 10:
+        text += " 00:00:00"
+    to_epoch(text)  # validates the layout
+    return text.encode('ascii')
+
+
+def iter_records(raw_lines, stats, start=None, end=None, event_types=None, cancel=None):
+    """Parse lines lazily into (timestamp, event_type, details), applying filters
+
+    start/end are 'YYYY-MM-DD[ HH:MM:SS]' strings; end is exclusive. The
+    fixed-width timestamps compare correctly as bytes, so filtered-out lines
+    are rejected before any decoding. Lines that are not log entries are skipped.
+    """
+    start = normalize_time(start) if start else None
+    end = normalize_time(end) if end else None
+    wanted = {t.encode('utf-8') for t in event_types} if event_types else None
+    for raw in raw_lines:
+        stats.lines += 1
+        if cancel is not None and not stats.lines & 0xFFF and cancel.is_set():
+            return
+        if raw[:1] != b'[' or raw[20:22] != b'] ':
+            continue
+        timestamp = raw[1:20]
+        if start is not None and timestamp < start:
+            continue
+        if end is not None and timestamp >= end:
+            continue
+        event_type, sep, details = raw[22:].partition(b': ')
+        if not sep or (wanted is not None and event_type not in wanted):
+            continue
+        stats.records += 1
+        yield (timestamp.decode('ascii', 'replace'), event_type.decode('utf-8', 'replace'),
+               details.rstrip(b'\r\n').decode('utf-8', 'replace'))
+
+
+def write_csv(records, out):
+    writer = csv.writer(out)
+    writer.writerow(FIELDS)
+    writer.writerows(records)
+
+
+def write_jsonl(records, out):
+    dumps = json.dumps
+    for timestamp, event_type, details in records:
+        out.write(dumps({'timestamp': timestamp, 'event_type': event_type,
+                         'details': details}, ensure_ascii=False))
+        out.write("\n")
+
+
+def export_structured(path, target, fmt='csv', start=None, end=None, event_types=None,
+                      include_archives=True, cancel=None):
+    """Stream the log history into a CSV or JSONL file in one pass"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    stats = ExportStats()
+    started = time.perf_counter()
+    raw_lines = iter_raw_lines(path, stats, include_archives)
+    records = iter_records(raw_lines, stats, start, end, event_types, cancel)
+    with open(target, 'w', encoding='utf-8', newline='') as out:
+        if fmt == 'csv':
+            write_csv(records, out)
+        else:
+            write_jsonl(records, out)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the access log as CSV or JSONL")
+    parser.add_argument('log_file', nargs='?', default="access_log.txt")
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--format', choices=FORMATS,
+                        help="default: taken from the output file extension")
+    parser.add_argument('--start', help="YYYY-MM-DD[ HH:MM:SS]")
+    parser.add_argument('--end', help="YYYY-MM-DD[ HH:MM:SS] (exclusive)")
+    parser.add_argument('--type', action='append', dest='types')
+    parser.add_argument('--no-archives', action='store_true', help="only read the live log")
+    args = parser.parse_args()
+
+    fmt = args.format or ('jsonl' if args.output.endswith(('.jsonl', '.json')) else 'csv')
+    stats = export_structured(args.log_file, args.output, fmt, args.start, args.end,
+                              args.types, not args.no_archives)
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+from lock_engine import (LockEngine, ENTER_KEY, SUCCESS, FAILED, INVALID, LOCKED,
+                         EMERGENCY, REJECTED, THROTTLED)
+from log_archive import iter_chunks
+from log_store import to_epoch, from_epoch
+from rate_limiter import RateLimiter, DEFAULT_TIERS, parse_tier
+from settings_store import validate_settings
+
+# Replay step kinds
+ATTEMPT = "ATTEMPT"
+EMERGENCY_LOCK = "EMERGENCY_LOCK"
+RESET_LOCK = "RESET_LOCK"
+# Outcome of a recorded THROTTLED attempt that the replayed limiter let through
+ALLOWED = "ALLOWED"
+
+# Log types that can carry a step; everything else is skipped before parsing
+STEP_TYPES = frozenset(('SUCCESS', 'FAILED', 'LOCKED', 'EMERGENCY', 'THROTTLED', 'SYSTEM'))
+RESET_MESSAGES = ("System reset to default state", "Factory reset performed")
+
+
+class VirtualClock:
+    """Engine clock set to each recorded timestamp in turn"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def iter_lines(path, include_archives=True):
+    """Every line of a log and (optionally) its rotated archives, oldest first"""
+    rest = b""
+    for chunk in iter_chunks(path, include_archives=include_archives):
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            yield line.decode('utf-8', 'replace')
+    if rest:
+        yield rest.decode('utf-8', 'replace')
+
+
+def parse_steps(lines):
+    """Turn access-log lines into (epoch, kind, code, expected, line number) steps
+
+    A wrong code is logged as FAILED and, when it caused a lockout, followed
+    by LOCKED "Too many attempts"; the two lines are one attempt whose
+    expected outcome is LOCKED. The correct password never appears in the
+    log, so SUCCESS attempts carry code None and replay the configured one.
+    """
+    pending = None  # FAILED attempt that a LOCKED line may still upgrade
+    day_epochs = {}  # full to_epoch() per line would dominate the parse
+    for number, line in enumerate(lines, 1):
+        event_type, sep, details = line[22:].partition(': ')
+        if event_type not in STEP_TYPES or line[:1] != '[' or line[20:21] != ']':
+            continue
+        try:
+            day = day_epochs.get(line[1:11])
+            if day is None:
+                day = day_epochs[line[1:11]] = to_epoch(line[1:11])
+            epoch = day + int(line[12:14]) * 3600 + int(line[15:17]) * 60 + int(line[18:20])
+        except ValueError:
+            continue
+        details = details.rstrip('\r')
+        if event_type == 'SYSTEM' and details not in RESET_MESSAGES:
+            continue
+        if event_type == 'LOCKED':
+            if pending is not None and details.startswith("Too many attempts"):
+                pending = (pending[0], ATTEMPT, pending[2], LOCKED, pending[4])
+            continue  # "Lockout restored after restart" changes nothing
+        if pending is not None:
+            yield pending
+            pending = None
+        if event_type == 'FAILED':
+            if details.startswith("Wrong password: "):
+                pending = (epoch, ATTEMPT, details[16:], FAILED, number)
+            else:
+                yield epoch, ATTEMPT, "", INVALID, number
+        elif event_type == 'SUCCESS':
+            yield epoch, ATTEMPT, None, SUCCESS, number
+        elif event_type == 'THROTTLED':
+            yield epoch, ATTEMPT, None, THROTTLED, number
+        elif event_type == 'EMERGENCY':
+            yield epoch, EMERGENCY_LOCK, None, EMERGENCY, number
+        else:
+            yield epoch, RESET_LOCK, None, None, number
+    if pending is not None:
+        yield pending
+
+
+class Replay:
+    """Feeds recorded steps through a LockEngine on a virtual clock
+
+    Each attempt's code is entered in one go (what press() builds up key by
+    key) and checked, so a recorded attempt that the engine would have
+    refused (still locked, throttled) shows up as a divergence.
+    After a divergence the engine and limiter are put into the recorded
+    state, so one mismatch (e.g. a different max_attempts) does not cascade.
+    resolution is the timestamp granularity: an attempt logged less than
+    that before a lockout or rate limit ends may really have been made
+    after it, and one logged as throttled may have been made at the start
+    of its second.
+    """
+
+    def __init__(self, password="1234", max_attempts=3, lockout_time=30,
+                 tiers=DEFAULT_TIERS, resolution=1.0, keep_divergences=1000):
+        self.clock = VirtualClock()
+        limiter = RateLimiter(tiers, max_sources=16, clock=self.clock) if tiers else None
+        self.engine = LockEngine(password, max_attempts, lockout_time, clock=self.clock,
+                                 limiter=limiter, source="keypad:replay")
+        self.resolution = resolution
+        self.keep_divergences = keep_divergences
+        self.steps = 0
+        self.outcomes = {}
+        self.divergences = []
+        self.divergence_count = 0
+
+    def run(self, steps):
+        """Replay steps; returns the number replayed"""
+        engine = self.engine
+        clock = self.clock
+        check_password = engine.check_password
+        retry_after = engine.limiter.retry_after if engine.limiter is not None else None
+        source = engine.source
+        resolution = self.resolution
+        outcomes = self.outcomes
+        password = engine.password
+        count = 0
+        for epoch, kind, code, expected, number in steps:
+            count += 1
+            clock.now = epoch
+            if kind is ATTEMPT:
+                if engine.is_locked and (engine.lockout_deadline is None
+                                         or engine.tick(epoch + resolution) is None):
+                    attempts = engine.attempts
+                    actual = REJECTED  # the keypad would have refused every key
+                elif expected == THROTTLED:
+                    # Logged without its code: only the limiter can be checked
+                    attempts = engine.attempts
+                    actual = THROTTLED if retry_after is not None and retry_after(source, epoch) else ALLOWED
+                else:
+                    attempts = engine.attempts
+                    now = epoch
+                    if (retry_after is not None and retry_after(source, epoch)
+                            and not retry_after(source, epoch + resolution)):
+                        now = epoch + resolution  # made once the limit had passed
+                    engine.current_input = password if code is None else code
+                    actual = check_password(now)
+            elif kind is EMERGENCY_LOCK:
+                attempts = engine.attempts
+                actual = engine.emergency_lock()
+            else:
+                engine.reset()
+                continue
+            outcomes[actual] = outcomes.get(actual, 0) + 1
+            if actual != expected:
+                self.diverged(epoch, number, expected, actual, attempts)
+        self.steps += count
+        return count
+
+    def diverged(self, epoch, number, expected, actual, attempts):
+        """Count a divergence and put the engine and limiter into the recorded state
+
+        attempts is the engine's attempt count before the step.
+        """
+        self.divergence_count += 1
+        if len(self.divergences) < self.keep_divergences:
+            self.divergences.append((number, epoch, expected, actual))
+        engine = self.engine
+        limiter = engine.limiter
+        if limiter is not None:
+            # Wrong codes are what the limiter counts
+            recorded_hit = expected in (FAILED, LOCKED)
+            replayed_hit = actual in (FAILED, LOCKED)
+            if recorded_hit and not replayed_hit:
+                limiter.hit(engine.source, epoch)
+            elif replayed_hit and not recorded_hit:
+                limiter.undo_hit(engine.source)
+        if expected in (FAILED, LOCKED):
+            engine.attempts = attempts + 1
+        elif expected == SUCCESS:
+            engine.attempts = 0
+        elif expected == EMERGENCY:
+            engine.attempts = engine.max_attempts
+        else:  # INVALID and THROTTLED leave the count alone
+            engine.attempts = attempts
+        if expected in (LOCKED, EMERGENCY):
+            engine.is_locked = True
+            engine.lockout_deadline = epoch + engine.lockout_time if expected == LOCKED else None
+        else:
+            engine.is_locked = False
+            engine.lockout_deadline = None
+
+
+def synthesize(path, count, password="1234", seed=1):
+    """Write an access log of count attempts in the app's format, for benchmarking"""
+    rng = random.Random(seed)
+    clock = VirtualClock(to_epoch('2026-01-01 00:00:00'))
+    engine = LockEngine(password, clock=clock,
+                        limiter=RateLimiter(DEFAULT_TIERS, clock=clock), source="keypad:main")
+    lines = []
+
+    def log(event_type, details):
+        lines.append(f"[{from_epoch(clock.now)}] {event_type}: {details}\n")
+
+    def on_event(event, detail):
+        if event == INVALID:
+            log("FAILED", "Invalid length")
+        elif event == SUCCESS:
+            log("SUCCESS", "Correct password")
+        elif event in (FAILED, LOCKED):
+            log("FAILED", f"Wrong password: {detail}")
+            if event == LOCKED:
+                log("LOCKED", f"Too many attempts: {engine.attempts}")
+        elif event == EMERGENCY:
+            log("EMERGENCY", "Emergency lock activated by user")
+        elif event == THROTTLED:
+            log("THROTTLED", f"Rate limit reached, retry in {int(detail + 0.999)}s")
+
+    engine.subscribe(on_event)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(count):
+            # Sub-second gaps, as real keypad use has; the log keeps whole seconds
+            clock.now += rng.choice((1, 2, 5, 20, 60, 600)) * rng.uniform(0.2, 1.0)
+            engine.tick()
+            roll = rng.random()
+            if roll < 0.002:
+                engine.emergency_lock()
+                clock.now += 300
+                engine.reset()
+                log("SYSTEM", RESET_MESSAGES[0])
+                continue
+            if engine.is_locked:
+                continue  # nobody types into a locked keypad's log
+            if roll < 0.1:
+                code = str(rng.randrange(10000)).zfill(4)
+            elif roll < 0.11:
+                code = str(rng.randrange(1000))
+            else:
+                code = password
+            engine.current_input = ""
+            engine.press_sequence(code + ENTER_KEY)
+            if len(lines) >= 10000:
+                f.writelines(lines)
+                lines.clear()
+        f.writelines(lines)
+
+
+def load_settings(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return validate_settings(json.load(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an access log through the lock logic at full speed")
+    parser.add_argument('log_file', nargs='?', default="access_log.txt")
+    parser.add_argument('--no-archives', action='store_true', help="skip rotated .gz archives")
+    parser.add_argument('--settings', help="take password, limits and rate tiers from a settings file")
+    parser.add_argument('--password', default="1234")
+    parser.add_argument('--max-attempts', type=int, default=3)
+    parser.add_argument('--lockout-time', type=int, default=30)
+    parser.add_argument('--rate-limit', action='append', type=parse_tier, metavar='ATTEMPTS/SECONDS')
+    parser.add_argument('--no-rate-limit', action='store_true')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="replay the trace this many times (for throughput measurements)")
+    parser.add_argument('--show', type=int, default=20, help="divergences to print")
+    parser.add_argument('--synthesize', type=int, metavar='ATTEMPTS',
+                        help="first write a synthetic log of this many attempts to log_file")
+    parser.add_argument('--json', metavar='FILE', help="write the results as JSON")
+    args = parser.parse_args()
+
+    password, max_attempts, lockout_time = args.password, args.max_attempts, args.lockout_time
+    tiers = args.rate_limit or DEFAULT_TIERS
+    if args.settings:
+        settings = load_settings(args.settings)
+        password = settings.get('password', password)
+        max_attempts = settings.get('max_attempts', max_attempts)
+        lockout_time = settings.get('lockout_time', lockout_time)
+        if not args.rate_limit and 'rate_limit_tiers' in settings:
+            tiers = tuple((int(limit), float(window)) for limit, window in settings['rate_limit_tiers'])
+    if args.no_rate_limit:
+        tiers = None
+
+    if args.synthesize:
+        started = time.perf_counter()
+        synthesize(args.log_file, args.synthesize, password)
+        print(f"Wrote {args.synthesize:,} attempts to {args.log_file} "
+              f"in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    steps = list(parse_steps(iter_lines(args.log_file, not args.no_archives)))
+    parse_s = time.perf_counter() - started
+
+    replay_s = 0.0
+    for _ in range(args.repeat):
+        # Each pass starts from a fresh lock, as the recorded door did
+        replay = Replay(password, max_attempts, lockout_time, tiers)
+        started = time.perf_counter()
+        replay.run(steps)
+        replay_s += time.perf_counter() - started
+    total = len(steps) * args.repeat
+
+    print(f"Parsed {len(steps):,} steps in {parse_s:.2f}s")
+    print(f"Replayed {total:,} steps in {replay_s:.3f}s ({total / replay_s if replay_s else 0:,.0f} steps/s)")
+    print("Outcomes: " + ", ".join(f"{event} {count:,}" for event, count in
+                                   sorted(replay.outcomes.items(), key=lambda kv: str(kv[0]))))
+    print(f"{replay.divergence_count:,} divergences from the recorded outcomes")
+    for number, epoch, expected, actual in replay.divergences[:args.show]:
+        print(f"  line {number} [{from_epoch(epoch)}]: recorded {expected}, replay gave {actual}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'steps': len(steps), 'repeat': args.repeat, 'parse_s': round(parse_s, 3),
+                       'replay_s': round(replay_s, 3),
+                       'steps_per_s': round(total / replay_s) if replay_s else None,
+                       'outcomes': {str(k): v for k, v in replay.outcomes.items()},
+                       'divergences': replay.divergence_count,
+                       'first_divergences': [{'line': number, 'time': from_epoch(epoch),
+                                              'recorded': expected, 'replayed': actual}
+                                             for number, epoch, expected, actual in replay.divergences]},
+                      f, indent=2)
+    sys.exit(1 if replay.divergence_count else 0)
+
+
+if __name__ == "__main__":
+    main()
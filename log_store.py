@@ -0,0 +1,196 @@
+import argparse
+import calendar
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    door TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_type_ts ON events (event_type, ts);
+CREATE INDEX IF NOT EXISTS events_door_ts ON events (door, ts);
+"""
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def to_epoch(timestamp):
+    """'YYYY-MM-DD HH:MM:SS' (or just the date) as naive epoch seconds
+
+    Log timestamps carry no timezone, so they are stored as if they were
+    UTC; queries go through the same function, which keeps ranges exact.
+    """
+    year, month, day = int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10])
+    seconds = 0
+    if len(timestamp) >= 19:
+        seconds = int(timestamp[11:13]) * 3600 + int(timestamp[14:16]) * 60 + int(timestamp[17:19])
+    return calendar.timegm((year, month, day, 0, 0, 0)) + seconds
+
+
+def from_epoch(epoch):
+    """Naive epoch seconds back to the log timestamp format"""
+    return time.strftime(TIME_FORMAT, time.gmtime(epoch))
+
+
+def parse_log_line(line):
+    """Split '[ts] TYPE: details' into (epoch, type, details), or None"""
+    if len(line) < 23 or line[0] != '[' or line[20] != ']':
+        return None
+    event_type, sep, details = line[22:].partition(': ')
+    if not sep:
+        return None
+    try:
+        epoch = to_epoch(line[1:20])
+    except ValueError:
+        return None
+    return epoch, event_type, details.rstrip('\r\n')
+
+
+class LogStore:
+    """Indexed SQLite copy of the access log
+
+    Each thread gets its own connection (the background log writer inserts,
+    the Tk thread queries); WAL mode lets both run at the same time.
+    """
+
+    def __init__(self, path="access_log.db", door="main"):
+        self.path = path
+        self.door = door
+        self.local = threading.local()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def close(self):
+        """Close the connection of the calling thread"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    def append(self, rows):
+        """Insert (epoch, event_type, door, details) rows in one transaction"""
+        conn = self.connection()
+        with conn:
+            conn.executemany("INSERT INTO events (ts, event_type, door, details) "
+                             "VALUES (?, ?, ?, ?)", rows)
+
+    def append_lines(self, lines):
+        """Parse raw log lines and store them; used as a BufferedLogWriter sink"""
+        door = self.door
+        rows = []
+        for line in lines:
+            parsed = parse_log_line(line)
+            if parsed is not None:
+                rows.append((parsed[0], parsed[1], door, parsed[2]))
+        if rows:
+            self.append(rows)
+
+    def _where(self, start, end, event_types, door):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(end)
+        if event_types:
+            clauses.append(f"event_type IN ({','.join('?' * len(event_types))})")
+            params.extend(event_types)
+        if door is not None:
+            clauses.append("door = ?")
+            params.append(door)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, start=None, end=None, event_types=None, door=None, limit=500):
+        """Newest matching events as (epoch, event_type, door, details) tuples
+
+        start/end are naive epoch seconds (see to_epoch); end is exclusive.
+        """
+        where, params = self._where(start, end, event_types, door)
+        sql = f"SELECT ts, event_type, door, details FROM events{where} ORDER BY ts DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.connection().execute(sql, params).fetchall()
+
+    def count(self, start=None, end=None, event_types=None, door=None):
+        """Number of matching events"""
+        where, params = self._where(start, end, event_types, door)
+        return self.connection().execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+
+    def event_types(self):
+        """Distinct event types present in the store"""
+        rows = self.connection().execute("SELECT DISTINCT event_type FROM events ORDER BY 1")
+        return [row[0] for row in rows]
+
+    def import_text_log(self, path, door=None, batch_size=50000):
+        """One-shot import of an existing access_log.txt; returns rows added"""
+        door = self.door if door is None else door
+        added = 0
+        batch = []
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                parsed = parse_log_line(line)
+                if parsed is None:
+                    continue
+                batch.append((parsed[0], parsed[1], door, parsed[2]))
+                if len(batch) >= batch_size:
+                    self.append(batch)
+                    added += len(batch)
+                    batch = []
+        if batch:
+            self.append(batch)
+            added += len(batch)
+        return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed SQLite store for the access log")
+    parser.add_argument('--db', default="access_log.db")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    importer = sub.add_parser('import', help="import a text access log")
+    importer.add_argument('log_file', nargs='?', default="access_log.txt")
+    importer.add_argument('--door', default="main")
+
+    search = sub.add_parser('query', help="print matching events")
+    search.add_argument('--start', help="YYYY-MM-DD[ HH:MM:SS]")
+    search.add_argument('--end', help="YYYY-MM-DD[ HH:MM:SS] (exclusive)")
+    search.add_argument('--type', action='append', dest='types')
+    search.add_argument('--door')
+    search.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    store = LogStore(args.db)
+    if args.command == 'import':
+        started = time.perf_counter()
+        added = store.import_text_log(args.log_file, args.door)
+        print(f"Imported {added} events in {time.perf_counter() - started:.2f}s")
+    else:
+        started = time.perf_counter()
+        start = to_epoch(args.start) if args.start else None
+        end = to_epoch(args.end) if args.end else None
+        rows = store.query(start, end, args.types, args.door, args.limit)
+        total = store.count(start, end, args.types, args.door)
+        elapsed = (time.perf_counter() - started) * 1000
+        for ts, event_type, door, details in rows:
+            print(f"[{from_epoch(ts)}] {door} {event_type}: {details}")
+        print(f"{len(rows)} of {total} matching events ({elapsed:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
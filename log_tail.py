@@ -0,0 +1,70 @@
+import os
+
+
+class LogTail:
+    """Follow a growing log file by remembering the last offset read
+
+    read_chunk() only returns complete lines appended since the previous call.
+    If the file shrank or was replaced (clear_logs, factory_reset, rotation)
+    the tail starts over from the beginning and reports reset=True.
+    """
+
+    def __init__(self, path, encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.offset = 0
+        self.inode = None
+        self.head = b""  # first bytes of the file, to spot a reused inode
+
+    def _stat(self):
+        try:
+            return os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+    def _detect_reset(self, st):
+        """True if the file was truncated or replaced since the last read"""
+        if st is None:
+            reset = self.offset > 0 or self.inode is not None
+            self.offset = 0
+            self.inode = None
+            return reset
+        inode = (st.st_dev, st.st_ino)
+        reset = (self.inode is not None and inode != self.inode) or st.st_size < self.offset
+        if reset:
+            self.offset = 0
+        self.inode = inode
+        return reset
+
+    def _check_head(self, f):
+        """Compare the start of an open file with what was seen before"""
+        reset = False
+        if self.offset and f.read(len(self.head)) != self.head:
+            self.offset = 0
+            reset = True
+        if not self.offset:
+            f.seek(0)
+            self.head = f.read(64)
+        return reset
+
+    def read_chunk(self, max_bytes=None):
+        """Return (data, start_offset, reset) for up to max_bytes of new complete lines
+
+        Nothing is skipped; call repeatedly until data is empty.
+        """
+        st = self._stat()
+        reset = self._detect_reset(st)
+        if st is None or st.st_size == self.offset:
+            return b"", self.offset, reset
+
+        with open(self.path, 'rb') as f:
+            reset = self._check_head(f) or reset
+            start = self.offset
+            f.seek(start)
+            size = st.st_size - start
+            if max_bytes is not None and size > max_bytes:
+                size = max_bytes
+            data = f.read(size)
+        end = data.rfind(b"\n") + 1
+        self.offset = start + end
+        return data[:end], start, reset
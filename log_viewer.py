@@ -0,0 +1,207 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from array import array
+from itertools import accumulate, islice
+
+from log_tail import LogTail
+
+
+class LineIndex:
+    """Sparse line-offset index over an append-only log file
+
+    Only the byte offset of every stride-th line is kept, so the index costs
+    8 bytes per stride lines; any line is reached by seeking to the nearest
+    checkpoint and skipping at most stride - 1 lines.
+    """
+
+    def __init__(self, path, stride=64, encoding='utf-8'):
+        self.path = path
+        self.stride = stride
+        self.encoding = encoding
+        self.tail = LogTail(path, encoding)
+        self.checkpoints = array('Q')
+        self.line_count = 0
+
+    def clear(self):
+        """Forget everything indexed so far"""
+        self.tail = LogTail(self.path, self.encoding)
+        self.checkpoints = array('Q')
+        self.line_count = 0
+
+    def update(self, max_bytes=4 << 20):
+        """Index up to max_bytes of new data; returns (changed, reset, caught_up)"""
+        data, start, reset = self.tail.read_chunk(max_bytes)
+        if reset:
+            self.checkpoints = array('Q')
+            self.line_count = 0
+        if not data:
+            return reset, reset, True
+
+        # Start offset of every line in the chunk; keep one per stride
+        lines = data.split(b"\n")
+        lines.pop()  # data always ends with a newline
+        starts = accumulate((len(line) + 1 for line in lines[:-1]), initial=start)
+        first = (-self.line_count) % self.stride
+        self.checkpoints.extend(islice(starts, first, None, self.stride))
+        self.line_count += len(lines)
+        # A read well short of the budget means we reached the end of the file
+        caught_up = len(data) < max_bytes - 65536
+        return True, reset, caught_up
+
+    def read_lines(self, first, count):
+        """Return up to count decoded lines starting at line number first"""
+        first = max(0, min(first, self.line_count))
+        count = max(0, min(count, self.line_count - first))
+        if not count:
+            return []
+        checkpoint, skip = divmod(first, self.stride)
+        lines = []
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.checkpoints[checkpoint])
+                for _ in range(skip):
+                    f.readline()
+                for _ in range(count):
+                    line = f.readline()
+                    if not line:
+                        break
+                    lines.append(line.rstrip(b"\r\n").decode(self.encoding, 'replace'))
+        except FileNotFoundError:
+            pass
+        return lines
+
+    @staticmethod
+    def line_time(line):
+        """The "YYYY-MM-DD HH:MM:SS" prefix of a log line, or ''"""
+        if line.startswith('[') and len(line) > 20 and line[20] == ']':
+            return line[1:20]
+        return ''
+
+    def find_time(self, timestamp):
+        """Line number of the first entry at or after timestamp ("YYYY-MM-DD[ HH:MM:SS]")"""
+        low, high = 0, len(self.checkpoints)
+        # Binary search over checkpoints, reading one line per probe
+        while low < high:
+            middle = (low + high) // 2
+            first = self.read_lines(middle * self.stride, 1)
+            if first and self.line_time(first[0]) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        start = max(0, (low - 1) * self.stride)
+        for number, line in enumerate(self.read_lines(start, self.stride), start):
+            if self.line_time(line) >= timestamp:
+                return number
+        return min(start + self.stride, self.line_count)
+
+
+class VirtualLogView(tk.Frame):
+    """Log viewer that only renders the visible window of lines
+
+    The Text widget holds just one screenful; the scrollbar is driven from
+    the LineIndex, so memory and redraw cost do not depend on the log size.
+    """
+
+    def __init__(self, master, path, stride=64, **text_options):
+        bg = text_options.get('bg', 'black')
+        super().__init__(master, bg=bg)
+        self.index = LineIndex(path, stride)
+        self.first = 0
+        self.rows = text_options.pop('height', 8)
+        self.follow = True
+        self.message = None
+        self.indexing = False
+
+        self.text = tk.Text(self, height=self.rows, wrap='none', **text_options)
+        self.scrollbar = tk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.text.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+        self.text.config(state='disabled')
+
+        font = tkfont.Font(font=self.text.cget('font'))
+        self.line_height = max(1, font.metrics('linespace'))
+        self.text.bind('<Configure>', self.on_resize)
+        self.text.bind('<MouseWheel>', self.on_mousewheel)
+        self.text.bind('<Button-4>', lambda e: self.scroll_lines(-3))
+        self.text.bind('<Button-5>', lambda e: self.scroll_lines(3))
+
+    def on_resize(self, event):
+        rows = max(1, event.height // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+    def on_mousewheel(self, event):
+        self.scroll_lines(-3 if event.delta > 0 else 3)
+
+    def reload(self):
+        """Re-index the file from scratch and jump to its end"""
+        self.index.clear()
+        self.follow = True
+        self.refresh()
+        self.render()
+
+    def refresh(self, budget_bytes=4 << 20):
+        """Index newly appended lines, continuing in the background if far behind"""
+        changed, reset, caught_up = self.index.update(budget_bytes)
+        if reset:
+            self.first = 0
+        if not caught_up:
+            # Large backlog: index it in slices so the UI stays responsive
+            if not self.indexing:
+                self.indexing = True
+                self.after(1, self._continue_indexing)
+        if changed or self.message:
+            self.render()
+
+    def _continue_indexing(self):
+        self.indexing = False
+        self.refresh()
+
+    def show_message(self, message):
+        """Show a status text instead of log lines until the next render"""
+        self.message = message
+        self._set_text(message)
+
+    def _set_text(self, text):
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', text)
+        self.text.config(state='disabled')
+
+    def render(self):
+        """Draw the visible window of lines"""
+        total = self.index.line_count
+        if self.follow:
+            self.first = max(0, total - self.rows)
+        self.first = max(0, min(self.first, max(0, total - self.rows)))
+        if total == 0:
+            self.message = None
+            self._set_text("No access logs found.")
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.message = None
+        self._set_text("\n".join(self.index.read_lines(self.first, self.rows)))
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + self.rows) / total))
+
+    def scroll_lines(self, delta):
+        self.first += delta
+        self.follow = self.first + self.rows >= self.index.line_count
+        self.render()
+
+    def yview(self, *args):
+        """Scrollbar callback: ('moveto', fraction) or ('scroll', n, units|pages)"""
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * self.index.line_count)
+            self.follow = self.first + self.rows >= self.index.line_count
+            self.render()
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self.rows if args[2] == 'pages' else 1)
+            self.scroll_lines(step)
+
+    def jump_to_time(self, timestamp):
+        """Scroll so the first entry at or after timestamp is on top"""
+        self.first = self.index.find_time(timestamp)
+        self.follow = False
+        self.render()
+        return self.first
@@ -0,0 +1,203 @@
+import os
+import queue
+import threading
+import time
+from datetime import date
+
+import log_archive
+
+_STOP = object()
+
+
+class BufferedLogWriter:
+    """Queue-fed background writer for the access log
+
+    log lines are handed to a long-lived thread that keeps the file open and
+    writes them in batches, flushing when max_batch lines are pending or
+    flush_interval seconds have passed. Callers never touch the disk.
+    Each sink in sinks is also called with every batch, on the writer thread.
+
+    With max_bytes and/or rotate_daily set, the live file is rotated into a
+    gzip archive before a batch would be written past the limit or into a
+    new day, keeping at most backup_count archives.
+    """
+
+    def __init__(self, path, max_batch=256, flush_interval=0.5, encoding='utf-8', sinks=(),
+                 max_bytes=None, rotate_daily=False, backup_count=None):
+        self.path = path
+        self.sinks = list(sinks)
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.backup_count = backup_count
+        self.file_day = None
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.encoding = encoding
+        self.queue = queue.SimpleQueue()
+        self.closed = False
+        self.error = None  # why the writer thread stopped, if it died
+        self.unwritten = []  # the batch it was holding at the time
+        self.fallback_lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, entry):
+        """Queue one complete log line (including the newline)"""
+        if self.closed:
+            raise ValueError("write to closed log writer")
+        if not self.thread.is_alive():
+            self._write_inline([entry])
+            return
+        self.queue.put(entry)
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far is on disk"""
+        if self.closed:
+            return False
+        if not self.thread.is_alive():
+            return self._write_inline([])
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Drain the queue, close the file and stop the thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+        if not self.thread.is_alive():
+            self._write_inline([])  # whatever a dead writer thread left behind
+
+    def _write_inline(self, entries):
+        """Fallback once the writer thread has died: write on the caller's thread
+
+        Whatever the thread left behind (its batch and the queue) goes first,
+        so lines stay in order and nothing piles up in memory. The batch goes
+        through rotation and the sinks like the thread's; if it cannot be
+        written it is kept for the next call.
+        """
+        with self.fallback_lock:
+            lines = self.unwritten
+            self.unwritten = []
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is not _STOP:
+                    lines.append(item)
+            lines.extend(entries)
+            if not lines:
+                return True
+            handle = None
+            try:
+                handle = self._write_batch(self._open(), lines)
+            except (OSError, ValueError) as e:
+                self.unwritten = lines
+                print(f"Logging error: {e} (writer thread stopped: {self.error})")
+                return False
+            finally:
+                if handle is not None:
+                    try:
+                        handle.close()
+                    except OSError:
+                        pass
+            return True
+
+    def _open(self):
+        handle = open(self.path, 'a', encoding=self.encoding)
+        st = os.fstat(handle.fileno())
+        self.file_day = date.fromtimestamp(st.st_mtime) if st.st_size else date.today()
+        return handle
+
+    def _maybe_rotate(self, handle):
+        """Rotate the live file if it is too big or from a previous day"""
+        if not self.max_bytes and not self.rotate_daily:
+            return handle
+        size = os.fstat(handle.fileno()).st_size
+        if not size:
+            self.file_day = date.today()
+            return handle
+        if ((self.max_bytes and size >= self.max_bytes)
+                or (self.rotate_daily and self.file_day != date.today())):
+            handle.close()
+            try:
+                log_archive.rotate(self.path, self.backup_count)
+            except OSError as e:
+                print(f"Log rotation error: {e}")
+            handle = self._open()
+        return handle
+
+    def _write_batch(self, handle, batch):
+        """Write and flush one batch, reopening the file if it went away"""
+        try:
+            handle = self._maybe_rotate(handle)
+            handle.write(''.join(batch))
+            handle.flush()
+        except (OSError, ValueError) as e:
+            print(f"Logging error: {e}")
+            try:
+                handle.close()
+            except OSError:
+                pass
+            handle = self._open()
+            handle.write(''.join(batch))
+            handle.flush()
+        for sink in list(self.sinks):
+            try:
+                sink(batch)
+            except Exception as e:
+                print(f"Log sink error: {e}")
+        return handle
+
+    def _run(self):
+        """Writer thread: collect lines into batches until stopped"""
+        handle = None
+        batch = []
+        waiters = []
+        deadline = None
+        stopping = False
+        try:
+            handle = self._open()
+            while not stopping:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item is not None:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    if len(batch) < self.max_batch:
+                        continue
+
+                if batch and (stopping or waiters or len(batch) >= self.max_batch
+                              or time.monotonic() >= deadline):
+                    handle = self._write_batch(handle, batch)
+                    batch = []
+                    deadline = None
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+        except Exception as e:
+            self.error = e
+            self.unwritten = batch
+            print(f"Logging error: {e} - writing log lines synchronously from now on")
+        finally:
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+            for waiter in waiters:
+                waiter.set()
@@ -0,0 +1,214 @@
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lock_engine import SUCCESS, LOCKED, UNLOCKED, EMERGENCY, RESET
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    """Monotonic count, optionally split by label values
+
+    Updates are plain dict/int operations done by a single writer thread (the
+    Tk thread), so no lock is taken on the hot path. The scrape thread renders
+    from a dict(...) copy - a single C-level copy the writer cannot interleave
+    with - and never iterates the live dict while an inc() may resize it. A
+    scrape may see a value one update old, which Prometheus tolerates.
+    """
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+
+    def inc(self, *label_values, amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(dict(self.values).items()):
+            lines.append(f"{self.name}{format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Gauge:
+    """Current value, either set by the writer or read from fn at scrape time"""
+
+    def __init__(self, name, help_text, fn=None):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def render(self):
+        value = self.value
+        if self.fn is not None:
+            try:
+                value = self.fn()
+            except Exception:
+                value = float('nan')
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge",
+                f"{self.name} {value}"]
+
+
+class Histogram:
+    """Observations counted into fixed cumulative buckets
+
+    Bucket counts and the sum change together under a lock, so a scrape never
+    reports a count without its sum. Observations are rare (one per lockout),
+    so the lock costs nothing measurable.
+    """
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def render(self):
+        with self.lock:
+            counts = list(self.counts)
+            total = self.sum
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound:g}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"{self.name}_sum {total}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in list(self.metrics):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class LockMetrics:
+    """Counters and timings of one lock, fed by its engine and log
+
+    observe_event has the LockEngine subscriber signature; wrap it for a
+    DoorController (door, event, detail) as needed.
+    """
+
+    def __init__(self, registry=None, clock=time.monotonic):
+        self.registry = registry or MetricsRegistry()
+        self.clock = clock
+        self.lock_started = None
+        register = self.registry.register
+        self.events = register(Counter("lock_events_total",
+                                       "Lock state machine events by type", ("event",)))
+        self.log_entries = register(Counter("lock_log_entries_total",
+                                            "Access log entries written by type", ("type",)))
+        self.alerts = register(Counter("lock_security_alerts_total",
+                                       "Anomaly detector alerts by kind", ("kind",)))
+        self.locked = register(Gauge("lock_locked", "1 while the lock rejects input"))
+        self.lockout_duration = register(Histogram(
+            "lock_lockout_duration_seconds", "How long lockouts lasted until unlock or reset",
+            (1, 5, 10, 30, 60, 120, 300, 900, 3600)))
+        self.started = register(Gauge("lock_start_time_seconds", "Unix time the lock process started"))
+        self.started.set(time.time())
+
+    def lock_restored(self, elapsed=0.0):
+        """A lockout carried over from before a restart, already elapsed seconds old
+
+        No engine event announces it, so the next unlock would otherwise not
+        be timed.
+        """
+        if self.lock_started is None:
+            self.lock_started = self.clock() - elapsed
+        self.locked.set(1)
+
+    def observe_event(self, event, detail=None):
+        self.events.inc(event)
+        if event in (LOCKED, EMERGENCY):
+            if self.lock_started is None:
+                self.lock_started = self.clock()
+            self.locked.set(1)
+        elif event in (UNLOCKED, RESET, SUCCESS) and self.lock_started is not None:
+            self.lockout_duration.observe(self.clock() - self.lock_started)
+            self.lock_started = None
+            self.locked.set(0)
+
+
+class MetricsServer:
+    """Serves a registry at http://host:port/metrics from a daemon thread"""
+
+    def __init__(self, registry, host="127.0.0.1", port=9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+        self.scrapes = 0
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = server.registry.render().encode('utf-8')
+                server.scrapes += 1
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes every second would flood stderr
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server",
+                                       daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
@@ -0,0 +1,168 @@
+import bisect
+import cProfile
+import functools
+import io
+import pstats
+import sys
+import threading
+import time
+from array import array
+
+# Bucket upper bounds: 1 us to ~100 s, four per decade
+BOUNDS = tuple(10 ** (exponent / 4) * 1e-6 for exponent in range(33))
+
+
+class LatencyHistogram:
+    """Call durations counted into fixed, log-spaced buckets"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * (len(BOUNDS) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of calls"""
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= wanted:
+                return BOUNDS[index] if index < len(BOUNDS) else self.max
+        return self.max
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class HandlerProfiler:
+    """Opt-in latency recording around named methods of one object
+
+    install() puts a thin wrapper in the instance dict for every name, so it
+    must run before the methods are handed to Tk as callbacks. While
+    disabled a wrapper only checks a flag and calls through.
+    """
+
+    def __init__(self, target, names):
+        self.target = target
+        self.names = list(names)
+        self.enabled = False
+        self.histograms = {name: LatencyHistogram() for name in self.names}
+
+    def install(self):
+        for name in self.names:
+            method = getattr(self.target, name)
+            setattr(self.target, name, self._wrap(method, self.histograms[name]))
+
+    def _wrap(self, method, histogram):
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return method(*args, **kwargs)
+            started = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.add(clock() - started)
+        return wrapper
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def report(self):
+        """Text table of every method that was called, slowest p99 first"""
+        rows = [(name, h) for name, h in self.histograms.items() if h.count]
+        if not rows:
+            return "No calls recorded yet - enable latency recording and use the lock."
+        rows.sort(key=lambda row: row[1].percentile(0.99), reverse=True)
+        lines = [f"{'handler':<26} {'calls':>8} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for name, h in rows:
+            lines.append(f"{name:<26} {h.count:>8} {h.total / h.count * 1000:>9.3f} "
+                         f"{h.percentile(0.5) * 1000:>9.3f} {h.percentile(0.99) * 1000:>9.3f} "
+                         f"{h.max * 1000:>9.3f}")
+        lines.append("(p50/p99 are histogram bucket upper bounds)")
+        return "\n".join(lines)
+
+
+class CProfileCapture:
+    """cProfile of the calling (Tk) thread between start() and stop()"""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self, path, top=25):
+        """Write the .prof file and return the top functions by cumulative time"""
+        self.profile.disable()
+        self.profile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats('cumulative').print_stats(top)
+        return out.getvalue()
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread
+
+    Cheap enough to leave the app running normally; the result is written in
+    the folded format ("a;b;c count") that flame graph tools read.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = threading.main_thread().ident if thread_id is None else thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            key = ";".join(reversed(names))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def stop(self, path, top=15):
+        """Write folded stacks to path and return the most frequent leaf frames"""
+        self.stopping.set()
+        self.thread.join()
+        leaves = {}
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+                leaf = stack.rsplit(';', 1)[-1]
+                leaves[leaf] = leaves.get(leaf, 0) + count
+        lines = [f"{self.samples} samples"]
+        for leaf, count in sorted(leaves.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"{count * 100 / max(self.samples, 1):6.1f}%  {leaf}")
+        return "\n".join(lines)
@@ -0,0 +1,274 @@
+import math
+import time
+from array import array
+
+# (attempts, window seconds): 5 a minute, 20 an hour, 100 a day
+DEFAULT_TIERS = ((5, 60.0), (20, 3600.0), (100, 86400.0))
+
+
+def parse_tier(text):
+    """'5/60' -> (5, 60.0)"""
+    limit, _, window = text.partition('/')
+    limit, window = int(limit), float(window)
+    if limit < 1 or window <= 0:
+        raise ValueError(f"Invalid rate limit tier: {text}")
+    return limit, window
+
+
+class RateLimiter:
+    """Sliding-window attempt counters per source, in fixed-size arrays
+
+    A source is any string key ("keypad:main", "remote:10.0.0.7", ...). Each
+    tier keeps a sliding-window counter: the counts of the current and the
+    previous fixed window, with the previous one weighted by how much of it
+    still overlaps the sliding window. That is two integers per tier, so a
+    check costs the same with one source or a million.
+
+    At most max_sources are tracked. Slots form an LRU list (prev/next
+    arrays); when full, the source idle the longest is evicted. dump_state
+    and load_state carry the counters over a restart (the lock journal
+    keeps them in its snapshot).
+    """
+
+    __slots__ = ('tiers', 'max_sources', 'clock', 'index', 'keys', 'last',
+                 'counts', 'prev_slot', 'next_slot', 'size')
+
+    def __init__(self, tiers=DEFAULT_TIERS, max_sources=100000, clock=time.monotonic):
+        if not tiers:
+            raise ValueError("At least one rate limit tier is required")
+        self.tiers = tuple((int(limit), float(window)) for limit, window in tiers)
+        self.max_sources = max_sources
+        self.clock = clock
+        self.index = {}                                  # source -> slot
+        self.keys = [None] * max_sources                 # slot -> source
+        self.last = array('d', bytes(8 * max_sources))   # time of the last hit
+        # Per slot and tier: previous window count, current window count
+        self.counts = array('I', bytes(4 * 2 * len(self.tiers) * max_sources))
+        # LRU list through slots; max_sources is the sentinel (head/tail)
+        self.prev_slot = array('i', [max_sources] * (max_sources + 1))
+        self.next_slot = array('i', [max_sources] * (max_sources + 1))
+        self.size = 0
+
+    def set_tiers(self, tiers):
+        """Switch to new tiers, keeping every source and its slot
+
+        A tier whose window length is unchanged keeps its counters (only its
+        limit changes); counts of any other window length cannot be
+        converted, so new windows start empty.
+        """
+        if not tiers:
+            raise ValueError("At least one rate limit tier is required")
+        tiers = tuple((int(limit), float(window)) for limit, window in tiers)
+        old_width = 2 * len(self.tiers)
+        old_offsets = {window: 2 * i for i, (_, window) in enumerate(self.tiers)}
+        moves = [(2 * j, old_offsets[window]) for j, (_, window) in enumerate(tiers)
+                 if window in old_offsets]
+        width = 2 * len(tiers)
+        old, counts = self.counts, array('I', bytes(4 * width * self.max_sources))
+        for slot in range(self.size):
+            for new, previous in moves:
+                counts[slot * width + new] = old[slot * old_width + previous]
+                counts[slot * width + new + 1] = old[slot * old_width + previous + 1]
+        self.tiers = tiers
+        self.counts = counts
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, source):
+        return source in self.index
+
+    def _unlink(self, slot):
+        prev, nxt = self.prev_slot[slot], self.next_slot[slot]
+        self.next_slot[prev] = nxt
+        self.prev_slot[nxt] = prev
+
+    def _push_front(self, slot):
+        head = self.max_sources
+        first = self.next_slot[head]
+        self.prev_slot[slot] = head
+        self.next_slot[slot] = first
+        self.prev_slot[first] = slot
+        self.next_slot[head] = slot
+
+    def _slot_for(self, source):
+        """Slot of source, taking a free or the least recently used one"""
+        slot = self.index.get(source)
+        if slot is not None:
+            self._unlink(slot)
+        else:
+            if self.size < self.max_sources:
+                slot = self.size
+                self.size += 1
+            else:
+                slot = self.prev_slot[self.max_sources]  # tail = idle the longest
+                self._unlink(slot)
+                if self.keys[slot] is not None:
+                    del self.index[self.keys[slot]]
+            self.index[source] = slot
+            self.keys[slot] = source
+            self.last[slot] = 0.0
+            base = slot * 2 * len(self.tiers)
+            for i in range(base, base + 2 * len(self.tiers)):
+                self.counts[i] = 0
+        self._push_front(slot)
+        return slot
+
+    @staticmethod
+    def _wait(limit, window, prev, curr, elapsed):
+        """Seconds until the sliding estimate drops below limit"""
+        if curr >= limit:
+            # Not before this window ends, then until the carried-over weight decays
+            return (window - elapsed) + window * (1 - limit / curr)
+        return window * (1 - (limit - curr) / prev) - elapsed
+
+    def _check(self, slot, now, count):
+        """Roll the counters of slot forward to now, optionally adding one
+        attempt, and return the longest wait over all tiers"""
+        last = self.last[slot]
+        counts = self.counts
+        offset = slot * 2 * len(self.tiers)
+        wait = 0.0
+        for limit, window in self.tiers:
+            current = now // window
+            previous = last // window
+            prev, curr = counts[offset], counts[offset + 1]
+            if current != previous:
+                prev, curr = (curr, 0) if current == previous + 1 else (0, 0)
+            if count:
+                curr += 1
+                counts[offset] = prev
+                counts[offset + 1] = curr
+            elapsed = now - current * window
+            if prev * (1 - elapsed / window) + curr >= limit:
+                wait = max(wait, self._wait(limit, window, prev, curr, elapsed))
+            offset += 2
+        return wait
+
+    def dump_state(self, now=None):
+        """Counters of every source, {source: [[window, prev, curr, elapsed], ...]}
+
+        elapsed is how far into its current window each tier is at now, so
+        load_state can age the counters by however long the process was down.
+        """
+        if now is None:
+            now = self.clock()
+        counts = self.counts
+        state = {}
+        for source, slot in self.index.items():
+            last = self.last[slot]
+            offset = slot * 2 * len(self.tiers)
+            tiers = []
+            for _, window in self.tiers:
+                current = now // window
+                previous = last // window
+                prev, curr = counts[offset], counts[offset + 1]
+                if current != previous:
+                    prev, curr = (curr, 0) if current == previous + 1 else (0, 0)
+                if prev or curr:
+                    tiers.append([window, prev, curr, now - current * window])
+                offset += 2
+            if tiers:
+                state[source] = tiers
+        return state
+
+    def load_state(self, state, downtime=0.0, now=None):
+        """Restore dump_state() output, downtime seconds after it was taken
+
+        Each saved tier's sliding estimate is aged by downtime and rounded
+        up into the current window, which may hold a source slightly longer
+        than the original counters would, never shorter. Tiers are matched
+        by window length, as in set_tiers.
+        """
+        if now is None:
+            now = self.clock()
+        offsets = {window: 2 * i for i, (_, window) in enumerate(self.tiers)}
+        for source, tiers in state.items():
+            slot = self._slot_for(source)
+            base = slot * 2 * len(self.tiers)
+            for window, prev, curr, elapsed in tiers:
+                offset = offsets.get(window)
+                if offset is None:
+                    continue
+                t = elapsed + max(0.0, downtime)
+                if t < window:
+                    estimate = prev * (1 - t / window) + curr
+                elif t < 2 * window:
+                    estimate = curr * (1 - (t - window) / window)
+                else:
+                    estimate = 0
+                self.counts[base + offset] = 0
+                self.counts[base + offset + 1] = math.ceil(estimate)
+            self.last[slot] = now
+
+    def add_recent(self, source, ages, now=None):
+        """Count attempts made ages seconds ago (e.g. replayed from a journal)
+
+        Each one counts fully in every tier whose window it falls in.
+        """
+        if now is None:
+            now = self.clock()
+        slot = self._slot_for(source)
+        last = self.last[slot]
+        counts = self.counts
+        offset = slot * 2 * len(self.tiers)
+        for _, window in self.tiers:
+            # Roll to now first, as hit() does
+            current, previous = now // window, last // window
+            prev, curr = counts[offset], counts[offset + 1]
+            if current != previous:
+                prev, curr = (curr, 0) if current == previous + 1 else (0, 0)
+            counts[offset] = prev
+            counts[offset + 1] = curr + sum(1 for age in ages if 0 <= age < window)
+            offset += 2
+        self.last[slot] = now
+
+    def retry_after(self, source, now=None):
+        """Seconds the source has to wait before its next attempt (0.0 if allowed)"""
+        slot = self.index.get(source)
+        if slot is None:
+            return 0.0
+        if now is None:
+            now = self.clock()
+        return self._check(slot, now, False)
+
+    def hit(self, source, now=None):
+        """Count one attempt by source; returns the resulting retry_after"""
+        if now is None:
+            now = self.clock()
+        slot = self._slot_for(source)
+        wait = self._check(slot, now, True)
+        self.last[slot] = now
+        return wait
+
+    def undo_hit(self, source):
+        """Take back the latest hit() of source, e.g. one a replay found never happened
+
+        Only valid right after that hit, before time moves to another window.
+        """
+        slot = self.index.get(source)
+        if slot is None:
+            return
+        counts = self.counts
+        offset = slot * 2 * len(self.tiers)
+        for i in range(offset + 1, offset + 2 * len(self.tiers), 2):
+            if counts[i]:
+                counts[i] -= 1
+
+    def forget(self, source):
+        """Drop all history of a source; its slot is reused first"""
+        slot = self.index.pop(source, None)
+        if slot is None:
+            return
+        self._unlink(slot)
+        self.keys[slot] = None
+        self.last[slot] = 0.0
+        base = slot * 2 * len(self.tiers)
+        for i in range(base, base + 2 * len(self.tiers)):
+            self.counts[i] = 0
+        # Park it at the tail so it is the next slot to be taken
+        tail = self.prev_slot[self.max_sources]
+        self.prev_slot[slot] = tail
+        self.next_slot[slot] = self.max_sources
+        self.next_slot[tail] = slot
+        self.prev_slot[self.max_sources] = slot
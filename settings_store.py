@@ -0,0 +1,168 @@
+import json
+import os
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+def write_atomic(path, data):
+    """Replace path with data as JSON, never leaving a half-written file
+
+    The JSON goes to a temp file in the same directory, is fsynced, then
+    renamed over the target, so readers see either the old or the new file.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class SettingsStore:
+    """Debounced background writer for the settings file
+
+    save() only hands the latest settings to a writer thread. The file is
+    written once changes have been quiet for delay seconds (or max_delay
+    after the first unsaved change, so constant changes still get saved),
+    which turns a burst of spinbox clicks into a single atomic write.
+    """
+
+    def __init__(self, path, delay=0.5, max_delay=5.0):
+        self.path = path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.writes = 0
+        self.on_disk = None  # settings as last loaded or written, to spot our own writes
+        self.queue = queue.SimpleQueue()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+        self.thread.start()
+
+    def load(self):
+        """Settings dict from disk, or None when there is no file yet"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.on_disk = json.load(f)
+        return self.on_disk
+
+    def save(self, settings):
+        """Schedule settings to be written; later calls supersede earlier ones"""
+        if self.closed:
+            raise ValueError("save to closed settings store")
+        self.requests += 1
+        self.queue.put(dict(settings))
+
+    def flush(self, timeout=5.0):
+        """Write any pending settings now and wait for it"""
+        if self.closed or not self.thread.is_alive():
+            return False
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write pending settings and stop the thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+
+    def _write(self, settings):
+        # Set before the rename, so a watcher can never see the file first
+        previous, self.on_disk = self.on_disk, settings
+        try:
+            write_atomic(self.path, settings)
+            self.writes += 1
+        except (OSError, TypeError, ValueError) as e:
+            self.on_disk = previous
+            print(f"Settings save error: {e}")
+
+    def _run(self):
+        """Writer thread: wait for a quiet period, then write the latest settings"""
+        pending = None
+        deadline = first_change = None
+        stopping = False
+        waiters = []
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                pending = item
+                now = time.monotonic()
+                if first_change is None:
+                    first_change = now
+                deadline = min(now + self.delay, first_change + self.max_delay)
+                continue
+
+            if pending is not None and (stopping or waiters or time.monotonic() >= deadline):
+                self._write(pending)
+                pending = None
+                deadline = first_change = None
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+
+def validate_settings(settings):
+    """Check the types and ranges of a settings dict; returns it or raises ValueError
+
+    Only keys that are present are checked, so partial files (e.g. a fleet
+    config that only sets lockout_time) are valid.
+    """
+    if not isinstance(settings, dict):
+        raise ValueError("settings must be a JSON object")
+    password = settings.get('password')
+    if password is not None and (not isinstance(password, str) or len(password) != 4
+                                 or not password.isdigit()):
+        raise ValueError("password must be 4 digits")
+    for key, low, high in (('max_attempts', 1, 99), ('lockout_time', 1, 86400),
+                           ('log_max_bytes', 1024, 1 << 40), ('log_backup_count', 0, 100000)):
+        value = settings.get(key)
+        if value is not None and (type(value) is not int or not low <= value <= high):
+            raise ValueError(f"{key} must be an integer between {low} and {high}")
+    for key in ('audio_feedback', 'haptic_feedback', 'log_store', 'log_rotate_daily'):
+        if key in settings and not isinstance(settings[key], bool):
+            raise ValueError(f"{key} must be true or false")
+    if 'door_id' in settings and (not isinstance(settings['door_id'], str) or not settings['door_id']):
+        raise ValueError("door_id must be a non-empty string")
+    if settings.get('config_dir') is not None and not isinstance(settings['config_dir'], str):
+        raise ValueError("config_dir must be a directory path")
+    port = settings.get('metrics_port')
+    if port is not None and (type(port) is not int or not 1 <= port <= 65535):
+        raise ValueError("metrics_port must be a TCP port number or null")
+    tiers = settings.get('rate_limit_tiers')
+    if tiers is not None:
+        if not isinstance(tiers, list) or not tiers:
+            raise ValueError("rate_limit_tiers must be a list of [attempts, seconds]")
+        for tier in tiers:
+            if (not isinstance(tier, list) or len(tier) != 2 or type(tier[0]) is not int
+                    or tier[0] < 1 or not isinstance(tier[1], (int, float)) or tier[1] <= 0):
+                raise ValueError("rate_limit_tiers must be a list of [attempts, seconds]")
+    doors = settings.get('doors')
+    if doors is not None:
+        if not isinstance(doors, dict):
+            raise ValueError("doors must map door ids to settings")
+        for door_settings in doors.values():
+            validate_settings(door_settings)
+    return settings
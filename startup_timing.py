@@ -0,0 +1,31 @@
+import json
+import time
+
+
+class StartupTimer:
+    """Records named milestones relative to a common starting point
+
+    Times are perf_counter() readings; the report lists each milestone in
+    milliseconds since start, in the order they were reached.
+    """
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = {}
+
+    def mark(self, name, when=None):
+        """Record name once; later calls with the same name are ignored"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() if when is None else when
+        return self.marks[name]
+
+    def elapsed_ms(self, name):
+        return (self.marks[name] - self.started) * 1000
+
+    def as_dict(self):
+        return {name: round(self.elapsed_ms(name), 2) for name in self.marks}
+
+    def report(self, as_json=False):
+        if as_json:
+            return json.dumps(self.as_dict())
+        return "\n".join(f"{name:<24} {ms:8.1f} ms" for name, ms in self.as_dict().items())
@@ -0,0 +1,220 @@
+import math
+import time
+
+LEVEL0_BITS = 8
+LEVEL_BITS = 6
+LEVEL0_SIZE = 1 << LEVEL0_BITS
+LEVEL_SIZE = 1 << LEVEL_BITS
+LEVELS = 4
+# Furthest a timer can be placed; later deadlines are parked in the top
+# level and re-placed each time it cascades
+MAX_SPAN = 1 << (LEVEL0_BITS + LEVEL_BITS * (LEVELS - 1))
+
+
+class Timer:
+    """Handle for one scheduled callback"""
+
+    __slots__ = ('deadline', 'tick', 'callback', 'interval', 'cancelled')
+
+    def __init__(self, deadline, tick, callback, interval=None):
+        self.deadline = deadline
+        self.tick = tick
+        self.callback = callback
+        self.interval = interval  # seconds between repeats, None for one-shot
+        self.cancelled = False
+
+
+class TimerWheel:
+    """Hierarchical timing wheel keyed by monotonic deadlines
+
+    Level 0 has 256 slots of resolution seconds; each higher level has 64
+    slots, each spanning a full turn of the level below (2.56 s, 164 s and
+    2.9 h at the default 10 ms). Scheduling and cancelling are O(1), and
+    advancing costs O(1) per elapsed tick plus the timers that fire - the
+    number of pending timers never matters. Timers never fire early; they
+    fire on the first tick at or after their deadline.
+    """
+
+    def __init__(self, resolution=0.01, clock=time.monotonic):
+        self.resolution = resolution
+        self.clock = clock
+        self.origin = clock()
+        self.current = 0  # next tick to process
+        self.levels = [[[] for _ in range(LEVEL0_SIZE)]]
+        self.levels += [[[] for _ in range(LEVEL_SIZE)] for _ in range(LEVELS - 1)]
+        self.count = 0
+        self.level0_entries = 0  # timers sitting in level 0, cancelled or not
+
+    def __len__(self):
+        return self.count
+
+    def tick_of(self, deadline):
+        """First tick at or after deadline"""
+        return math.ceil((deadline - self.origin) / self.resolution - 1e-9)
+
+    def time_of(self, tick):
+        return self.origin + tick * self.resolution
+
+    def call_at(self, deadline, callback, interval=None):
+        """Run callback() once the clock reaches deadline"""
+        timer = Timer(deadline, self.tick_of(deadline), callback, interval)
+        self._place(timer)
+        self.count += 1
+        return timer
+
+    def call_later(self, delay, callback):
+        return self.call_at(self.clock() + delay, callback)
+
+    def call_every(self, interval, callback):
+        """Run callback() every interval seconds, without drift"""
+        return self.call_at(self.clock() + interval, callback, interval)
+
+    def cancel(self, timer):
+        """Stop a timer; it is dropped lazily when its slot comes up"""
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            self.count -= 1
+
+    def _place(self, timer):
+        tick = max(timer.tick, self.current)
+        delta = tick - self.current
+        if delta < LEVEL0_SIZE:
+            self.levels[0][tick & (LEVEL0_SIZE - 1)].append(timer)
+            self.level0_entries += 1
+            return
+        if delta >= MAX_SPAN:
+            tick = self.current + MAX_SPAN - 1
+            delta = MAX_SPAN - 1
+        shift = LEVEL0_BITS
+        for level in range(1, LEVELS):
+            if delta < 1 << (shift + LEVEL_BITS) or level == LEVELS - 1:
+                self.levels[level][(tick >> shift) & (LEVEL_SIZE - 1)].append(timer)
+                return
+            shift += LEVEL_BITS
+
+    def _cascade(self):
+        """Move the timers of the upcoming block down towards level 0"""
+        shift = LEVEL0_BITS
+        for level in range(1, LEVELS):
+            index = (self.current >> shift) & (LEVEL_SIZE - 1)
+            slot = self.levels[level][index]
+            self.levels[level][index] = []
+            for timer in slot:
+                if not timer.cancelled:
+                    self._place(timer)
+            if index:
+                break
+            shift += LEVEL_BITS
+
+    def advance(self, now=None):
+        """Fire every timer due at or before now; returns how many ran"""
+        if now is None:
+            now = self.clock()
+        target = math.floor((now - self.origin) / self.resolution + 1e-9)
+        if self.count == 0:
+            # Nothing live anywhere: skip the empty ticks in one step
+            self.current = max(self.current, target + 1)
+            return 0
+        fired = 0
+        wheel = self.levels[0]
+        while self.current <= target:
+            index = self.current & (LEVEL0_SIZE - 1)
+            if index == 0:
+                self._cascade()
+            if not self.level0_entries:
+                # Level 0 is empty: jump straight to the next cascade point
+                self.current = min(target, self.current | (LEVEL0_SIZE - 1)) + 1
+                continue
+            slot = wheel[index]
+            if not slot:
+                self.current += 1
+                continue
+            wheel[index] = []
+            self.level0_entries -= len(slot)
+            # Advance first so timers scheduled by callbacks land on a later tick
+            self.current += 1
+            for timer in slot:
+                if timer.cancelled:
+                    continue
+                if timer.interval is None:
+                    timer.cancelled = True
+                    self.count -= 1
+                try:
+                    timer.callback()
+                except Exception as e:
+                    print(f"Timer error: {e}")
+                fired += 1
+                if timer.interval is not None and not timer.cancelled:
+                    timer.deadline += timer.interval
+                    if timer.deadline <= now:
+                        # Fell behind (e.g. suspended): skip the missed runs
+                        missed = math.floor((now - timer.deadline) / timer.interval) + 1
+                        timer.deadline += missed * timer.interval
+                    timer.tick = self.tick_of(timer.deadline)
+                    self._place(timer)
+        return fired
+
+    def next_deadline(self):
+        """Time the wheel next needs advancing, or None when empty
+
+        Looks at most one level-0 turn ahead; beyond that it reports the next
+        cascade point, so the cost stays bounded however many timers exist.
+        """
+        if self.count == 0:
+            return None
+        wheel = self.levels[0]
+        tick = self.current
+        end = (self.current | (LEVEL0_SIZE - 1)) + 1
+        while tick < end:
+            for timer in wheel[tick & (LEVEL0_SIZE - 1)]:
+                if not timer.cancelled:
+                    return self.time_of(tick)
+            tick += 1
+        return self.time_of(end)
+
+
+class TkTimers:
+    """TimerWheel driven by a single pending root.after() call
+
+    The after() is always armed for the wheel's next deadline only, so the
+    whole application costs one Tk timer however many deadlines it tracks.
+    """
+
+    def __init__(self, root, resolution=0.01, clock=time.monotonic):
+        self.root = root
+        self.wheel = TimerWheel(resolution, clock)
+        self.clock = clock
+        self.pending = None
+        self.pending_due = None
+
+    def call_at(self, deadline, callback):
+        timer = self.wheel.call_at(deadline, callback)
+        self._arm(self.wheel.time_of(timer.tick))
+        return timer
+
+    def call_later(self, delay, callback):
+        return self.call_at(self.clock() + delay, callback)
+
+    def call_every(self, interval, callback):
+        timer = self.wheel.call_every(interval, callback)
+        self._arm(self.wheel.time_of(timer.tick))
+        return timer
+
+    def cancel(self, timer):
+        self.wheel.cancel(timer)
+
+    def _arm(self, due):
+        if self.pending is not None:
+            if due >= self.pending_due:
+                return
+            self.root.after_cancel(self.pending)
+        delay_ms = max(1, math.ceil((due - self.clock()) * 1000))
+        self.pending_due = due
+        self.pending = self.root.after(delay_ms, self._run)
+
+    def _run(self):
+        self.pending = None
+        self.wheel.advance()
+        due = self.wheel.next_deadline()
+        if due is not None:
+            self._arm(due)
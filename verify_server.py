@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import os
+import time
+
+from anomaly_detector import AnomalyDetector
+from config_watcher import ConfigWatcher, apply_to_controller
+from door_controller import DoorController
+from lock_engine import SUCCESS, FAILED, INVALID, LOCKED, REJECTED, THROTTLED
+from metrics import Counter, Gauge, MetricsRegistry, MetricsServer
+from rate_limiter import RateLimiter, DEFAULT_TIERS, parse_tier
+
+# Wire protocol, one request per line:
+#   <door_id> <pin>\n   ->   SUCCESS | FAILED <remaining> | LOCKED <seconds>
+#                            | REJECTED <seconds> | THROTTLED <seconds>
+#                            | INVALID | ERROR <reason>
+# A locked door answers REJECTED with the seconds left ("-" when indefinite).
+# A client over its rate limit answers THROTTLED, whatever the door.
+
+
+class VerificationServer:
+    """Asyncio TCP front end that checks PIN attempts per door"""
+
+    def __init__(self, controller, host="127.0.0.1", port=8765, limiter=None):
+        self.controller = controller
+        self.limiter = limiter  # failed attempts per remote client
+        self.watcher = None
+        self.host = host
+        self.port = port
+        self.server = None
+        self.tasks = []  # background tasks, referenced so they are not collected
+        self.connections = 0
+        self.requests = 0
+
+    def watch(self, path):
+        """Apply path (a settings file or a config directory) live on every change
+
+        max_attempts, lockout_time, password and per-door "doors" passwords
+        are updated in place; attempts and running lockouts are kept.
+        """
+        if self.watcher is None:
+            self.watcher = ConfigWatcher()
+        apply = lambda changed_path, settings: apply_to_controller(self.controller, settings)
+        if os.path.isdir(path):
+            self.watcher.watch_directory(path, apply, initial=True)
+        else:
+            self.watcher.watch(path, apply, initial=True)
+
+    def handle_line(self, line, now=None, source=None):
+        """Answer one request line from source (the client address)"""
+        parts = line.split()
+        if len(parts) != 2:
+            return "ERROR malformed"
+        door_id, pin = parts
+        controller = self.controller
+        if door_id not in controller:
+            return "ERROR unknown door"
+
+        self.requests += 1
+        if now is None:
+            now = controller.clock()
+        limiter = self.limiter
+        if limiter is not None and source is not None:
+            wait = limiter.retry_after(source, now)
+            if wait:
+                return f"{THROTTLED} {int(wait + 0.999)}"
+        event = controller.submit(door_id, pin, now)
+        if limiter is not None and source is not None and event in (FAILED, LOCKED):
+            limiter.hit(source, now)
+        if event == SUCCESS:
+            return SUCCESS
+        if event == FAILED:
+            slot = controller.index[door_id]
+            remaining = controller.max_attempts - controller.attempts[slot] % controller.max_attempts
+            return f"{FAILED} {remaining}"
+        if event in (LOCKED, REJECTED):
+            remaining = controller.lockout_remaining(door_id, now)
+            return f"{event} {'-' if remaining is None else int(remaining + 0.999)}"
+        return INVALID
+
+    def connection_made(self):
+        """Count a newly connected panel"""
+        self.connections += 1
+
+    def connection_lost(self):
+        """Forget a disconnected panel"""
+        self.connections -= 1
+
+    async def expire_lockouts(self, interval=0.5):
+        """Release timed lockouts in the background"""
+        while True:
+            self.controller.tick()
+            await asyncio.sleep(interval)
+
+    async def watch_config(self, watcher, interval=1.0):
+        """Poll watched config files so edits apply without a restart"""
+        while True:
+            watcher.poll()
+            await asyncio.sleep(interval)
+
+    async def start(self):
+        """Bind the listening socket"""
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(lambda: PanelProtocol(self), self.host,
+                                               self.port, backlog=4096)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.tasks.append(loop.create_task(self.expire_lockouts()))
+        if self.watcher is not None:
+            self.tasks.append(loop.create_task(self.watch_config(self.watcher)))
+        return self.server
+
+    async def stop(self):
+        """Cancel the background tasks and close the listening socket"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def serve_forever(self):
+        """Run until cancelled"""
+        await self.start()
+        print(f"Verification service listening on {self.host}:{self.port}", flush=True)
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+
+class PanelProtocol(asyncio.Protocol):
+    """Line protocol for one panel connection
+
+    Uses the low-level protocol API rather than streams: every request
+    already in the receive buffer is answered with a single write.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.transport = None
+        self.buffer = b""
+        self.source = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        peer = transport.get_extra_info('peername')
+        self.source = f"remote:{peer[0]}" if peer else None
+        self.service.connection_made()
+
+    def connection_lost(self, exc):
+        self.service.connection_lost()
+
+    def data_received(self, data):
+        *lines, self.buffer = (self.buffer + data).split(b"\n")
+        if len(self.buffer) > 256:
+            self.transport.close()
+            return
+        if lines:
+            handle_line = self.service.handle_line
+            now = self.service.controller.clock()
+            source = self.source
+            replies = [handle_line(line.decode('ascii', 'replace'), now, source) for line in lines]
+            self.transport.write(("\n".join(replies) + "\n").encode('ascii'))
+
+
+def serve_metrics(server, detector, port):
+    """Prometheus endpoint on localhost with request and lock event counts"""
+    registry = MetricsRegistry()
+    events = registry.register(Counter("verify_lock_events_total",
+                                       "Lock events across all doors by type", ("event",)))
+    alerts = registry.register(Counter("verify_security_alerts_total",
+                                       "Anomaly detector alerts by kind", ("kind",)))
+    registry.register(Gauge("verify_requests", "PIN requests answered since start",
+                            fn=lambda: server.requests))
+    registry.register(Gauge("verify_connections", "Connected panels",
+                            fn=lambda: server.connections))
+    registry.register(Gauge("verify_rate_limited_sources", "Client addresses tracked by the rate limiter",
+                            fn=lambda: len(server.limiter) if server.limiter is not None else 0))
+    server.controller.subscribe(lambda door, event, detail: events.inc(event))
+    detector.subscribe(lambda kind, door, message: alerts.inc(kind))
+    metrics_server = MetricsServer(registry, port=port)
+    metrics_server.start()
+    print(f"Metrics on http://127.0.0.1:{metrics_server.port}/metrics", flush=True)
+    return metrics_server
+
+
+def build_controller(door_count, password, max_attempts, lockout_time):
+    """Controller with doors named "1".."door_count" """
+    controller = DoorController(max_attempts=max_attempts, lockout_time=lockout_time,
+                                clock=time.monotonic)
+    controller.add_doors((str(i) for i in range(1, door_count + 1)), password)
+    return controller
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PIN verification service for remote door panels")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--doors', type=int, default=100)
+    parser.add_argument('--password', default="1234")
+    parser.add_argument('--max-attempts', type=int, default=3)
+    parser.add_argument('--lockout-time', type=int, default=30)
+    parser.add_argument('--rate-limit', action='append', type=parse_tier, metavar='ATTEMPTS/SECONDS',
+                        help="failed attempts allowed per client address (repeatable); "
+                             "default 5/60, 20/3600 and 100/86400")
+    parser.add_argument('--no-rate-limit', action='store_true')
+    parser.add_argument('--config', action='append', default=[],
+                        help="settings file or directory to apply live (repeatable)")
+    parser.add_argument('--max-clients', type=int, default=1000000,
+                        help="client addresses tracked by the rate limiter")
+    parser.add_argument('--metrics-port', type=int,
+                        help="serve Prometheus metrics on this localhost port")
+    args = parser.parse_args()
+
+    controller = build_controller(args.doors, args.password, args.max_attempts, args.lockout_time)
+    detector = AnomalyDetector(max_doors=max(args.doors, 1))
+    detector.subscribe(lambda kind, door, message:
+                       print(f"SECURITY {kind} ({door or 'all doors'}): {message}", flush=True))
+    controller.subscribe(detector.observe)
+    limiter = None
+    if not args.no_rate_limit:
+        limiter = RateLimiter(args.rate_limit or DEFAULT_TIERS, args.max_clients)
+    server = VerificationServer(controller, args.host, args.port, limiter)
+    for path in args.config:
+        server.watch(path)
+    if args.metrics_port is not None:
+        serve_metrics(server, detector, args.metrics_port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
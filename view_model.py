@@ -0,0 +1,49 @@
+class WidgetView:
+    """Last options rendered to one widget
+
+    config() compares each option with what was last sent and passes only
+    the changed ones to the widget, so redrawing the same state costs a
+    dict lookup instead of a Tk call. All changes to the widget's text and
+    colours must go through the view for the comparison to hold.
+    """
+
+    __slots__ = ('widget', 'rendered', 'model')
+
+    def __init__(self, widget, model, options=()):
+        self.widget = widget
+        self.model = model
+        self.rendered = {key: widget.cget(key) for key in options}
+
+    def config(self, **options):
+        rendered = self.rendered
+        changed = {key: value for key, value in options.items()
+                   if key not in rendered or rendered[key] != value}
+        if not changed:
+            self.model.skipped += 1
+            return False
+        rendered.update(changed)
+        self.widget.config(**changed)
+        self.model.configs += 1
+        return True
+
+    configure = config
+
+    def cget(self, key):
+        if key in self.rendered:
+            return self.rendered[key]
+        return self.widget.cget(key)
+
+
+class ViewModel:
+    """Dirty-tracking views of a screen's widgets, with render counters"""
+
+    def __init__(self):
+        self.views = []
+        self.configs = 0  # config calls that reached a widget
+        self.skipped = 0  # config calls dropped because nothing changed
+
+    def add(self, widget, options=('text', 'fg', 'bg')):
+        """View of widget; options are read back once as the starting state"""
+        view = WidgetView(widget, self, options)
+        self.views.append(view)
+        return view